@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Analysis Daemon
+===============
+
+Keeps the Python analyzers warm between runs. The daemon is a local server
+on a Unix socket that runs analyze-pgn.py and analyze-tactics.py in-process
+and keeps the last run's Stockfish processes, eval cache and opening book
+open (see AnalysisSession in analyze-pgn.py). Re-running a round after a
+tweak then skips interpreter startup, imports, engine startup and NNUE
+loading, as long as the engine settings stay the same.
+
+Requirements:
+    pip install python-chess
+
+Usage:
+    python analysis-daemon.py serve
+    python analysis-daemon.py run analyze-pgn.py --depth 15 < games.pgn > analysis.json
+    python analysis-daemon.py run analyze-tactics.py --stream < games.pgn > tactics.jsonl
+    python analysis-daemon.py stop
+
+`run` is a thin client with the same contract as the script it names:
+the same arguments, PGN on stdin, JSON on stdout, progress on stderr and
+the same exit status. Output is streamed back as it is produced, so
+--stream still gets one line per finished game. When no daemon is
+listening, `run` falls back to running the script directly.
+
+Runs are handled one at a time. Protocol, one connection per run:
+    client: {"command": "run", "script": ..., "args": [...], "cwd": ...}
+            newline, then the PGN text until the client shuts down writing
+    server: JSON lines {"stdout": text} / {"stderr": text}, then {"exit": code}
+"""
+
+import io
+import os
+import sys
+import json
+import socket
+import argparse
+import threading
+import contextlib
+import traceback
+import importlib.util
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET_PATH = os.path.join(SCRIPTS_DIR, '..', 'data', 'analysis-daemon.sock')
+SCRIPTS = ('analyze-pgn.py', 'analyze-tactics.py')
+
+
+def load_script(filename):
+    """
+    Import one of the hyphenated analyzer scripts as a module. It is
+    registered in sys.modules so worker pool tasks can be pickled by name.
+    """
+    path = os.path.join(SCRIPTS_DIR, filename)
+    spec = importlib.util.spec_from_file_location(filename[:-3].replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class ChannelWriter(io.TextIOBase):
+    """Text stream that forwards writes to the client as {channel: text} messages."""
+
+    def __init__(self, out, channel, line_buffered=False):
+        self.out = out
+        self.channel = channel
+        self.line_buffered = line_buffered
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            self.out.write(json.dumps({self.channel: text}) + '\n')
+            if self.line_buffered and '\n' in text:
+                self.out.flush()
+        return len(text)
+
+    def flush(self):
+        self.out.flush()
+
+
+def exit_code(exit_request):
+    """The process exit status a SystemExit stands for."""
+    code = exit_request.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+class AnalysisDaemon:
+    """Runs analyzer requests in-process, keeping one warm analysis session."""
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        # Loaded once, so the chess imports and module setup are paid at startup only
+        self.scripts = {filename: load_script(filename) for filename in SCRIPTS}
+        self.session = self.scripts['analyze-pgn.py'].AnalysisSession()
+
+    def run_script(self, request, stdin, stdout, stderr):
+        """Run one analyzer with the request's arguments and redirected streams. Returns the exit status."""
+        module = self.scripts[request['script']]
+        saved_argv, saved_stdin, saved_cwd = sys.argv, sys.stdin, os.getcwd()
+        sys.argv = [request['script'], *request['args']]
+        sys.stdin = stdin
+        try:
+            os.chdir(request['cwd'])
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    if request['script'] == 'analyze-pgn.py':
+                        module.main(request['args'], self.session)
+                    else:
+                        module.main(request['args'])
+                    return 0
+                except SystemExit as e:
+                    return exit_code(e)
+                except Exception:
+                    traceback.print_exc()
+                    # Don't reuse engines left in an unknown state
+                    self.session.close()
+                    return 1
+                finally:
+                    sys.stdout.flush()
+        finally:
+            sys.argv, sys.stdin = saved_argv, saved_stdin
+            os.chdir(saved_cwd)
+
+    def handle(self, conn):
+        """Serve one connection. Returns False when the daemon should stop."""
+        reader = conn.makefile('r', encoding='utf-8')
+        writer = conn.makefile('w', encoding='utf-8')
+        try:
+            request = json.loads(reader.readline() or 'null')
+            if not request:
+                return True
+            if request.get('command') == 'stop':
+                writer.write(json.dumps({'exit': 0}) + '\n')
+                return False
+            if request.get('script') not in SCRIPTS:
+                writer.write(json.dumps({'stderr': f"Unknown script: {request.get('script')}\n"}) + '\n')
+                writer.write(json.dumps({'exit': 2}) + '\n')
+                return True
+
+            print(f"▶️  {request['script']} {' '.join(request['args'])}", file=sys.stderr)
+            stdout = ChannelWriter(writer, 'stdout')
+            stderr = ChannelWriter(writer, 'stderr', line_buffered=True)
+            code = self.run_script(request, reader, stdout, stderr)
+            writer.write(json.dumps({'exit': code}) + '\n')
+            print(f"⏹️  {request['script']} exited with {code}", file=sys.stderr)
+            return True
+        except OSError as e:
+            # Client went away mid-run
+            print(f"⚠️  Connection lost: {e}", file=sys.stderr)
+            self.session.close()
+            return True
+        finally:
+            with contextlib.suppress(OSError):
+                writer.close()
+            reader.close()
+            conn.close()
+
+    def serve(self):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen()
+        print(f"🔌 Analysis daemon listening on {self.socket_path}", file=sys.stderr)
+        try:
+            while True:
+                conn, _ = server.accept()
+                if not self.handle(conn):
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            os.unlink(self.socket_path)
+            self.session.close()
+            print(f"👋 Analysis daemon stopped", file=sys.stderr)
+
+
+def connect(socket_path):
+    """Connect to a running daemon, or return None when nothing is listening."""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+    except OSError:
+        conn.close()
+        return None
+    return conn
+
+
+def serve(socket_path):
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    if os.path.exists(socket_path):
+        conn = connect(socket_path)
+        if conn is not None:
+            conn.close()
+            print(f"❌ A daemon is already listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+        # Left behind by a daemon that was killed
+        os.unlink(socket_path)
+
+    # The analyzers are loaded from their file paths, which spawned worker
+    # processes can't re-import by module name, so worker pools have to fork
+    import multiprocessing
+    multiprocessing.set_start_method('fork')
+
+    AnalysisDaemon(socket_path).serve()
+
+
+def run(socket_path, script, args):
+    """Thin client: forward one analyzer run to the daemon and replay its output."""
+    conn = connect(socket_path) if '--progress-fd' not in args else None
+    if conn is None:
+        # No daemon (or a file descriptor it can't write to): run the script directly
+        script_path = os.path.join(SCRIPTS_DIR, script)
+        os.execv(sys.executable, [sys.executable, script_path, *args])
+
+    request = {'command': 'run', 'script': script, 'args': args, 'cwd': os.getcwd()}
+    conn.sendall((json.dumps(request) + '\n').encode('utf-8'))
+
+    def send_input():
+        # Feed stdin while output is read, so --stream runs don't deadlock. Raw
+        # reads, since a buffered stdin can't be torn down under a blocked thread
+        with contextlib.suppress(OSError):
+            while True:
+                chunk = os.read(sys.stdin.fileno(), 65536)
+                if not chunk:
+                    break
+                conn.sendall(chunk)
+            conn.shutdown(socket.SHUT_WR)
+
+    threading.Thread(target=send_input, daemon=True).start()
+
+    with conn.makefile('r', encoding='utf-8') as replies:
+        for line in replies:
+            message = json.loads(line)
+            if 'stdout' in message:
+                sys.stdout.write(message['stdout'])
+            elif 'stderr' in message:
+                sys.stderr.write(message['stderr'])
+                sys.stderr.flush()
+            elif 'exit' in message:
+                sys.stdout.flush()
+                sys.exit(message['exit'])
+
+    print("❌ Analysis daemon closed the connection", file=sys.stderr)
+    sys.exit(1)
+
+
+def stop(socket_path):
+    conn = connect(socket_path)
+    if conn is None:
+        print(f"No daemon listening on {socket_path}", file=sys.stderr)
+        sys.exit(1)
+    with conn:
+        conn.sendall((json.dumps({'command': 'stop'}) + '\n').encode('utf-8'))
+        conn.recv(1024)
+    print(f"🛑 Analysis daemon on {socket_path} stopped", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Warm analysis daemon for analyze-pgn.py and analyze-tactics.py')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help='Unix socket path (default: data/analysis-daemon.sock)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('serve', help='Start the daemon in the foreground')
+    run_parser = commands.add_parser('run', help='Run an analyzer through the daemon (falls back to running it directly)')
+    run_parser.add_argument('script', choices=SCRIPTS)
+    run_parser.add_argument('args', nargs=argparse.REMAINDER, help='Arguments for the analyzer')
+    commands.add_parser('stop', help='Stop a running daemon')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.socket)
+    elif args.command == 'run':
+        run(args.socket, args.script, args.args)
+    else:
+        stop(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Shared helpers for the Python analyzers (analyze-pgn.py, analyze-tactics.py).
+"""
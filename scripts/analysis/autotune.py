@@ -0,0 +1,205 @@
+"""
+Engine Auto-Tuning
+==================
+
+Benchmarks (workers, Threads, Hash) splits of the machine's cores on a
+sample of positions from the input PGN and keeps the fastest one, for
+analyze-pgn.py --autotune.
+
+The sample is a set of short runs of consecutive plies spread over the
+games, so every config searches them the way a real run does: one game
+at a time per engine, with the hash carried from ply to ply. Engine
+startup and NNUE loading are excluded from the timing. There are at least
+SEGMENTS_PER_WORKER segments per engine of the widest config, so configs
+with many processes keep all their engines busy and no single slow
+segment sets the wall time.
+
+Profiles are saved to data/engine-tuning.json, keyed by machine, engine
+binary and depth, and picked up by later runs on the same machine:
+    {"myhost|cpus=8|/usr/bin/stockfish|depth=15": {"workers": 4, "threads": 2, "hash": 64, ...}}
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import time
+
+import chess
+
+from analysis.engine import UciEngine
+
+DEFAULT_TUNING_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'engine-tuning.json')
+DEFAULT_SAMPLE_POSITIONS = 48
+SEGMENT_PLIES = 8
+SEGMENTS_PER_WORKER = 4
+SKIP_OPENING_PLIES = 10
+HASH_SIZES_MB = (16, 64, 256)
+
+# Engine owned by each tuning worker process, or why it didn't start
+_tuning_engine = None
+_tuning_error = None
+
+
+def profile_key(engine_path, depth):
+    """Identify a tuning profile by machine, engine binary and depth."""
+    return f"{socket.gethostname()}|cpus={os.cpu_count() or 1}|{engine_path}|depth={depth}"
+
+
+def load_profile(engine_path, depth, path=DEFAULT_TUNING_PATH):
+    """The saved profile for this machine, engine and depth, or None."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            profiles = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return profiles.get(profile_key(engine_path, depth))
+
+
+def save_profile(engine_path, depth, profile, path=DEFAULT_TUNING_PATH):
+    """Store a profile, keeping those of other machines, engines and depths."""
+    profiles = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            profiles = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        pass
+    profiles[profile_key(engine_path, depth)] = profile
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2)
+        f.write('\n')
+
+
+def sample_segments(games, positions=DEFAULT_SAMPLE_POSITIONS, segment_plies=SEGMENT_PLIES, min_segments=1):
+    """
+    Pick about `positions` FENs as runs of consecutive middlegame plies,
+    spread evenly over the games, and at least min_segments runs (runs are
+    repeated when the games don't have that many). Returns a list of FEN
+    lists.
+    """
+    candidates = []
+    for game in games:
+        board = game.board()
+        fens = []
+        for ply, move in enumerate(game.mainline_moves()):
+            board.push(move)
+            if ply >= SKIP_OPENING_PLIES and not board.is_game_over():
+                fens.append(board.fen())
+        for start in range(0, len(fens) - segment_plies + 1, segment_plies):
+            candidates.append(fens[start:start + segment_plies])
+
+    wanted = max(1, min_segments, positions // segment_plies)
+    if not candidates or len(candidates) == wanted:
+        return candidates
+    if len(candidates) < wanted:
+        # Too few games for the sample: search runs again, each from a fresh hash
+        return [candidates[i % len(candidates)] for i in range(wanted)]
+    step = len(candidates) / wanted
+    return [candidates[int(i * step)] for i in range(wanted)]
+
+
+def candidate_configs(cpus=None, hash_sizes=HASH_SIZES_MB):
+    """
+    (workers, threads, hash) splits using all cores: one engine per core up
+    to one engine with every core, each with every hash size, plus the
+    default of all cores but one.
+    """
+    cpus = cpus or os.cpu_count() or 1
+    splits = []
+    threads = 1
+    while threads <= cpus:
+        splits.append((cpus // threads, threads))
+        threads *= 2
+    if cpus > 1:
+        splits.append((cpus - 1, 1))
+
+    memory_mb = physical_memory_mb()
+    configs = []
+    for workers, threads in splits:
+        for hash_mb in hash_sizes:
+            # Leave at least half the memory to the rest of the machine
+            if memory_mb is not None and workers * hash_mb > memory_mb / 2:
+                continue
+            configs.append((workers, threads, hash_mb))
+    return configs
+
+
+def physical_memory_mb():
+    """Installed memory in MB, or None where the platform doesn't say."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def init_tuning_worker(engine_path, depth, threads, hash_mb):
+    global _tuning_engine, _tuning_error
+    try:
+        _tuning_engine = UciEngine(engine_path, depth, threads, hash_mb)
+        # Load the network before the clock starts
+        _tuning_engine.evaluate(chess.STARTING_FEN)
+    except Exception as e:
+        # Raising here would make the pool respawn the worker forever, report it per task instead
+        _tuning_error = e
+
+
+def check_tuning_worker():
+    """Raise the error that kept this worker's engine from starting, if any."""
+    if _tuning_error is not None:
+        raise RuntimeError(str(_tuning_error) or type(_tuning_error).__name__)
+
+
+def ready(_):
+    check_tuning_worker()
+    return True
+
+
+def search_segment(fens):
+    """Search one run of plies like a game: fresh hash, then ply after ply."""
+    check_tuning_worker()
+    _tuning_engine.new_game()
+    for fen in fens:
+        _tuning_engine.evaluate(fen)
+    return len(fens)
+
+
+def measure(engine_path, depth, segments, workers, threads, hash_mb):
+    """Positions per second for one config."""
+    with multiprocessing.Pool(workers, initializer=init_tuning_worker,
+                              initargs=(engine_path, depth, threads, hash_mb)) as pool:
+        # One round trip per worker so every engine is up before timing
+        pool.map(ready, range(workers), chunksize=1)
+        start = time.perf_counter()
+        positions = sum(pool.imap_unordered(search_segment, segments, chunksize=1))
+        seconds = time.perf_counter() - start
+    return positions / seconds if seconds > 0 else 0.0
+
+
+def autotune(engine_path, depth, segments, configs, log=None):
+    """
+    Time every config on the sampled segments. Returns the fastest config
+    as a profile dict with all measurements under 'results'.
+    """
+    results = []
+    for workers, threads, hash_mb in configs:
+        positions_per_sec = measure(engine_path, depth, segments, workers, threads, hash_mb)
+        results.append({
+            'workers': workers,
+            'threads': threads,
+            'hash': hash_mb,
+            'positionsPerSec': round(positions_per_sec, 2)
+        })
+        if log is not None:
+            log(f"   {workers} worker(s) × {threads} thread(s), Hash {hash_mb} MB: {positions_per_sec:.1f} positions/s")
+
+    # First config wins ties, so equal throughput prefers fewer threads per engine
+    best = max(results, key=lambda result: result['positionsPerSec'])
+    return {
+        **best,
+        'depth': depth,
+        'positions': sum(len(segment) for segment in segments),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'results': results
+    }
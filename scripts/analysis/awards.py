@@ -0,0 +1,149 @@
+"""
+Round Awards
+============
+
+Declarative registry of the analyze-pgn.py round awards (accuracy king,
+biggest blunder, ACPL extremes, ...).
+
+Each award names the summary key it fills, whether the highest or lowest
+value wins, and a function that turns one analyzed game into candidate
+entries (one per player for per-player awards). RoundAwards folds games in
+one at a time as they finish and keeps a bounded top-N heap per award, so
+the whole round never has to sit in memory.
+
+Ties go to the candidate seen first, the same as the original if-chains,
+so the winner is always the first entry of the leaderboard.
+"""
+
+import heapq
+import itertools
+from collections import namedtuple
+
+DEFAULT_LEADERBOARD_SIZE = 5
+
+Award = namedtuple('Award', ['key', 'best', 'candidates'])
+
+
+def game_context(game):
+    """Fields identifying the game an award entry comes from."""
+    return {
+        'white': game['white'],
+        'black': game['black'],
+        'gameIndex': game['gameIndex'],
+        'gameId': game['gameId']
+    }
+
+
+def accuracy_candidates(game):
+    for color in ('white', 'black'):
+        yield game[f'{color}Accuracy'], {
+            'player': color,
+            'accuracy': game[f'{color}Accuracy'],
+            'acpl': game[f'{color}ACPL'],
+            **game_context(game)
+        }
+
+
+def acpl_candidates(game):
+    for color in ('white', 'black'):
+        yield game[f'{color}ACPL'], {
+            'player': color,
+            'acpl': game[f'{color}ACPL'],
+            'accuracy': game[f'{color}Accuracy'],
+            **game_context(game)
+        }
+
+
+def combined_acpl_candidates(game):
+    combined_acpl = game['whiteACPL'] + game['blackACPL']
+    yield combined_acpl, {
+        'combinedACPL': combined_acpl,
+        'whiteACPL': game['whiteACPL'],
+        'blackACPL': game['blackACPL'],
+        **game_context(game)
+    }
+
+
+def game_moment_candidates(field, value_key):
+    """Candidates for awards built on a per-game highlight (blunder, comeback, escape)."""
+    def candidates(game):
+        moment = game[field]
+        if moment:
+            yield moment[value_key], {**moment, **game_context(game)}
+    return candidates
+
+
+def engine_move_candidates(game):
+    for color in ('white', 'black'):
+        engine_moves = game[f'{color}EngineMoves']
+        total_moves = sum(game[f'{color}MoveQuality'].values())
+        yield engine_moves, {
+            'player': color,
+            'engineMoves': engine_moves,
+            'totalMoves': total_moves,
+            'percentage': round(engine_moves / total_moves * 100, 1) if total_moves > 0 else 0,
+            **game_context(game)
+        }
+
+
+def inaccuracy_candidates(game):
+    for color in ('white', 'black'):
+        quality = game[f'{color}MoveQuality']
+        yield quality['inaccuracies'], {
+            'player': color,
+            'inaccuracies': quality['inaccuracies'],
+            'totalMoves': sum(quality.values()),
+            **game_context(game)
+        }
+
+
+# Summary keys in output order
+AWARDS = [
+    Award('accuracyKing', 'max', accuracy_candidates),
+    # Biggest blunder compares by severity, not just cpLoss
+    Award('biggestBlunder', 'max', game_moment_candidates('biggestBlunder', 'severity')),
+    Award('comebackKing', 'max', game_moment_candidates('biggestComeback', 'swing')),
+    Award('luckyEscape', 'max', game_moment_candidates('luckyEscape', 'escapeAmount')),
+    # Most engine-level moves (win% loss < 2%)
+    Award('stockfishBuddy', 'max', engine_move_candidates),
+    Award('inaccuracyKing', 'max', inaccuracy_candidates),
+    Award('lowestACPL', 'min', acpl_candidates),
+    Award('highestACPL', 'max', acpl_candidates),
+    Award('lowestCombinedACPL', 'min', combined_acpl_candidates),
+    Award('highestCombinedACPL', 'max', combined_acpl_candidates)
+]
+
+
+class RoundAwards:
+    """Streaming award reducer with a top-N leaderboard per award."""
+
+    def __init__(self, leaderboard_size=DEFAULT_LEADERBOARD_SIZE, awards=AWARDS):
+        self.awards = awards
+        self.leaderboard_size = max(1, leaderboard_size)
+        # Per award: min-heap of (rank, -sequence, entry) holding the best N entries
+        self.heaps = {award.key: [] for award in awards}
+        self._sequence = itertools.count()
+
+    def add(self, game):
+        """Fold one analyzed game (the per-game output record) into every award."""
+        for award in self.awards:
+            heap = self.heaps[award.key]
+            for value, entry in award.candidates(game):
+                rank = value if award.best == 'max' else -value
+                # Earlier candidates win ties, so they rank higher
+                item = (rank, -next(self._sequence), entry)
+                if len(heap) < self.leaderboard_size:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+
+    def leaderboard(self, key):
+        """Entries of one award, best first."""
+        return [entry for _, _, entry in sorted(self.heaps[key], key=lambda item: item[:2], reverse=True)]
+
+    def result(self):
+        """The round summary: each award's winner plus the full leaderboards."""
+        leaderboards = {award.key: self.leaderboard(award.key) for award in self.awards}
+        summary = {key: (entries[0] if entries else None) for key, entries in leaderboards.items()}
+        summary['leaderboards'] = leaderboards
+        return summary
@@ -0,0 +1,72 @@
+"""
+Exact Endgame Evaluations
+=========================
+
+Positions whose value is known without a search: terminal positions
+(checkmate, stalemate, insufficient material) and, when a local Syzygy
+directory is configured, positions covered by the tablebases.
+
+Evaluations follow the engine convention ({type, value} from white's
+perspective) so they can be mixed freely with Stockfish evals:
+
+- checkmate: {'type': 'mate', 'value': 0, 'mated': 'white'|'black'}
+- stalemate / insufficient material / tablebase draws: {'type': 'cp', 'value': 0}
+- tablebase wins: {'type': 'cp', 'value': +-(TB_WIN_CP - |DTZ|)}
+
+Syzygy tables only know distance to zeroing (DTZ), not distance to mate, so
+tablebase wins are reported as large centipawn scores just below the mate
+range, the way Stockfish reports them. Cursed wins and blessed losses (won
+or lost only without the 50-move rule) count as draws.
+"""
+
+import chess
+import chess.syzygy
+
+# Tablebase win score, below the mate-in-100 score of eval_to_cp (9000)
+TB_WIN_CP = 8900
+TB_MAX_DTZ = 1000
+
+
+def open_tablebase(path):
+    """Open a Syzygy tablebase directory."""
+    return chess.syzygy.open_tablebase(path)
+
+
+def terminal_eval(board):
+    """Exact eval of a finished position, or None if the game goes on."""
+    if board.is_checkmate():
+        return {'type': 'mate', 'value': 0, 'mated': 'white' if board.turn == chess.WHITE else 'black'}
+    if board.is_stalemate() or board.is_insufficient_material():
+        return {'type': 'cp', 'value': 0}
+    return None
+
+
+def tablebase_eval(board, tablebase):
+    """Exact eval from the Syzygy tables, or None when the position isn't covered."""
+    if chess.popcount(board.occupied) > chess.syzygy.TBPIECES or board.castling_rights:
+        return None
+
+    try:
+        wdl = tablebase.probe_wdl(board)
+        dtz = tablebase.probe_dtz(board) if abs(wdl) == 2 else 0
+    except KeyError:
+        # Table missing from the local set
+        return None
+
+    if abs(wdl) != 2:
+        # Draw, cursed win or blessed loss
+        return {'type': 'cp', 'value': 0}
+
+    cp = TB_WIN_CP - min(abs(dtz), TB_MAX_DTZ)
+    # WDL is from the side to move, evals are from white's perspective
+    if (wdl > 0) != (board.turn == chess.WHITE):
+        cp = -cp
+    return {'type': 'cp', 'value': cp}
+
+
+def exact_eval(board, tablebase=None):
+    """Exact eval of a position if one is known without searching, else None."""
+    evaluation = terminal_eval(board)
+    if evaluation is None and tablebase is not None:
+        evaluation = tablebase_eval(board, tablebase)
+    return evaluation
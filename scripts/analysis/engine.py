@@ -0,0 +1,100 @@
+"""
+UCI Engine Session
+==================
+
+Thin driver around python-chess' chess.engine for Stockfish.
+
+Unlike the `stockfish` PyPI wrapper, the engine is only told about a new
+game (ucinewgame) when new_game() is called, so the transposition table
+stays warm across consecutive plies of the same game. Threads and Hash are
+configurable and every evaluation carries the search statistics reported
+by the engine (depth reached, nodes, nps, time).
+
+Evaluations use the same {type, value} convention as before: 'cp' or 'mate'
+from white's perspective.
+"""
+
+import chess
+import chess.engine
+
+DEFAULT_THREADS = 1
+DEFAULT_HASH_MB = 16
+
+
+def score_to_eval(score):
+    """Convert a chess.engine PovScore to a white-POV {type, value} eval."""
+    white_score = score.white()
+    if white_score.is_mate():
+        return {'type': 'mate', 'value': white_score.mate()}
+    return {'type': 'cp', 'value': white_score.score()}
+
+
+class UciEngine:
+    """A persistent UCI engine process."""
+
+    def __init__(self, path, depth=15, threads=DEFAULT_THREADS, hash_mb=DEFAULT_HASH_MB):
+        self.path = path
+        self.depth = depth
+        self.threads = threads
+        self.hash_mb = hash_mb
+        self.engine = chess.engine.SimpleEngine.popen_uci(path)
+
+        # Only send options the engine actually declares
+        options = {}
+        if 'Threads' in self.engine.options:
+            options['Threads'] = threads
+        if 'Hash' in self.engine.options:
+            options['Hash'] = hash_mb
+        if options:
+            self.engine.configure(options)
+
+        self.name = self.engine.id.get('name', path)
+        self._game = None
+
+        # Running search statistics for this session
+        self.searches = 0
+        self.nodes = 0
+        self.search_time = 0
+        self.depth_sum = 0
+
+    def new_game(self):
+        """Start a new game session. The next search sends ucinewgame and clears the hash."""
+        self._game = object()
+
+    def evaluate(self, fen, depth=None, chess960=False):
+        """
+        Search a position and return its eval plus search statistics:
+        {type, value, depth, nodes, nps, time}. Chess960 positions need
+        chess960 set, so their castling rights are read (and sent to the
+        engine) as Chess960 castling.
+        """
+        board = chess.Board(fen, chess960=chess960)
+        limit = chess.engine.Limit(depth=depth or self.depth)
+        info = self.engine.analyse(board, limit, game=self._game)
+
+        evaluation = score_to_eval(info['score'])
+        evaluation['depth'] = info.get('depth', 0)
+        evaluation['nodes'] = info.get('nodes', 0)
+        evaluation['nps'] = info.get('nps', 0)
+        evaluation['time'] = info.get('time', 0)
+
+        self.searches += 1
+        self.nodes += evaluation['nodes']
+        self.search_time += evaluation['time']
+        self.depth_sum += evaluation['depth']
+        return evaluation
+
+    def stats(self):
+        """Snapshot of the running search statistics."""
+        return {
+            'searches': self.searches,
+            'nodes': self.nodes,
+            'searchTime': self.search_time,
+            'depthSum': self.depth_sum
+        }
+
+    def close(self):
+        try:
+            self.engine.quit()
+        except chess.engine.EngineTerminatedError:
+            pass
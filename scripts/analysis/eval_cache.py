@@ -0,0 +1,126 @@
+"""
+Persistent Evaluation Cache
+===========================
+
+SQLite-backed cache of engine evaluations, shared between runs, rounds and
+worker processes. Entries are keyed by the normalized position plus the
+search settings (engine version and depth) that produced them, so changing
+the depth or upgrading Stockfish never serves stale evals. Chess960
+positions are keyed apart from standard ones, since the same FEN castling
+field means different rights in the two.
+
+Threads and Hash are deliberately left out of the key: at a fixed depth
+they only change the search's noise, not what the eval means, and keying
+on them would throw the cache away every time --autotune picks a new
+split. Syzygy settings never reach the engine (tablebase positions are
+probed by analysis.endgame and never searched), so they don't belong in
+the key either.
+
+The cache is size-bounded: once it holds more than max_entries positions,
+evict() drops the least recently used ones.
+"""
+
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'eval-cache.sqlite')
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+
+def normalize_fen(fen):
+    """
+    Reduce a FEN to the fields that identify the position for the engine.
+    Move counters are dropped so transpositions share one cache entry.
+    """
+    return ' '.join(fen.split()[:4])
+
+
+def settings_key(engine_id, depth, chess960=False):
+    """Build the search-settings part of the cache key."""
+    key = f"{engine_id}|depth={depth}"
+    return key + '|chess960' if chess960 else key
+
+
+class EvalCache:
+    """Evaluation cache stored in a local SQLite file."""
+
+    def __init__(self, path, engine_id, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.engine_id = engine_id
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._touched = []
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Several worker processes share the file, WAL lets readers and a writer coexist
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS evals ('
+            ' position TEXT NOT NULL,'
+            ' settings TEXT NOT NULL,'
+            ' type TEXT NOT NULL,'
+            ' value INTEGER NOT NULL,'
+            ' last_used REAL NOT NULL,'
+            ' PRIMARY KEY (position, settings)'
+            ') WITHOUT ROWID'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS evals_last_used ON evals (last_used)')
+        self.conn.commit()
+
+    def get(self, fen, depth, chess960=False):
+        """Return the cached {type, value} eval for a position searched to depth, or None."""
+        position = normalize_fen(fen)
+        settings = settings_key(self.engine_id, depth, chess960)
+        row = self.conn.execute(
+            'SELECT type, value FROM evals WHERE position = ? AND settings = ?',
+            (position, settings)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touched.append((position, settings))
+        return {'type': row[0], 'value': row[1]}
+
+    def put(self, fen, depth, evaluation, chess960=False):
+        """Store an engine eval for a position searched to depth."""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO evals (position, settings, type, value, last_used) VALUES (?, ?, ?, ?, ?)',
+            (normalize_fen(fen), settings_key(self.engine_id, depth, chess960), evaluation['type'], int(evaluation['value']), time.time())
+        )
+
+    def commit(self):
+        """Flush pending writes and last-used updates (call once per game)."""
+        if self._touched:
+            now = time.time()
+            self.conn.executemany(
+                'UPDATE evals SET last_used = ? WHERE position = ? AND settings = ?',
+                [(now, position, settings) for position, settings in self._touched]
+            )
+            self._touched = []
+        self.conn.commit()
+
+    def evict(self):
+        """Drop the least recently used entries beyond max_entries. Returns the number removed."""
+        count = self.conn.execute('SELECT COUNT(*) FROM evals').fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+
+        self.conn.execute(
+            'DELETE FROM evals WHERE (position, settings) IN '
+            '(SELECT position, settings FROM evals ORDER BY last_used LIMIT ?)',
+            (excess,)
+        )
+        self.conn.commit()
+        return excess
+
+    def close(self):
+        self.commit()
+        self.conn.close()
@@ -0,0 +1,203 @@
+"""
+Eval Store
+==========
+
+Compact per-game eval records, kept so the game metrics and round awards
+can be recomputed after a change to the move classification, blunder
+severity or comeback/lucky escape logic without running Stockfish again:
+
+    python analyze-pgn.py --evals data/season-46-round-1.evals.bin < games.pgn > analysis.json
+    python analyze-pgn.py --rescore data/season-46-round-1.evals.bin > analysis.json
+
+The file is binary and little-endian: the magic bytes, then one record per
+analyzed game, appended (and flushed) as games finish:
+
+    uint32    record length (the bytes after this field)
+    uint16    metadata length, then the metadata as UTF-8 JSON:
+              {"key", "gameIndex", "gameId", "white", "black", "sampleRate",
+               "bookPlies", "depth", "shallowDepth"}
+    uint16    n, the number of positions (plies + 1)
+    int16[n]  eval of each position from white's perspective: centipawns,
+              or the mate distance for mate scores; -32768 where the
+              position was not evaluated (sampling, book moves)
+    uint8[]   mate bitmask, ceil(n / 8) bytes, bit i set when position i
+              holds a mate score
+    uint8     side to move in the first position (1 = white)
+    uint16    moves length, then the moves in SAN, space separated
+
+The key is the game's journal key (see analysis.journal.game_key), so a
+record belongs to one move list and search settings. A game analyzed again
+appends a new record, which replaces the earlier one with the same key.
+
+When a run finishes it appends a record with only metadata,
+{"games": [key, ...]}, listing the keys of all of its games. --rescore
+reads the games of the last finished run and fails when any of them has no
+record, rather than rescoring part of the round.
+"""
+
+import json
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b'L4545EV\x01'
+NOT_EVALUATED = -32768
+INT16_MAX = 32767
+
+RECORD_HEADER = struct.Struct('<I')
+LENGTH = struct.Struct('<H')
+
+
+def pack_evals(evals: List[Optional[Dict[str, Any]]], move_sans: List[str], white_to_move: bool) -> bytes:
+    """Pack one game's per-position evals and moves (everything after the metadata)."""
+    values = []
+    mates = bytearray((len(evals) + 7) // 8)
+    for index, evaluation in enumerate(evals):
+        if evaluation is None:
+            values.append(NOT_EVALUATED)
+            continue
+        values.append(max(-INT16_MAX, min(INT16_MAX, int(evaluation['value']))))
+        if evaluation['type'] == 'mate':
+            mates[index >> 3] |= 1 << (index & 7)
+
+    moves = ' '.join(move_sans).encode('utf-8')
+    return b''.join((
+        LENGTH.pack(len(evals)),
+        struct.pack(f'<{len(values)}h', *values),
+        bytes(mates),
+        bytes((1 if white_to_move else 0,)),
+        LENGTH.pack(len(moves)),
+        moves
+    ))
+
+
+def unpack_evals(data: bytes) -> Tuple[List[Optional[Dict[str, Any]]], List[str]]:
+    """The evals (as the engine and analysis.endgame return them) and SAN moves of a packed game."""
+    (count,) = LENGTH.unpack_from(data, 0)
+    offset = LENGTH.size
+    values = struct.unpack_from(f'<{count}h', data, offset)
+    offset += 2 * count
+    mates = data[offset:offset + (count + 7) // 8]
+    offset += (count + 7) // 8
+    white_to_move = data[offset] == 1
+    offset += 1
+    (moves_length,) = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    moves = data[offset:offset + moves_length].decode('utf-8')
+
+    evals = []
+    for index, value in enumerate(values):
+        if value == NOT_EVALUATED:
+            evals.append(None)
+        elif mates[index >> 3] & (1 << (index & 7)):
+            evaluation = {'type': 'mate', 'value': value}
+            if value == 0:
+                # Checkmate on the board: the side to move is mated (see analysis.endgame)
+                to_move_white = white_to_move == (index % 2 == 0)
+                evaluation['mated'] = 'white' if to_move_white else 'black'
+            evals.append(evaluation)
+        else:
+            evals.append({'type': 'cp', 'value': value})
+    return evals, moves.split(' ') if moves else []
+
+
+def iter_records(data: bytes) -> Iterator[Tuple[Dict[str, Any], bytes, int]]:
+    """
+    (metadata, packed evals, end offset) of every complete record in a
+    store's bytes. A truncated last record (a run killed mid-write) is not
+    yielded.
+    """
+    offset = len(MAGIC)
+    while offset + RECORD_HEADER.size <= len(data):
+        (length,) = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        if offset + length > len(data):
+            return
+        body = data[offset:offset + length]
+        offset += length
+
+        (metadata_length,) = LENGTH.unpack_from(body, 0)
+        metadata = json.loads(body[LENGTH.size:LENGTH.size + metadata_length].decode('utf-8'))
+        yield metadata, body[LENGTH.size + metadata_length:], offset
+
+
+def read_store(path: str) -> bytes:
+    """The bytes of a store, checking its magic bytes."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not an eval store")
+    return data
+
+
+class EvalStore:
+    """Append-only writer of per-game eval records."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.keys = set()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+        else:
+            end = len(MAGIC)
+            for metadata, _, end in iter_records(read_store(path)):
+                if 'key' in metadata:
+                    self.keys.add(metadata['key'])
+            # Drop a truncated last record so the next one starts on a record boundary
+            self._file.truncate(end)
+            self._file.seek(0, os.SEEK_END)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def append(self, metadata: Dict[str, Any], packed: bytes) -> None:
+        """
+        Record a finished game. Written through to disk immediately, and
+        synced so the record is on disk before the game's journal line.
+        """
+        self._write(metadata, packed)
+        os.fsync(self._file.fileno())
+        self.keys.add(metadata['key'])
+
+    def finish(self, keys: List[str]) -> None:
+        """Record that a run finished, with the keys of all of its games."""
+        self._write({'games': keys}, b'')
+
+    def _write(self, metadata: Dict[str, Any], packed: bytes) -> None:
+        encoded = json.dumps(metadata).encode('utf-8')
+        body = LENGTH.pack(len(encoded)) + encoded + packed
+        self._file.write(RECORD_HEADER.pack(len(body)) + body)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_eval_records(path: str) -> List[Tuple[Dict[str, Any], List[Optional[Dict[str, Any]]], List[str]]]:
+    """
+    (metadata, evals, move_sans) of every game of the last finished run in
+    the store, the latest record per key, in gameIndex order. Raises
+    ValueError when no run finished or a game of the run has no record.
+    """
+    records = {}
+    games = None
+    for metadata, packed, _ in iter_records(read_store(path)):
+        if 'games' in metadata:
+            games = metadata['games']
+        else:
+            records[metadata.get('key')] = (metadata, packed)
+
+    if games is None:
+        raise ValueError(f"{path} has no finished run to rescore (was the run writing it interrupted?)")
+    missing = [key for key in games if key not in records]
+    if missing:
+        raise ValueError(f"{path} has no evals for {len(missing)} of the {len(games)} game(s) of its last run (e.g. {missing[0]}), re-run the analysis with --evals")
+
+    selected = []
+    for key in games:
+        metadata, packed = records[key]
+        selected.append((metadata, *unpack_evals(packed)))
+    return sorted(selected, key=lambda record: record[0]['gameIndex'])
@@ -0,0 +1,79 @@
+"""
+Analysis Journal
+================
+
+Append-only JSONL checkpoint of finished game analyses.
+
+Every analyzed game is written (and flushed) as soon as it is done, keyed by
+its gameId plus a hash of the move list and search settings. When a run is
+interrupted, or a round is re-run after new games finished, games already
+in the journal are reused instead of being analyzed again.
+
+Line format:
+    {"key": "abc123:9f2c...", "gameId": "abc123", "analysis": {...}}
+"""
+
+import hashlib
+import json
+import os
+
+
+def game_key(game_id, uci_moves, depth, sample_rate, shallow_depth=None, book_plies=0, syzygy=False, analyzers=()):
+    """Identify a game analysis by gameId, move list and search settings."""
+    settings = f"depth={depth}|sample={sample_rate}"
+    if shallow_depth:
+        settings += f"|shallow={shallow_depth}"
+    if book_plies:
+        settings += f"|book={book_plies}"
+    if syzygy:
+        settings += "|syzygy"
+    if analyzers:
+        settings += f"|analyzers={','.join(analyzers)}"
+    digest = hashlib.sha1(f"{' '.join(uci_moves)}|{settings}".encode()).hexdigest()
+    return f"{game_id}:{digest[:16]}"
+
+
+class GameJournal:
+    """JSONL journal of per-game analysis results."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A run killed mid-write leaves a truncated last line
+                        continue
+                    self.entries[entry['key']] = entry['analysis']
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._file = open(path, 'a', encoding='utf-8')
+
+        # Terminate a truncated last line so the next record starts on its own line
+        if self._file.tell() > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return the journaled analysis for a game key, or None."""
+        return self.entries.get(key)
+
+    def append(self, key, game_id, analysis):
+        """Record a finished game. Written through to disk immediately."""
+        self.entries[key] = analysis
+        self._file.write(json.dumps({'key': key, 'gameId': game_id, 'analysis': analysis}) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,195 @@
+"""
+Batch Game Metrics
+==================
+
+NumPy version of the per-game metrics in analyze-pgn.py
+(compute_game_metrics). All sampled plies of a game are scored at once
+from an int array of white-POV centipawns plus a mate mask: win%, win%
+loss, move quality, capped ACPL, accuracy, blunder severity, comeback
+swings (sliding-window min/max over the last 10 plies) and lucky escapes.
+
+Results are identical to the scalar loop, including its tie-breaking: every
+"biggest" pick keeps the first ply that reaches the maximum. Sums feeding
+accuracy and ACPL are taken in move order so floats match bit for bit.
+
+NumPy is optional. Without it available() is False and callers use the
+scalar loop.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from analysis.scoring import calculate_accuracy_from_win_percentage, cp_to_win_percentage, eval_to_cp
+
+QUALITIES = ('excellent', 'good', 'inaccuracies', 'mistakes', 'blunders')
+MAX_CP_LOSS_FOR_ACPL = 150
+COMEBACK_WINDOW = 10
+COMEBACK_MIN_HISTORY = 5
+
+
+def available():
+    """True when NumPy is installed and the batch path can be used."""
+    return np is not None
+
+
+def first_argmax(values, mask):
+    """Index of the first masked element holding the maximum, or None."""
+    candidates = np.flatnonzero(mask)
+    if candidates.size == 0:
+        return None
+    return int(candidates[np.argmax(values[candidates])])
+
+
+def window_extremes(values):
+    """
+    First index of the min and max of each trailing window of
+    COMEBACK_WINDOW values (shorter at the start), as absolute indices.
+    """
+    pad = COMEBACK_WINDOW - 1
+    info = np.iinfo(np.int64)
+    low = np.lib.stride_tricks.sliding_window_view(np.concatenate([np.full(pad, info.max), values]), COMEBACK_WINDOW)
+    high = np.lib.stride_tricks.sliding_window_view(np.concatenate([np.full(pad, info.min), values]), COMEBACK_WINDOW)
+    start = np.arange(values.size) - pad
+    return start + np.argmin(low, axis=1), start + np.argmax(high, axis=1)
+
+
+def eval_label(evaluation, cp):
+    """Comeback eval string: mate notation for mate scores, else centipawns."""
+    return f"M{evaluation.get('value')}" if evaluation['type'] == 'mate' else str(cp)
+
+
+def game_metrics(move_sans, evals, sample_rate=1, book_plies=0):
+    """
+    Batch equivalent of compute_game_metrics in analyze-pgn.py: same
+    arguments, same result dict.
+    """
+    sampled = [n for n in range(len(move_sans)) if (n // 2) % sample_rate == 0]
+    book_moves = [n for n in sampled if n < book_plies]
+    plies = np.array([n for n in sampled if n >= book_plies], dtype=np.int64)
+
+    cp_values = [eval_to_cp(e) if e is not None else 0 for e in evals]
+    cp = np.array(cp_values, dtype=np.int64)
+    mate = np.array([e is not None and e['type'] == 'mate' for e in evals], dtype=bool)
+    # Once per position with libm pow: NumPy's SIMD power can differ in the last bit
+    win = np.array([cp_to_win_percentage(value) for value in cp_values])
+
+    is_white = plies % 2 == 0
+    cp_before = cp[plies]
+    cp_after = cp[plies + 1]
+    mate_before = mate[plies]
+    mate_after = mate[plies + 1]
+    both_cp = ~mate_before & ~mate_after
+
+    # Win% loss from the mover's perspective (same float operations as the scalar path)
+    win_before = win[plies]
+    win_after = win[plies + 1]
+    win_loss = np.maximum(0, np.where(is_white, win_before - win_after, (100 - win_before) - (100 - win_after)))
+
+    # Quality index into QUALITIES; big losses from decided positions are only mistakes
+    decided = (win_before <= 10) | (win_before >= 90)
+    quality = np.select(
+        [win_loss < 2, win_loss < 5, win_loss < 10, win_loss < 20, decided],
+        [0, 1, 2, 3, 3],
+        default=4
+    )
+
+    cp_loss = np.where(is_white, np.maximum(0, cp_before - cp_after), np.maximum(0, cp_after - cp_before))
+    capped_loss = np.minimum(cp_loss, MAX_CP_LOSS_FOR_ACPL)
+
+    # Blunder severity (see calculate_blunder_severity), evals from the mover's perspective
+    player_before = np.where(is_white, cp_before, -cp_before)
+    margin = np.abs(cp_before)
+    severity = np.where(mate_after, win_loss + 100 / (np.abs(cp_after) + 1), win_loss)
+    severity = np.where(~mate_before & (margin > 200), severity * (1 + np.minimum(2, (margin - 200) / 400)), severity)
+    severity = np.where(mate_before & (player_before > 0), severity * 3, severity)
+
+    result = {}
+    for color, side in (('white', is_white), ('black', ~is_white)):
+        book_count = sum(1 for n in book_moves if (n % 2 == 0) == (color == 'white'))
+        counts = np.bincount(quality[side], minlength=len(QUALITIES))
+
+        move_quality = {name: int(counts[QUALITIES.index(name)]) for name in ('blunders', 'mistakes', 'inaccuracies', 'good')}
+        move_quality['excellent'] = int(counts[0]) + book_count
+
+        win_losses = [0] * book_count + win_loss[side].tolist()
+        acpl_losses = [0] * book_count + capped_loss[side & both_cp].tolist()
+        acpl = sum(acpl_losses) / len(acpl_losses) if acpl_losses else 0
+
+        result[color] = {
+            'acpl': acpl,
+            'accuracy': calculate_accuracy_from_win_percentage(win_losses),
+            'quality': move_quality,
+            'engineMoves': move_quality['excellent']
+        }
+
+    biggest_blunder = None
+    index = first_argmax(severity, quality == 4)
+    if index is not None:
+        biggest_blunder = {
+            'moveNumber': int(plies[index]) // 2 + 1,
+            'player': 'white' if is_white[index] else 'black',
+            'cpLoss': int(cp_loss[index]) if both_cp[index] else 0,
+            'winLoss': float(win_loss[index]),
+            'severity': float(severity[index]),
+            'move': move_sans[plies[index]],
+            'evalBefore': int(cp_before[index]),
+            'evalAfter': int(cp_after[index])
+        }
+
+    # Lucky escape: the previous sampled ply gave the opponent an edge they didn't keep
+    lucky_escape = None
+    if plies.size > 1:
+        prev = cp_after[:-1]
+        after = cp_after[1:]
+        white_escape = (prev < -200) & (after > -50)
+        black_escape = (prev > 200) & (after < 50)
+        index = first_argmax(np.abs(prev) - np.abs(after), white_escape | black_escape)
+        if index is not None:
+            lucky_escape = {
+                'player': 'white' if white_escape[index] else 'black',
+                'escapeAmount': int(abs(prev[index]) - abs(after[index])),
+                'evalBefore': int(prev[index]),
+                'evalAfter': int(after[index]),
+                'moveNumber': int(plies[index + 1]) // 2 + 1
+            }
+
+    # Comeback: eval swung from losing to winning within the last 10 sampled plies
+    biggest_comeback = None
+    if plies.size >= COMEBACK_MIN_HISTORY:
+        low_index, high_index = window_extremes(cp_after)
+        low = cp_after[low_index]
+        high = cp_after[high_index]
+        has_history = np.arange(plies.size) >= COMEBACK_MIN_HISTORY - 1
+        white_comeback = has_history & (low < -300) & (cp_after > 300)
+        black_comeback = has_history & (high > 300) & (cp_after < -300)
+        swing = np.minimum(np.where(white_comeback, cp_after - low, high - cp_after), 2000)
+        index = first_argmax(swing, white_comeback | black_comeback)
+        if index is not None:
+            origin = int(low_index[index] if white_comeback[index] else high_index[index])
+            eval_from_cp = int(cp_after[origin])
+            eval_to_cp_value = int(cp_after[index])
+            biggest_comeback = {
+                'player': 'white' if white_comeback[index] else 'black',
+                'swing': int(swing[index]),
+                'evalFrom': eval_label(evals[plies[origin] + 1], eval_from_cp),
+                'evalTo': eval_label(evals[plies[index] + 1], eval_to_cp_value),
+                'evalFromCp': eval_from_cp,
+                'evalToCp': eval_to_cp_value,
+                'moveNumber': int(plies[index]) // 2 + 1
+            }
+
+    return {
+        'whiteACPL': round(result['white']['acpl'], 1),
+        'blackACPL': round(result['black']['acpl'], 1),
+        'whiteAccuracy': round(result['white']['accuracy'], 1),
+        'blackAccuracy': round(result['black']['accuracy'], 1),
+        'whiteMoveQuality': result['white']['quality'],
+        'blackMoveQuality': result['black']['quality'],
+        'whiteEngineMoves': result['white']['engineMoves'],
+        'blackEngineMoves': result['black']['engineMoves'],
+        'biggestBlunder': biggest_blunder,
+        'biggestComeback': biggest_comeback,
+        'luckyEscape': lucky_escape
+    }
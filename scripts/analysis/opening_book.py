@@ -0,0 +1,127 @@
+"""
+Opening Book
+============
+
+Set of known opening positions built from the Lichess chess-openings TSV
+files in scripts/utils/openings-[a-e].tsv (the same data behind
+chess-openings.js).
+
+Only mainline theory counts as book: a position is stored when at least
+two named lines pass through it (MIN_BOOK_LINES). The database also names
+traps and refuted tries ("Barnes Opening: Fool's Mate", 1. f3 e5 2. g4??
+Qh4#; "Hammerschlag", 2. Kf2), whose final moves are reached by that one
+line alone, so they stay out of the book and are still analyzed; lines
+that end in checkmate are skipped altogether.
+
+Positions are stored as EPD strings (piece placement, side to move,
+castling, en passant), so transpositions into a known line are recognized
+too. Replaying ~3,500 lines takes a moment, so the set is cached on disk
+and only rebuilt when the TSV files or the book rules change.
+"""
+
+import collections
+import glob
+import hashlib
+import os
+
+import chess
+
+UTILS_DIR = os.path.join(os.path.dirname(__file__), '..', 'utils')
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'opening-book.epd')
+
+# Named lines that must pass through a position for it to be book
+MIN_BOOK_LINES = 2
+# Part of the cache fingerprint, bump when the rules above change
+BOOK_RULES_VERSION = 2
+
+
+def opening_files():
+    """Paths of the openings TSV files, in a stable order."""
+    return sorted(glob.glob(os.path.join(UTILS_DIR, 'openings-*.tsv')))
+
+
+def fingerprint(paths):
+    """Content hash of the TSV files and book rules, stored in the cache header."""
+    digest = hashlib.sha1(f"rules={BOOK_RULES_VERSION},lines={MIN_BOOK_LINES}".encode('ascii'))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def iter_opening_lines(paths):
+    """Yield each opening line as a list of SAN moves ("1. e4 e5" -> ["e4", "e5"])."""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            next(f, None)  # header: eco, name, pgn
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) < 3:
+                    continue
+                yield [token for token in parts[2].split() if not token[0].isdigit()]
+
+
+def build_book_positions(paths):
+    """
+    Replay every opening line and collect the EPDs of the positions at least
+    MIN_BOOK_LINES lines pass through. Lines ending in checkmate are traps,
+    not theory, and are left out.
+    """
+    line_counts = collections.Counter()
+    for sans in iter_opening_lines(paths):
+        board = chess.Board()
+        line_positions = set()
+        for san in sans:
+            board.push_san(san)
+            line_positions.add(board.epd())
+        if not board.is_checkmate():
+            line_counts.update(line_positions)
+    return {epd for epd, lines in line_counts.items() if lines >= MIN_BOOK_LINES}
+
+
+def load_opening_book(path=DEFAULT_BOOK_PATH):
+    """
+    Return the frozenset of book EPDs, reading the on-disk cache when it was
+    built from the current TSV files and rebuilding it otherwise.
+    """
+    paths = opening_files()
+    current = fingerprint(paths)
+
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            header = f.readline().strip()
+            if header == f"# {current}":
+                return frozenset(line.rstrip('\n') for line in f if line.strip())
+
+    positions = build_book_positions(paths)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(f"# {current}\n")
+        for epd in sorted(positions):
+            f.write(epd + '\n')
+    os.replace(tmp_path, path)
+
+    return frozenset(positions)
+
+
+def count_book_plies(board, moves, book):
+    """
+    Number of leading moves that stay in book, played from board.
+
+    Only games from the standard starting position can be in book. Once a
+    move leaves the book the rest of the game is out of book, even if it
+    later transposes back into a known line.
+    """
+    if board.chess960 or board.fen() != chess.STARTING_FEN:
+        return 0
+
+    board = board.copy(stack=False)
+    plies = 0
+    for move in moves:
+        board.push(move)
+        if board.epd() not in book:
+            break
+        plies += 1
+    return plies
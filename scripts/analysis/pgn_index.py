@@ -0,0 +1,189 @@
+"""
+PGN Index
+=========
+
+Byte-offset index of a round's PGN file, so the analyzers can pick games
+out of it without reading the whole file:
+
+    python analyze-pgn.py --pgn data/season-46-round-1.pgn --games abc123,def456
+    python analyze-tactics.py --pgn data/season-46-round-1.pgn --players alice,bob
+    python analyze-pgn.py --pgn data/season-46-round-1.pgn --range 10-20
+
+The index is a sidecar next to the PGN (data/season-46-round-1.index.json)
+with each game's position, byte offset and length, and the headers used to
+select it:
+
+    {"size": 812345, "mtime": 1718000000.0, "games": [
+        {"index": 0, "gameId": "abc123", "white": "alice", "black": "bob",
+         "result": "1-0", "offset": 0, "length": 1432}, ...]}
+
+It is built on first use (or with index-pgn.py) and rebuilt when the PGN's
+size or modification time no longer match. Selected games are read from a
+memory map of the PGN, so only their bytes are touched and parsed. Games
+keep their index in the file as gameIndex, so results of a selection line
+up with a full run of the round.
+"""
+
+import io
+import json
+import mmap
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from analysis.pgn_reader import PgnGame, pgn_game_id, read_game, read_game_text
+
+
+def index_path(pgn_path: str) -> str:
+    """The sidecar index file of a PGN: data/season-46-round-1.pgn -> data/season-46-round-1.index.json."""
+    return os.path.splitext(pgn_path)[0] + '.index.json'
+
+
+class MappedLines:
+    """readline() over a memory map, decoding each line, for read_game_text."""
+
+    def __init__(self, mapped: mmap.mmap):
+        self.mapped = mapped
+
+    def readline(self) -> str:
+        return self.mapped.readline().decode('utf-8', errors='replace')
+
+
+def open_mapped(pgn_path: str) -> Optional[mmap.mmap]:
+    """A read-only memory map of the PGN, or None when the file is empty (which can't be mapped)."""
+    with open(pgn_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_index(pgn_path: str) -> Dict[str, Any]:
+    """Scan the PGN once for each game's byte range and headers (moves are not parsed)."""
+    stat = os.stat(pgn_path)
+    games = []
+    mapped = open_mapped(pgn_path)
+    if mapped is not None:
+        with mapped:
+            lines = MappedLines(mapped)
+            offset = 0
+            game_text = read_game_text(lines)
+            while game_text is not None:
+                headers, _ = game_text
+                end = mapped.tell()
+                games.append({
+                    'index': len(games),
+                    'gameId': pgn_game_id(headers),
+                    'white': headers.get('White', 'Unknown'),
+                    'black': headers.get('Black', 'Unknown'),
+                    'result': headers.get('Result'),
+                    'offset': offset,
+                    'length': end - offset
+                })
+                offset = end
+                game_text = read_game_text(lines)
+
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'games': games}
+
+
+def load_index(pgn_path: str, path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    The PGN's index, from the sidecar file when it is up to date, otherwise
+    rebuilt and saved (a read-only data directory only costs the rebuild).
+    """
+    path = path or index_path(pgn_path)
+    stat = os.stat(pgn_path)
+    try:
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('size') == stat.st_size and index.get('mtime') == stat.st_mtime:
+            return index
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    index = build_index(pgn_path)
+    try:
+        save_index(index, path)
+    except OSError:
+        pass
+    return index
+
+
+def save_index(index: Dict[str, Any], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+        f.write('\n')
+
+
+def parse_range(text: str) -> Tuple[int, Optional[int]]:
+    """
+    A --range of 1-based game numbers, inclusive: "12", "10-20" or "10-"
+    (to the end). Returns (first, last) with last None for an open end.
+    """
+    first, separator, last = text.partition('-')
+    try:
+        first_number = int(first)
+        last_number = int(last) if last else (None if separator else first_number)
+    except ValueError:
+        raise ValueError(f"invalid game range {text!r} (expected N, N-M or N-)")
+    if first_number < 1 or (last_number is not None and last_number < first_number):
+        raise ValueError(f"invalid game range {text!r}")
+    return first_number, last_number
+
+
+def select_games(games: List[Dict[str, Any]], game_ids: Optional[Sequence[str]] = None,
+                 players: Optional[Sequence[str]] = None,
+                 game_range: Optional[Tuple[int, Optional[int]]] = None) -> List[Dict[str, Any]]:
+    """
+    Index entries matching every given filter, in file order: game IDs,
+    players (white or black, case-insensitive) and a parse_range() range.
+    """
+    selected = games
+    if game_range is not None:
+        first, last = game_range
+        selected = selected[first - 1:last]
+    if game_ids:
+        wanted = set(game_ids)
+        selected = [game for game in selected if game['gameId'] in wanted]
+    if players:
+        wanted = {player.lower() for player in players}
+        selected = [game for game in selected if game['white'].lower() in wanted or game['black'].lower() in wanted]
+    return selected
+
+
+def iter_indexed_games(pgn_path: str, entries: List[Dict[str, Any]]) -> Iterator[Tuple[int, PgnGame]]:
+    """(gameIndex, game) for each index entry, read from a memory map of the PGN."""
+    if not entries:
+        return
+    with open_mapped(pgn_path) as mapped:
+        for entry in entries:
+            text = mapped[entry['offset']:entry['offset'] + entry['length']].decode('utf-8', errors='replace')
+            yield entry['index'], read_game(io.StringIO(text))
+
+
+def select_input_games(parser, args):
+    """
+    The index entries an analyzer's --pgn and --games/--players/--range
+    options pick, or None to read stdin. Bad options exit through
+    parser.error.
+    """
+    filtered = args.games or args.players or args.range
+    if args.pgn is None:
+        if filtered:
+            parser.error('--games, --players and --range need --pgn')
+        return None
+
+    try:
+        game_range = parse_range(args.range) if args.range else None
+        index = load_index(args.pgn)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    game_ids = args.games.split(',') if args.games else None
+    selection = select_games(index['games'], game_ids, args.players.split(',') if args.players else None, game_range)
+    if game_ids:
+        missing = set(game_ids) - {game['gameId'] for game in index['games']}
+        if missing:
+            print(f"⚠️  Not in {args.pgn}: {', '.join(sorted(missing))}", file=sys.stderr)
+    if filtered:
+        print(f"🗂️  {len(selection)} of {len(index['games'])} game(s) selected from {args.pgn}", file=sys.stderr)
+    return selection
@@ -0,0 +1,243 @@
+"""
+Lightweight PGN Reader
+======================
+
+A fast stand-in for chess.pgn.read_game for the analyzers, which only need
+a few headers and the mainline moves of each game.
+
+chess.pgn.read_game builds a full GameNode tree, keeps every header and
+comment, and resolves each SAN move with a legal move generation. This
+reader scans the game text line by line instead: it keeps only the
+headers the analyzers read (see PGN_HEADERS), drops comments (clock
+annotations included), NAGs and variations without parsing them, and
+resolves the mainline SAN from the board's attack bitboards. Only SAN
+that is ambiguous that way (a pinned piece left out of the
+disambiguation), castling and other unusual moves go through python-chess's
+parse_san.
+
+The movetext is trusted to be legal, as it is in lichess exports. A move
+that can't be resolved at all ends the mainline there, like read_game
+does, and is logged and recorded in PgnGame.errors.
+
+    game = read_game(handle)
+    game.headers.get('White'), game.board(), game.mainline_moves()
+"""
+
+import logging
+import re
+import chess
+import chess.pgn
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Headers the analyzers read, plus the ones that set up the start position
+PGN_HEADERS = frozenset(('White', 'Black', 'GameId', 'Site', 'Result', 'FEN', 'SetUp', 'Variant'))
+
+# Movetext tokens: the moves chess.pgn.MOVETEXT_REGEX recognizes, plus the
+# comments, NAGs and variation brackets to skip. Comments may span lines.
+MOVETEXT_TOKEN_REGEX = re.compile(r"""
+    (?P<skip>\{[^}]*\}?|;[^\n]*|\$[0-9]+)
+    |(?P<open>\()
+    |(?P<close>\))
+    |(?P<move>
+        [NBKRQ]?[a-h]?[1-8]?[\-x]?[a-h][1-8](?:=?[nbrqkNBRQK])?
+        |[PNBRQK]?@[a-h][1-8]
+        |--
+        |Z0
+        |0000
+        |@@@@
+        |O-O(?:-O)?
+        |0-0(?:-0)?
+    )
+    """, re.VERBOSE)
+SAN_REGEX = re.compile(r'^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQnbrq]))?$')
+PIECE_SYMBOLS = {'N': chess.KNIGHT, 'B': chess.BISHOP, 'R': chess.ROOK, 'Q': chess.QUEEN, 'K': chess.KING}
+
+
+class PgnGame:
+    """
+    The parts of a PGN game the analyzers use. Duck-types the
+    chess.pgn.Game methods they call: headers.get(), board() and
+    mainline_moves().
+    """
+
+    __slots__ = ('headers', 'moves', 'errors')
+
+    def __init__(self, headers: Dict[str, str], moves: List[chess.Move], errors: List[Exception]):
+        self.headers = headers
+        self.moves = moves
+        self.errors = errors
+
+    def board(self) -> chess.Board:
+        """The starting position, from the FEN and Variant headers like chess.pgn.Game.board()."""
+        return start_board(self.headers)
+
+    def mainline_moves(self) -> List[chess.Move]:
+        return self.moves
+
+
+def start_board(headers: Dict[str, str]) -> chess.Board:
+    """The starting position for a game's headers, set up the way chess.pgn.read_game does."""
+    pgn_headers = chess.pgn.Headers(headers)
+    VariantBoard = pgn_headers.variant()
+    board = VariantBoard(headers.get('FEN', VariantBoard.starting_fen), chess960=pgn_headers.is_chess960())
+    board.chess960 = board.chess960 or board.has_chess960_castling_rights()
+    return board
+
+
+def resolve_san(board: chess.Board, san: str) -> chess.Move:
+    """
+    The move for a SAN token in this position. Plain piece and pawn moves
+    are matched against the attack bitboards; anything that doesn't come
+    down to a single candidate is left to board.parse_san.
+    """
+    match = SAN_REGEX.match(san)
+    if match:
+        piece, from_file, from_rank, to_name, promotion = match.groups()
+        to_square = chess.parse_square(to_name)
+        color = board.turn
+
+        if piece:
+            candidates = board.attackers_mask(color, to_square) & board.pieces_mask(PIECE_SYMBOLS[piece], color)
+        else:
+            pawns = board.pieces_mask(chess.PAWN, color)
+            if from_file and from_file != to_name[0]:
+                # Pawn capture (en passant included): pawns attacking the square
+                candidates = chess.BB_PAWN_ATTACKS[not color][to_square] & pawns
+            else:
+                behind = to_square - 8 if color == chess.WHITE else to_square + 8
+                candidates = pawns & chess.BB_SQUARES[behind] if 0 <= behind < 64 else 0
+                double_rank = 3 if color == chess.WHITE else 4
+                if not candidates and chess.square_rank(to_square) == double_rank and not board.piece_at(behind):
+                    start = behind - 8 if color == chess.WHITE else behind + 8
+                    candidates = pawns & chess.BB_SQUARES[start]
+
+        if from_file:
+            candidates &= chess.BB_FILES[chess.FILE_NAMES.index(from_file)]
+        if from_rank:
+            candidates &= chess.BB_RANKS[int(from_rank) - 1]
+
+        # Exactly one candidate
+        if candidates and not candidates & (candidates - 1):
+            return chess.Move(chess.lsb(candidates), to_square, PIECE_SYMBOLS[promotion.upper()] if promotion else None)
+
+    return board.parse_san(san)
+
+
+def mainline_sans(movetext: str) -> List[str]:
+    """The mainline SAN tokens of a game's movetext, without comments, NAGs or variations."""
+    sans = []
+    variation_depth = 0
+    for match in MOVETEXT_TOKEN_REGEX.finditer(movetext):
+        kind = match.lastgroup
+        if kind == 'open':
+            variation_depth += 1
+        elif kind == 'close':
+            variation_depth = max(0, variation_depth - 1)
+        elif kind == 'move' and not variation_depth:
+            sans.append(match.group(0))
+    return sans
+
+
+def read_game_text(handle: TextIO) -> Optional[Tuple[Dict[str, str], str]]:
+    """
+    Read the next game's kept headers and raw movetext from a PGN text
+    stream, or None at the end of the stream. Games are separated the way
+    chess.pgn.read_game separates them. `handle` only needs readline().
+    """
+    # Ignore leading empty lines and comments
+    line = handle.readline().lstrip('\ufeff')
+    while line.isspace() or line.startswith('%') or line.startswith(';'):
+        line = handle.readline()
+    if not line:
+        return None
+
+    # Headers, with up to one empty line between them
+    headers = {}
+    consecutive_empty_lines = 0
+    while line:
+        if line.startswith('%') or line.startswith(';'):
+            line = handle.readline()
+            continue
+        if consecutive_empty_lines < 1 and line.isspace():
+            consecutive_empty_lines += 1
+            line = handle.readline()
+            continue
+        if not line.startswith('['):
+            break
+        consecutive_empty_lines = 0
+        tag_match = chess.pgn.TAG_REGEX.match(line)
+        if tag_match and tag_match.group(1) in PGN_HEADERS:
+            headers[tag_match.group(1)] = tag_match.group(2)
+        line = handle.readline()
+
+    # Movetext, up to the first empty line outside a comment
+    movetext = []
+    in_comment = False
+    while line:
+        if not in_comment:
+            if line.isspace():
+                break
+            if line.startswith('%'):
+                line = handle.readline()
+                continue
+        movetext.append(line)
+        for match in chess.pgn.SKIP_MOVETEXT_REGEX.finditer(line):
+            token = match.group(0)
+            if token == '{':
+                in_comment = True
+            elif not in_comment and token == ';':
+                break
+            elif token == '}':
+                in_comment = False
+        line = handle.readline()
+
+    return headers, ''.join(movetext)
+
+
+def read_game(handle: TextIO) -> Optional[PgnGame]:
+    """Read the next game from a PGN text stream, or None at the end of the stream."""
+    game_text = read_game_text(handle)
+    if game_text is None:
+        return None
+    headers, movetext = game_text
+
+    moves = []
+    errors = []
+    try:
+        board = start_board(headers)
+    except ValueError as error:
+        LOGGER.error("%s in the headers of a game", error)
+        return PgnGame(headers, moves, [error])
+
+    for san in mainline_sans(movetext):
+        try:
+            move = resolve_san(board, san)
+        except ValueError as error:
+            # The rest of the mainline can't be replayed, as in chess.pgn.read_game
+            LOGGER.error("%s while parsing %s vs. %s", error, headers.get('White', '?'), headers.get('Black', '?'))
+            errors.append(error)
+            break
+        moves.append(move)
+        board.push(move)
+
+    return PgnGame(headers, moves, errors)
+
+
+def iter_games(handle: TextIO) -> Iterator[PgnGame]:
+    """Read games one at a time from a PGN text stream."""
+    while True:
+        game = read_game(handle)
+        if game is None:
+            return
+        yield game
+
+
+def pgn_game_id(headers: Dict[str, str]) -> Optional[str]:
+    """The lichess game ID: the GameId header, else the last part of the Site URL."""
+    game_id = headers.get('GameId')
+    if not game_id:
+        site = headers.get('Site', '')
+        game_id = site.split('/')[-1] if site else None
+    return game_id
@@ -0,0 +1,36 @@
+"""
+Ply Analyzers
+=============
+
+Registry of the analyzers analyze-pgn.py can run alongside the Stockfish
+metrics during its single replay of each game (--tactics, ...).
+
+Each analyzer names its output key, a tracker class and a summary class.
+The tracker is built on the board being replayed, gets ply(move_num,
+move_san) after every pushed move and returns the per-game result with
+result(). The summary folds per-game results (with white, black and
+gameIndex added) in with add() and returns the round summary with
+result(). A new analyzer only needs an entry here.
+"""
+
+from collections import namedtuple
+
+import chess
+
+from analysis.tactics import TacticalTracker, TacticsSummary
+
+PlyAnalyzer = namedtuple('PlyAnalyzer', ['key', 'tracker', 'summary'])
+
+PLY_ANALYZERS = {
+    'tactics': PlyAnalyzer('tactics', TacticalTracker, TacticsSummary)
+}
+
+
+def start_trackers(keys, board):
+    """Trackers for the given analyzer keys over the board about to be replayed."""
+    return {key: PLY_ANALYZERS[key].tracker(board) for key in keys}
+
+
+def empty_result(key):
+    """Per-game result of an analyzer for a game without moves."""
+    return PLY_ANALYZERS[key].tracker(chess.Board()).result()
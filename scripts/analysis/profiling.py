@@ -0,0 +1,73 @@
+"""
+Stage Profiling
+===============
+
+Lightweight per-stage timers for the analyzers' --profile option.
+
+A StageProfiler accumulates wall-clock time, CPU time and call counts per
+named stage (PGN parsing, replay, engine, metrics, summary, output). Worker
+processes keep their own profiler per task and ship the raw stage totals
+back, which the parent folds in with merge().
+
+When profiling is off, callers pass profiler=None and timed() returns a
+no-op context, so the hot paths pay nothing.
+"""
+
+import contextlib
+import time
+
+
+class StageProfiler:
+    """Wall/CPU timers and call counts per named stage."""
+
+    def __init__(self):
+        self.stages = {}
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add(self, name, wall, cpu, calls=1):
+        totals = self.stages.setdefault(name, [0.0, 0.0, 0])
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += calls
+
+    def merge(self, stages):
+        """Fold in raw stage totals from another profiler (see snapshot)."""
+        for name, (wall, cpu, calls) in stages.items():
+            self.add(name, wall, cpu, calls)
+
+    def snapshot(self):
+        """Raw stage totals, cheap to pickle back from a worker."""
+        return {name: tuple(totals) for name, totals in self.stages.items()}
+
+    def result(self):
+        """The performance block: total wall/CPU time plus every stage."""
+        return {
+            'wallSeconds': round(time.perf_counter() - self.started, 3),
+            'cpuSeconds': round(time.process_time() - self.cpu_started, 3),
+            'stages': {
+                name: {
+                    'wallSeconds': round(wall, 3),
+                    'cpuSeconds': round(cpu, 3),
+                    'calls': calls
+                }
+                for name, (wall, cpu, calls) in self.stages.items()
+            }
+        }
+
+
+def timed(profiler, name):
+    """profiler.stage(name), or a no-op context when profiling is off."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name)
+
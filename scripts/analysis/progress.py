@@ -0,0 +1,113 @@
+"""
+Progress Events
+===============
+
+Machine-readable progress for the analyzers' --progress json mode: one JSON
+object per line, written to stderr or any file descriptor.
+
+    {"event": "start", "totalGames": 160, "elapsed": 0.0}
+    {"event": "game", "gameIndex": 3, "gameId": "abc123", "status": "analyzed",
+     "plies": 84, "gamesDone": 4, "pliesDone": 301, "totalGames": 160,
+     "pliesPerSec": 12.4, "eta": 1843.2, "elapsed": 24.3}
+    {"event": "done", "gamesDone": 160, "pliesDone": 13020, "elapsed": 1012.8}
+
+Throughput (pliesPerSec) is a moving average over finished games:
+exponential averages of plies per game and of the time they took, so
+bursts of games finishing together (worker pool) don't skew it. The ETA
+weighs it against the plies still to go: plies of games already read but
+not finished, plus the average game length times the games not read yet.
+Games reused from a journal or skipped count as done but don't feed the
+throughput average. It counts plies, not engine searches: plies skipped by
+--sample, book moves and cache or tablebase hits take less time but still
+count.
+"""
+
+import json
+import time
+
+DEFAULT_SMOOTHING = 0.1
+
+
+class ProgressReporter:
+    """Writes progress events as JSON lines and keeps the throughput estimate."""
+
+    def __init__(self, stream, total_games=None, smoothing=DEFAULT_SMOOTHING):
+        self.stream = stream
+        self.total_games = total_games
+        self.smoothing = smoothing
+        self.started = time.perf_counter()
+        self.last_finish = self.started
+
+        self.games_queued = 0
+        self.plies_queued = 0
+        self.games_done = 0
+        self.plies_done = 0
+
+        # Exponential moving averages of plies per analyzed game and seconds it took
+        self.avg_plies = None
+        self.avg_seconds = None
+
+    def emit(self, event, **fields):
+        record = {'event': event, **fields, 'elapsed': round(time.perf_counter() - self.started, 1)}
+        self.stream.write(json.dumps(record) + '\n')
+        self.stream.flush()
+
+    def start(self):
+        self.emit('start', totalGames=self.total_games)
+
+    def queued(self, plies):
+        """A game was read and will be processed (its length counts toward the ETA)."""
+        self.games_queued += 1
+        self.plies_queued += plies
+
+    def plies_per_sec(self):
+        if not self.avg_seconds:
+            return None
+        return self.avg_plies / self.avg_seconds
+
+    def eta(self):
+        """Seconds left, or None until a game has been timed or without a game count."""
+        rate = self.plies_per_sec()
+        if not rate or self.total_games is None:
+            return None
+        remaining = self.plies_queued - self.plies_done
+        if self.games_queued:
+            unread = max(0, self.total_games - self.games_queued)
+            remaining += unread * self.plies_queued / self.games_queued
+        return remaining / rate
+
+    def finished(self, game_index, plies, status='analyzed', game_id=None):
+        """
+        A game is done. status is 'analyzed' (timed), or 'journal'/'skipped'
+        (reused or empty, not timed).
+        """
+        now = time.perf_counter()
+        self.games_done += 1
+        self.plies_done += plies
+
+        if status == 'analyzed':
+            seconds = now - self.last_finish
+            if self.avg_plies is None:
+                self.avg_plies, self.avg_seconds = plies, seconds
+            else:
+                self.avg_plies += self.smoothing * (plies - self.avg_plies)
+                self.avg_seconds += self.smoothing * (seconds - self.avg_seconds)
+        self.last_finish = now
+
+        rate = self.plies_per_sec()
+        eta = self.eta()
+        self.emit(
+            'game',
+            gameIndex=game_index,
+            gameId=game_id,
+            status=status,
+            plies=plies,
+            gamesDone=self.games_done,
+            pliesDone=self.plies_done,
+            totalGames=self.total_games,
+            pliesPerSec=round(rate, 2) if rate is not None else None,
+            eta=round(eta, 1) if eta is not None else None
+        )
+
+    def done(self):
+        self.emit('done', gamesDone=self.games_done, pliesDone=self.plies_done)
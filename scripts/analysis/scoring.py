@@ -0,0 +1,121 @@
+"""
+Move Scoring
+============
+
+Lichess-style scoring of single moves: centipawns to win percentage, move
+classification by win% loss, accuracy and blunder severity.
+Based on https://lichess.org/page/accuracy
+
+Shared by the per-ply loop in analyze-pgn.py and the batch metrics in
+analysis.metrics.
+"""
+
+import math
+
+
+def cp_to_win_percentage(cp):
+    """
+    Convert centipawn evaluation to win percentage.
+    Based on Lichess formula: https://lichess.org/page/accuracy
+    """
+    return 50 + 50 * (2 / (1 + pow(10, -abs(cp) / 400)) - 1) * (-1 if cp < 0 else 1)
+
+
+def classify_move_by_win_percentage(win_before, win_after, is_white):
+    """
+    Classify move quality based on win percentage change.
+    Based on Lichess algorithm: https://github.com/lichess-org/lila/blob/master/modules/analyse/src/main/AccuracyPercent.scala
+
+    Returns: (quality, win_loss) where quality is 'excellent', 'good', 'inaccuracies', 'mistakes', or 'blunders'
+    """
+    # Calculate win percentage loss (from player's perspective)
+    if is_white:
+        win_loss = win_before - win_after
+    else:
+        # For black, we need to flip the percentages
+        win_loss = (100 - win_before) - (100 - win_after)
+
+    # Normalize to 0-100 range
+    win_loss = max(0, win_loss)
+
+    # Lichess classification thresholds (based on win% loss)
+    if win_loss < 2:
+        return 'excellent', win_loss
+    elif win_loss < 5:
+        return 'good', win_loss
+    elif win_loss < 10:
+        return 'inaccuracies', win_loss
+    elif win_loss < 20:
+        return 'mistakes', win_loss
+    else:
+        # Only count as blunder if the position actually swings significantly
+        # Don't count blunders when already completely winning/losing
+        if win_before > 10 and win_before < 90:  # Position wasn't already decided
+            return 'blunders', win_loss
+        else:
+            return 'mistakes', win_loss
+
+
+def calculate_accuracy_from_win_percentage(win_losses):
+    """
+    Calculate accuracy percentage from list of win percentage losses.
+    Based on Lichess formula.
+    """
+    if not win_losses:
+        return 100
+
+    # Lichess formula: 103.1668 * e^(-0.04354 * average_win_loss) - 3.1669
+    avg_loss = sum(win_losses) / len(win_losses)
+    accuracy = 103.1668 * math.exp(-0.04354 * avg_loss) - 3.1669
+
+    return max(0, min(100, accuracy))
+
+
+def calculate_blunder_severity(eval_before, eval_after, eval_before_type, eval_after_type, win_loss):
+    """
+    Calculate blunder severity considering position context and mate threats.
+
+    A blunder from a winning position to mate is much worse than a small cp loss in a losing position.
+    Returns a severity score for comparison (higher = worse blunder).
+    """
+    # Base severity from win percentage loss
+    severity = win_loss
+
+    # Check if blunder leads to mate (extremely severe)
+    if eval_after_type == 'mate':
+        mate_in = abs(eval_after)
+        # Mate threats are catastrophic - add huge penalty, scaled by how soon mate arrives
+        # Mate in 1-3 moves is devastating, longer mates less so
+        mate_penalty = 100 / (mate_in + 1)  # M1 = 50, M2 = 33, M3 = 25, etc.
+        severity += mate_penalty
+
+    # Check if position was winning before blunder (amplify severity)
+    if eval_before_type == 'cp':
+        # If player was winning by 200+ cp (or equivalent for black)
+        winning_margin = abs(eval_before)
+        if winning_margin > 200:
+            # Blundering from a winning position is worse - multiply by how much you were winning
+            # Cap the multiplier at 3x for positions > 600 cp advantage
+            position_multiplier = 1 + min(2, (winning_margin - 200) / 400)
+            severity *= position_multiplier
+    elif eval_before_type == 'mate' and eval_before > 0:
+        # Was delivering mate but blundered it away - extremely severe
+        severity *= 3
+
+    return severity
+
+
+def eval_to_cp(evaluation):
+    """
+    Convert a Stockfish evaluation to centipawns from white's perspective.
+    Uses more granular mate scoring: mate-in-N = 10000 - (N * 10)
+    """
+    if evaluation['type'] == 'cp':
+        return evaluation['value']
+    elif evaluation['type'] == 'mate':
+        mate_in = evaluation['value']
+        if mate_in == 0 and 'mated' in evaluation:
+            # Checkmate on the board (see analysis.endgame)
+            return -10000 if evaluation['mated'] == 'white' else 10000
+        return (10000 - abs(mate_in) * 10) * (1 if mate_in > 0 else -1)
+    return 0
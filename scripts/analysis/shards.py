@@ -0,0 +1,85 @@
+"""
+Round Shards
+============
+
+Splits one round's games over several machines and merges their outputs
+back into the output of the whole round:
+
+    python analyze-pgn.py --pgn data/season-46-round-1.pgn --shard 1/4 > shard-1.json
+    ...
+    python analyze-pgn.py --pgn data/season-46-round-1.pgn --shard 4/4 > shard-4.json
+    python analyze-pgn.py merge shard-*.json > analysis.json
+
+analyze-tactics.py takes the same --shard option and merge subcommand.
+
+A game's shard comes from a CRC32 of its gameId (of its gameIndex for games
+without one), not from Python's hash(), so every machine computes the same
+partition of the same PGN. Games keep their gameIndex in the whole round.
+merge puts the games of all shards back in gameIndex order and rebuilds the
+summaries by folding them in that order, the way an unsharded run does, so
+awards and their ties come out the same.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from analysis.pgn_reader import PgnGame, pgn_game_id
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """A --shard of "i/N": shard i (1-based) of N. Returns (i, N)."""
+    index, separator, count = text.partition('/')
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        raise ValueError(f"invalid shard {text!r} (expected i/N, e.g. 1/4)")
+    if not separator or shard[1] < 1 or not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f"invalid shard {text!r} (expected i/N with 1 <= i <= N)")
+    return shard
+
+
+def shard_of(game_id: Optional[str], game_index: int, count: int) -> int:
+    """The shard (1-based) of count that a game belongs to."""
+    key = game_id if game_id else str(game_index)
+    return zlib.crc32(key.encode('utf-8')) % count + 1
+
+
+def shard_entries(entries: List[Dict[str, Any]], shard: Tuple[int, int]) -> List[Dict[str, Any]]:
+    """The PGN index entries (see analysis.pgn_index) in a shard."""
+    index, count = shard
+    return [entry for entry in entries if shard_of(entry['gameId'], entry['index'], count) == index]
+
+
+def iter_shard_games(games: Iterator[Tuple[int, PgnGame]], shard: Tuple[int, int]) -> Iterator[Tuple[int, PgnGame]]:
+    """The (gameIndex, game) pairs in a shard."""
+    index, count = shard
+    for game_index, game in games:
+        if shard_of(pgn_game_id(game.headers), game_index, count) == index:
+            yield game_index, game
+
+
+def load_shard_outputs(paths: Sequence[str]) -> List[Dict[str, Any]]:
+    """The JSON outputs of the shards of a round (--stream output can't be merged)."""
+    outputs = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            try:
+                output = json.load(f)
+            except json.JSONDecodeError:
+                raise ValueError(f"{path} is not a JSON analyzer output (shards run with --stream can't be merged)")
+        if not isinstance(output, dict) or 'games' not in output:
+            raise ValueError(f"{path} has no games, it is not a shard output")
+        outputs.append(output)
+    return outputs
+
+
+def merge_games(shard_games: Sequence[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """The per-game results of all shards in gameIndex order. A game in more than one shard is an error."""
+    games = {}
+    for results in shard_games:
+        for game in results:
+            if game['gameIndex'] in games:
+                raise ValueError(f"game {game['gameIndex'] + 1} is in more than one shard output")
+            games[game['gameIndex']] = game
+    return [games[game_index] for game_index in sorted(games)]
@@ -0,0 +1,434 @@
+"""
+Tactical Trackers
+=================
+
+Per-ply tactical statistics shared by analyze-tactics.py and the combined
+analyze-pgn.py --tactics pipeline: enemy territory invasion, the most
+attacked square and the longest tension (two pieces attacking each other).
+
+Every ply's attacks are computed once from python-chess bitboards into an
+AttackMap that all trackers read, instead of each tracker scanning the 64
+squares on its own.
+
+A TacticalTracker does not replay the game itself. It holds the board the
+caller is replaying and is told about each ply after the move is pushed,
+so one replay can feed the engine analysis and the tactics at once.
+TacticsSummary folds the per-game results into the round's chicken awards.
+"""
+
+import chess
+from typing import Dict, Any, List, Tuple
+
+# Squares that count as enemy territory for each side's pieces
+WHITE_ENEMY_TERRITORY = chess.BB_RANK_5 | chess.BB_RANK_6 | chess.BB_RANK_7 | chess.BB_RANK_8
+BLACK_ENEMY_TERRITORY = chess.BB_RANK_1 | chess.BB_RANK_2 | chess.BB_RANK_3 | chess.BB_RANK_4
+
+
+def add_to_counter(planes: List[int], mask: int, level: int = 0) -> None:
+    """
+    Add 1 << level to the bit-sliced counter of every square in mask.
+    planes[i] holds bit i of all 64 square counts, so one addition is a few
+    bitboard operations instead of a loop over the squares.
+    """
+    while mask:
+        if level == len(planes):
+            planes.append(mask)
+            return
+        planes[level], mask = planes[level] ^ mask, planes[level] & mask
+        level += 1
+
+
+def counter_value(planes: List[int], square: int) -> int:
+    """The count of one square in a bit-sliced counter."""
+    return sum(((plane >> square) & 1) << level for level, plane in enumerate(planes))
+
+
+def tension_key(square: int, other: int) -> int:
+    """Compact key of an unordered pair of squares, so (a, b) == (b, a)."""
+    if square > other:
+        square, other = other, square
+    return square << 6 | other
+
+
+def tension_squares(key: int) -> str:
+    """The 'a1-b2' name of a tension pair, square names sorted as strings."""
+    return '-'.join(sorted((chess.square_name(key >> 6), chess.square_name(key & 63))))
+
+
+class AttackMap:
+    """
+    Who attacks what in one position, built once per ply from the board's
+    bitboards and shared by the trackers: per-side attacker counts for all
+    squares (bit-sliced, see add_to_counter), per-side attacked-square masks
+    and the attacks of the piece on each square.
+    """
+
+    __slots__ = ('counts', 'attacked', 'square_attacks')
+
+    def __init__(self, board: chess.Board):
+        # Indexed by color (chess.BLACK, chess.WHITE)
+        self.counts: List[List[int]] = [[], []]
+        self.attacked = [0, 0]
+        # Attack mask of the piece on each square, 0 for empty squares
+        self.square_attacks: List[int] = [0] * 64
+
+        white = board.occupied_co[chess.WHITE]
+        for square in chess.scan_forward(board.occupied):
+            attacks = board.attacks_mask(square)
+            self.square_attacks[square] = attacks
+            color = bool(white & chess.BB_SQUARES[square])
+            self.attacked[color] |= attacks
+            add_to_counter(self.counts[color], attacks)
+
+    def attackers(self, color: chess.Color, square: int) -> int:
+        """Number of pieces of color attacking square."""
+        return counter_value(self.counts[color], square)
+
+    def most_attacked(self) -> Tuple[int, int]:
+        """(total attackers, square) of the most attacked square, the first one on ties."""
+        totals = list(self.counts[chess.WHITE])
+        for level, plane in enumerate(self.counts[chess.BLACK]):
+            add_to_counter(totals, plane, level)
+
+        # Narrow the candidates down from the highest bit of the totals
+        candidates = chess.BB_ALL
+        total = 0
+        for level in reversed(range(len(totals))):
+            if candidates & totals[level]:
+                candidates &= totals[level]
+                total += 1 << level
+        return total, chess.lsb(candidates)
+
+
+class TacticalTracker:
+    """Territory, most attacked square and tension tracking over a replayed board."""
+
+    def __init__(self, board: chess.Board):
+        self.board = board
+
+        # Track enemy territory invasion
+        # White's enemy territory: ranks 5-8 (indices 4-7)
+        # Black's enemy territory: ranks 1-4 (indices 0-3)
+        self.white_pieces_in_enemy = set()  # Track unique piece types
+        self.black_pieces_in_enemy = set()
+
+        # Track first invasion move number (ply)
+        self.white_first_invasion = None
+        self.black_first_invasion = None
+
+        # Track most attacked square
+        self.most_attacked_square = {
+            'square': None,
+            'attackers': 0,
+            'whiteAttackers': 0,
+            'blackAttackers': 0,
+            'moveNumber': 0,
+            'move': None
+        }
+
+        # Track tension (mutual attacks between pieces)
+        self.current_tensions = {}  # Map of tension pair keys to start move
+        self.tension_targets = {}  # Map of square to the pieces it is in tension with
+        self.tension_occupied = None  # (white, black, guarded pieces) at the last ply, to find the squares a move changed
+        self.longest_tension = {
+            'moves': 0,
+            'squares': None,
+            'startMove': 0,
+            'endMove': 0
+        }
+
+    def ply(self, move_num: int, move_san: str) -> None:
+        """Record the position after ply move_num (the move is already pushed)."""
+        attack_map = AttackMap(self.board)
+        self._track_enemy_territory(move_num)
+        self._detect_most_attacked_square(move_num, move_san, attack_map)
+        self._track_tension(move_num, attack_map)
+
+    def _track_enemy_territory(self, move_num: int) -> None:
+        """
+        Track pieces that enter enemy territory.
+        White's enemy territory: ranks 5-8 (indices 4-7)
+        Black's enemy territory: ranks 1-4 (indices 0-3)
+        """
+        board = self.board
+        white_invaders = board.occupied_co[chess.WHITE] & WHITE_ENEMY_TERRITORY
+        black_invaders = board.occupied_co[chess.BLACK] & BLACK_ENEMY_TERRITORY
+
+        if white_invaders:
+            for piece_type in chess.PIECE_TYPES:
+                if piece_type not in self.white_pieces_in_enemy and board.pieces_mask(piece_type, chess.WHITE) & white_invaders:
+                    self.white_pieces_in_enemy.add(piece_type)
+                    # Record first invasion if not yet recorded
+                    if self.white_first_invasion is None:
+                        self.white_first_invasion = move_num + 1
+
+        if black_invaders:
+            for piece_type in chess.PIECE_TYPES:
+                if piece_type not in self.black_pieces_in_enemy and board.pieces_mask(piece_type, chess.BLACK) & black_invaders:
+                    self.black_pieces_in_enemy.add(piece_type)
+                    # Record first invasion if not yet recorded
+                    if self.black_first_invasion is None:
+                        self.black_first_invasion = move_num + 1
+
+    def _detect_most_attacked_square(self, move_num: int, move_san: str, attack_map: 'AttackMap') -> None:
+        """
+        Find the most attacked square in the current position.
+        Count attacks from both sides on each square.
+        """
+        total_attackers, square = attack_map.most_attacked()
+
+        # Update if this is the most attacked square we've seen
+        if total_attackers > self.most_attacked_square['attackers']:
+            self.most_attacked_square = {
+                'square': chess.square_name(square),
+                'attackers': total_attackers,
+                'whiteAttackers': attack_map.attackers(chess.WHITE, square),
+                'blackAttackers': attack_map.attackers(chess.BLACK, square),
+                'moveNumber': move_num + 1,
+                'move': move_san
+            }
+
+    def _track_tension(self, move_num: int, attack_map: 'AttackMap') -> None:
+        """
+        Track tension: when two pieces mutually attack each other.
+        Tension persists as long as both pieces can capture each other.
+
+        Each piece's tension targets (the enemy pieces it attacks while it is
+        attacked back) are kept as a bitboard per square and updated from the
+        move alone. A piece's targets can only change when it stands on a
+        square the move changed (the moved, captured or castling pieces), when
+        it attacks such a square (sliders whose rays run through the from/to
+        squares included), or when the other side started or stopped
+        attacking it. Only those squares are recomputed and compared.
+        """
+        board = self.board
+        occupied_co = board.occupied_co
+        white = occupied_co[chess.WHITE]
+        black = occupied_co[chess.BLACK]
+        attacked = attack_map.attacked
+        # Only pieces the other side attacks back can be in tension
+        guarded = (white & attacked[chess.BLACK]) | (black & attacked[chess.WHITE])
+        square_attacks = attack_map.square_attacks
+
+        if self.tension_occupied is None or not board.move_stack:
+            # First ply: every piece
+            affected = board.occupied
+        else:
+            # Squares the move changed: the from/to squares (also covering a
+            # castling king and rook that swap squares) and every square that
+            # changed sides or emptied (captures, en passant, castling rooks)
+            move = board.peek()
+            previous_white, previous_black, previous_guarded = self.tension_occupied
+            changed = (previous_white ^ white) | (previous_black ^ black) | chess.BB_SQUARES[move.from_square] | chess.BB_SQUARES[move.to_square]
+            # Pieces that became (un)guarded: an unguarded one with targets at
+            # the last ply is among them, so only guarded pieces remain to check
+            affected = changed | (previous_guarded ^ guarded)
+            for square in chess.scan_forward(guarded & ~affected):
+                # Guarded pieces attacking a changed square, sliders whose rays
+                # now stop at or run through the from/to squares included
+                if square_attacks[square] & changed:
+                    affected |= chess.BB_SQUARES[square]
+        self.tension_occupied = (white, black, guarded)
+
+        # New targets of the affected squares, keeping the previous ones to compare
+        targets = self.tension_targets
+        previous = []
+        for square in chess.scan_forward(affected):
+            previous.append((square, targets.pop(square, 0)))
+            mask = chess.BB_SQUARES[square]
+            if guarded & mask:
+                square_targets = square_attacks[square] & (black if white & mask else white)
+                if square_targets:
+                    targets[square] = square_targets
+
+        ended = []
+        for square, before in previous:
+            after = targets.get(square, 0)
+            if before == after:
+                continue
+
+            for target_square in chess.scan_forward(after & ~before):
+                pair = tension_key(square, target_square)
+                if pair not in self.current_tensions:
+                    # New tension starts
+                    self.current_tensions[pair] = move_num + 1
+
+            for target_square in chess.scan_forward(before & ~after):
+                # The pair holds as long as either piece still attacks the other
+                if targets.get(target_square, 0) & chess.BB_SQUARES[square]:
+                    continue
+                pair = tension_key(square, target_square)
+                if pair in self.current_tensions:
+                    ended.append((pair, self.current_tensions.pop(pair)))
+
+        # Check if any tensions ended and update longest, in square order on ties
+        for pair, start_move in sorted(ended):
+            duration = move_num + 1 - start_move
+            if duration > self.longest_tension['moves']:
+                self.longest_tension = {
+                    'moves': duration,
+                    'squares': tension_squares(pair),
+                    'startMove': start_move,
+                    'endMove': move_num + 1
+                }
+
+    def result(self) -> Dict[str, Any]:
+        """The per-game tactics as a JSON-serializable dict."""
+        return {
+            'enemyTerritory': {
+                'whitePiecesInEnemy': len(self.white_pieces_in_enemy),
+                'blackPiecesInEnemy': len(self.black_pieces_in_enemy),
+                'whiteFirstInvasion': self.white_first_invasion,
+                'blackFirstInvasion': self.black_first_invasion
+            },
+            'mostAttackedSquare': self.most_attacked_square if self.most_attacked_square['square'] else None,
+            'longestTension': self.longest_tension if self.longest_tension['moves'] > 0 else None
+        }
+
+
+class TacticsSummary:
+    """Builds the summary statistics and chicken awards one game at a time."""
+
+    def __init__(self):
+        self.total_games = 0
+
+        # Fallback homebody: game with the most pieces in enemy territory
+        self.most_invaded_game = None
+        # Most attacked square across all games
+        self.most_attacked_game = None
+
+        # The player (white or black) who waited longest to invade
+        self.latest_invasion = 0
+        self.latest_game = None
+        self.latest_player = None
+
+        # The player with FEWEST pieces in enemy territory (homebody)
+        self.min_invasion = float('inf')
+        self.homebody_game = None
+        self.homebody_player = None
+
+        # The player who invaded EARLIEST (quick draw)
+        self.earliest_invasion = float('inf')
+        self.earliest_game = None
+        self.earliest_player = None
+
+        # The game with longest tension
+        self.longest_tension_duration = 0
+        self.longest_tension_game = None
+
+    def add(self, game: Dict[str, Any]) -> None:
+        """Fold one analyzed game into the summary."""
+        self.total_games += 1
+
+        white_pieces = game['enemyTerritory']['whitePiecesInEnemy']
+        black_pieces = game['enemyTerritory']['blackPiecesInEnemy']
+        white_invasion = game['enemyTerritory']['whiteFirstInvasion']
+        black_invasion = game['enemyTerritory']['blackFirstInvasion']
+
+        if self.most_invaded_game is None or white_pieces + black_pieces > (
+            self.most_invaded_game['enemyTerritory']['whitePiecesInEnemy'] +
+            self.most_invaded_game['enemyTerritory']['blackPiecesInEnemy']
+        ):
+            self.most_invaded_game = game
+
+        attackers = game['mostAttackedSquare']['attackers'] if game['mostAttackedSquare'] else 0
+        if self.most_attacked_game is None or attackers > (
+            self.most_attacked_game['mostAttackedSquare']['attackers'] if self.most_attacked_game['mostAttackedSquare'] else 0
+        ):
+            self.most_attacked_game = game
+
+        # Late Bloomer - waited longest to invade
+        if white_invasion and white_invasion > self.latest_invasion:
+            self.latest_invasion = white_invasion
+            self.latest_game = game
+            self.latest_player = 'white'
+
+        if black_invasion and black_invasion > self.latest_invasion:
+            self.latest_invasion = black_invasion
+            self.latest_game = game
+            self.latest_player = 'black'
+
+        # Homebody - skip games where neither player invaded (empty games)
+        if white_pieces != 0 or black_pieces != 0:
+            if white_pieces < self.min_invasion:
+                self.min_invasion = white_pieces
+                self.homebody_game = game
+                self.homebody_player = 'white'
+
+            if black_pieces < self.min_invasion:
+                self.min_invasion = black_pieces
+                self.homebody_game = game
+                self.homebody_player = 'black'
+
+        # Quick Draw - invaded earliest
+        if white_invasion and white_invasion < self.earliest_invasion:
+            self.earliest_invasion = white_invasion
+            self.earliest_game = game
+            self.earliest_player = 'white'
+
+        if black_invasion and black_invasion < self.earliest_invasion:
+            self.earliest_invasion = black_invasion
+            self.earliest_game = game
+            self.earliest_player = 'black'
+
+        # Longest tension
+        if game.get('longestTension') and game['longestTension']['moves'] > self.longest_tension_duration:
+            self.longest_tension_duration = game['longestTension']['moves']
+            self.longest_tension_game = game
+
+    def result(self) -> Dict[str, Any]:
+        """Return the summary statistics and chicken awards."""
+        summary = {
+            'totalGames': self.total_games,
+
+            # Chicken Award 1: Homebody - Least pieces in enemy territory
+            'homebody': self.most_invaded_game,
+
+            # Chicken Award 2: Late Bloomer - Waited longest to invade
+            'lateBlocker': None,
+
+            # Award: Most attacked square across all games
+            'mostAttackedSquareGame': self.most_attacked_game,
+        }
+
+        if self.latest_game:
+            summary['lateBloomer'] = {
+                'white': self.latest_game['white'],
+                'black': self.latest_game['black'],
+                'player': self.latest_player,
+                'moveNumber': self.latest_invasion,
+                'gameIndex': self.latest_game['gameIndex']
+            }
+
+        if self.homebody_game:
+            summary['homebody'] = {
+                'white': self.homebody_game['white'],
+                'black': self.homebody_game['black'],
+                'player': self.homebody_player,
+                'piecesInEnemy': self.min_invasion,
+                'gameIndex': self.homebody_game['gameIndex']
+            }
+
+        if self.earliest_game:
+            summary['quickDraw'] = {
+                'white': self.earliest_game['white'],
+                'black': self.earliest_game['black'],
+                'player': self.earliest_player,
+                'moveNumber': self.earliest_invasion,
+                'gameIndex': self.earliest_game['gameIndex']
+            }
+
+        if self.longest_tension_game:
+            tension_data = self.longest_tension_game['longestTension']
+            summary['longestTension'] = {
+                'white': self.longest_tension_game['white'],
+                'black': self.longest_tension_game['black'],
+                'moves': tension_data['moves'],
+                'squares': tension_data['squares'],
+                'startMove': tension_data['startMove'],
+                'endMove': tension_data['endMove'],
+                'gameIndex': self.longest_tension_game['gameIndex']
+            }
+
+        return summary
+
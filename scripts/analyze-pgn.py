@@ -7,11 +7,46 @@ Analyzes chess games from PGN data using Stockfish engine.
 Calculates accuracy, ACPL, blunders, mistakes, and inaccuracies.
 
 Requirements:
-    pip install python-chess stockfish
+    pip install python-chess
+    pip install numpy (optional, batch per-game metrics)
+    Stockfish binary (brew install stockfish / apt-get install stockfish)
 
 Usage:
     python analyze-pgn.py < games.pgn > analysis.json
     python analyze-pgn.py --depth 15 --sample 1 < games.pgn > analysis.json
+    python analyze-pgn.py --workers 4 < games.pgn > analysis.json
+    python analyze-pgn.py --stream < games.pgn > analysis.jsonl
+
+Evaluations are cached in data/eval-cache.sqlite (keyed by position, engine
+version and depth), so re-running a round only searches new positions.
+Use --no-cache to disable.
+
+With --adaptive, every position is first searched at --shallow-depth and
+only plies that look like an inaccuracy or worse, swing the eval or involve
+a mate are re-searched at full depth.
+
+With --book, leading moves that stay inside the opening database
+(scripts/utils/openings-*.tsv) are credited as excellent without engine
+analysis; the engine starts at the first out-of-book position. The book
+positions are cached in data/opening-book.epd.
+
+Checkmate, stalemate and insufficient material positions are scored
+exactly without a search. With --syzygy DIR, positions covered by the local
+Syzygy tablebases are probed instead of searched as well.
+
+With --journal PATH every finished game is appended to a JSONL checkpoint.
+An interrupted or repeated run skips games already in the journal and
+rebuilds the summary from it:
+    python analyze-pgn.py --journal data/season-46-round-1.analysis.jsonl < games.pgn
+
+With --evals PATH the evals behind each analyzed game are also appended to
+a compact binary store (see analysis.eval_store), before the game goes into
+the journal. A journaled game whose evals are not in the store is analyzed
+again. --rescore PATH recomputes every game's metrics and the summary of the
+last finished run from that store in seconds, without the PGN or Stockfish,
+e.g. after a change to the move classification:
+    python analyze-pgn.py --evals data/season-46-round-1.evals.bin < games.pgn > analysis.json
+    python analyze-pgn.py --rescore data/season-46-round-1.evals.bin > analysis.json
 
 Output JSON format:
     {
@@ -31,116 +66,262 @@ Output JSON format:
         ],
         "summary": {
             "accuracyKing": {...},
-            "biggestBlunder": {...}
+            "biggestBlunder": {...},
+            "leaderboards": {
+                "accuracyKing": [{...}, {...}, ...],
+                ...
+            }
         }
     }
+
+Each summary award holds the winner; "leaderboards" holds the top N entries
+(--leaderboard N, default 5) of every award, best first.
+
+With --profile, the output gains a "meta": {"performance": {...}} block with
+wall/CPU time per stage (pgnParse, replay, engine, metrics, summary),
+engine search counts, average search time per ply and cache hit rates.
+--profile-dump PATH also writes a cProfile dump of the main process.
+
+With --progress json, the progress bar is replaced by JSON-lines events on
+stderr (or --progress-fd N): one per finished game with plies processed,
+plies/sec and an ETA from the measured throughput (see analysis.progress).
+
+With --autotune, the input PGN is only used to benchmark (workers, Threads,
+Hash) splits of the machine's cores at the target --depth. The fastest is
+printed and saved to data/engine-tuning.json; later runs on the same
+machine with the same engine and depth use it for every option not given
+on the command line:
+    python analyze-pgn.py --autotune --depth 15 < games.pgn
+
+With --tactics, the tactical analysis of analyze-tactics.py (enemy
+territory, most attacked square, tension) follows the same single replay
+of each game and the output gains a "tactics": {"games": [...], "summary":
+{...}} section in analyze-tactics.py's format, so one run covers both. In
+--stream mode its per-game results are separate {"tactics": {...}} lines.
+Other per-ply analyzers plug in the same way (see analysis.ply_analyzers).
+
+With --stream, games are read incrementally and each game is written as one
+JSON line as soon as it is done, followed by a {"summary": {...}} line.
+
+With --pgn PATH, games are read from the file instead of stdin, and
+--games ID,ID, --players NAME,NAME and --range N-M (1-based game numbers)
+pick games out of it through a byte-offset index (see analysis.pgn_index).
+Games keep their position in the file as gameIndex:
+    python analyze-pgn.py --pgn data/season-46-round-1.pgn --games abc123
+
+With --batch PGN [PGN ...], several rounds (or a whole season) are analyzed
+in one run: the games of all rounds go to the workers longest first, so a
+round full of long games no longer sets the finish time, and positions
+repeated across rounds are searched once through the shared eval cache.
+Each round's output is written in the format above to <round>.analysis.json
+next to its PGN (or in --output-dir); stdout gets a {"rounds": [...]} index:
+    python analyze-pgn.py --batch data/season-46-round-*.pgn --book --tactics
+
+With --shard i/N, only the games of shard i of N are analyzed (picked by a
+stable hash of the gameId), so one round can be spread over N machines.
+The merge subcommand combines the shard outputs into the output of the
+whole round, summary included (see analysis.shards):
+    python analyze-pgn.py --pgn data/season-46-round-1.pgn --shard 1/4 > shard-1.json
+    python analyze-pgn.py merge shard-*.json > analysis.json
 """
 
 import sys
 import json
 import argparse
+import collections
+import io
 import os
 import shutil
+import multiprocessing
+import cProfile
 import chess
-import chess.pgn
-from stockfish import Stockfish
+from analysis.engine import UciEngine, DEFAULT_THREADS, DEFAULT_HASH_MB
+from analysis.journal import GameJournal, game_key
+from analysis.eval_store import EvalStore, pack_evals, read_eval_records
+from analysis.eval_cache import EvalCache, DEFAULT_CACHE_PATH, DEFAULT_MAX_ENTRIES
+from analysis.pgn_reader import iter_games, pgn_game_id
+from analysis.pgn_index import select_input_games, iter_indexed_games
+from analysis.shards import parse_shard, shard_entries, iter_shard_games, load_shard_outputs, merge_games
+from analysis.opening_book import load_opening_book, count_book_plies
+from analysis.endgame import exact_eval, open_tablebase
+from analysis.scoring import (
+    cp_to_win_percentage,
+    classify_move_by_win_percentage,
+    calculate_accuracy_from_win_percentage,
+    calculate_blunder_severity,
+    eval_to_cp
+)
+from analysis import metrics as batch_metrics
+from analysis.awards import RoundAwards, DEFAULT_LEADERBOARD_SIZE
+from analysis.profiling import StageProfiler, timed
+from analysis.progress import ProgressReporter
+from analysis.ply_analyzers import PLY_ANALYZERS, start_trackers, empty_result
+from analysis.autotune import (
+    autotune,
+    candidate_configs,
+    load_profile,
+    sample_segments,
+    save_profile,
+    DEFAULT_SAMPLE_POSITIONS,
+    SEGMENTS_PER_WORKER,
+    DEFAULT_TUNING_PATH
+)
+
+# Adaptive mode: eval swing (cp) between two positions that triggers a deep re-search
+ADAPTIVE_SWING_CP = 150
+
+def positions_to_evaluate(move_count, sample_rate=1, book_plies=0):
+    """
+    Return the sorted position indices that need an engine evaluation.
 
-def cp_to_win_percentage(cp):
+    Position i is the board before move i (position move_count is the final
+    position). A sampled move needs the positions on both sides of it, so the
+    "after" position of ply N is shared with the "before" position of ply N+1
+    and only gets searched once. The first book_plies moves are book moves
+    and need no evaluation.
     """
-    Convert centipawn evaluation to win percentage.
-    Based on Lichess formula: https://lichess.org/page/accuracy
+    needed = set()
+    for move_num in range(book_plies, move_count):
+        # Sample every Nth move FOR EACH PLAYER to save time
+        # White moves: 0, 2, 4, 6... -> sample 0, 4, 8...
+        # Black moves: 1, 3, 5, 7... -> sample 1, 5, 9...
+        if (move_num // 2) % sample_rate == 0:
+            needed.add(move_num)
+            needed.add(move_num + 1)
+    return sorted(needed)
+
+def evaluate_positions(engine, fens, indices, cache=None, depth=None, chess960=False):
     """
-    return 50 + 50 * (2 / (1 + pow(10, -abs(cp) / 400)) - 1) * (-1 if cp < 0 else 1)
+    Evaluate the given positions once each, consulting the eval cache first.
+    chess960 marks the positions of a Chess960 game.
 
-def classify_move_by_win_percentage(win_before, win_after, is_white):
+    Returns a list aligned with fens holding the Stockfish evaluation dict
+    for every requested index and None everywhere else. Evals that came
+    from a search also carry its depth/nodes/nps/time statistics.
+    """
+    depth = depth or engine.depth
+    evals = [None] * len(fens)
+    for index in indices:
+        evaluation = cache.get(fens[index], depth, chess960) if cache else None
+        if evaluation is None:
+            evaluation = engine.evaluate(fens[index], depth, chess960)
+            if cache:
+                cache.put(fens[index], depth, evaluation, chess960)
+        evals[index] = evaluation
+
+    if cache:
+        cache.commit()
+    return evals
+
+def critical_positions(evals, move_count, sample_rate=1, book_plies=0):
     """
-    Classify move quality based on win percentage change.
-    Based on Lichess algorithm: https://github.com/lichess-org/lila/blob/master/modules/analyse/src/main/AccuracyPercent.scala
+    Pick the positions that deserve a full-depth search after a shallow pass.
 
-    Returns: (quality, win_loss) where quality is 'excellent', 'good', 'inaccuracies', 'mistakes', or 'blunders'
+    Both sides of a sampled move are re-searched when the shallow evals say
+    the move is an inaccuracy or worse, swing the eval by ADAPTIVE_SWING_CP
+    or more (comebacks, lucky escapes), or involve a mate score.
     """
-    # Calculate win percentage loss (from player's perspective)
-    if is_white:
-        win_loss = win_before - win_after
-    else:
-        # For black, we need to flip the percentages
-        win_loss = (100 - win_before) - (100 - win_after)
-
-    # Normalize to 0-100 range
-    win_loss = max(0, win_loss)
-
-    # Lichess classification thresholds (based on win% loss)
-    if win_loss < 2:
-        return 'excellent', win_loss
-    elif win_loss < 5:
-        return 'good', win_loss
-    elif win_loss < 10:
-        return 'inaccuracies', win_loss
-    elif win_loss < 20:
-        return 'mistakes', win_loss
-    else:
-        # Only count as blunder if the position actually swings significantly
-        # Don't count blunders when already completely winning/losing
-        if win_before > 10 and win_before < 90:  # Position wasn't already decided
-            return 'blunders', win_loss
-        else:
-            return 'mistakes', win_loss
+    critical = set()
+    for move_num in range(book_plies, move_count):
+        if (move_num // 2) % sample_rate != 0:
+            continue
+
+        eval_before = evals[move_num]
+        eval_after = evals[move_num + 1]
+        cp_before = eval_to_cp(eval_before)
+        cp_after = eval_to_cp(eval_after)
+
+        quality, _ = classify_move_by_win_percentage(
+            cp_to_win_percentage(cp_before),
+            cp_to_win_percentage(cp_after),
+            move_num % 2 == 0
+        )
+
+        if (quality not in ('excellent', 'good')
+                or abs(cp_after - cp_before) >= ADAPTIVE_SWING_CP
+                or eval_before['type'] == 'mate'
+                or eval_after['type'] == 'mate'):
+            critical.add(move_num)
+            critical.add(move_num + 1)
+
+    return sorted(critical)
+
+def analyze_game(game, engine, depth=15, sample_rate=1, cache=None, shallow_depth=None, book=None, tablebase=None, profiler=None):
+    """Analyze a single game with Stockfish using Lichess-style win percentage."""
+    moves = list(game.mainline_moves())
+    book_plies = count_book_plies(game.board(), moves, book) if book else 0
+    analysis, _, _ = analyze_moves(game.board(), moves, engine, sample_rate, cache, shallow_depth, book_plies, tablebase, profiler)
+    return analysis
 
-def calculate_accuracy_from_win_percentage(win_losses):
+def analyze_moves(board, moves, engine, sample_rate=1, cache=None, shallow_depth=None, book_plies=0, tablebase=None, profiler=None, ply_analyzers=()):
     """
-    Calculate accuracy percentage from list of win percentage losses.
-    Based on Lichess formula.
+    Analyze a list of moves played from board (see analyze_game).
+    Returns the game metrics plus the per-position evals and SAN moves they
+    came from.
+    The other analyzers named in ply_analyzers (see analysis.ply_analyzers)
+    follow the same replay, their results go under their key.
+
+    With shallow_depth set, every position is first searched at that depth
+    and only the critical ones (see critical_positions) are searched again at
+    the full engine depth. The first book_plies moves are opening book moves:
+    they are credited as excellent and never reach the engine. Terminal
+    positions, and tablebase positions when a Syzygy tablebase is given, get
+    exact evals instead of a search (see analysis.endgame). With a profiler,
+    replay, engine and metrics time is recorded per stage.
     """
-    if not win_losses:
-        return 100
 
-    # Lichess formula: 103.1668 * e^(-0.04354 * average_win_loss) - 3.1669
-    import math
-    avg_loss = sum(win_losses) / len(win_losses)
-    accuracy = 103.1668 * math.exp(-0.04354 * avg_loss) - 3.1669
+    # One engine session per game: the hash stays warm between consecutive plies
+    engine.new_game()
+
+    # Replay the game once, remembering SAN, the position sequence and exact evals
+    chess960 = board.chess960
+    with timed(profiler, 'replay'):
+        trackers = start_trackers(ply_analyzers, board)
+        move_sans = []
+        fens = [board.fen()]
+        exact_evals = [None] * book_plies
+        for index, move in enumerate(moves):
+            if index >= book_plies:
+                exact_evals.append(exact_eval(board, tablebase))
+            move_sans.append(board.san(move))
+            board.push(move)
+            fens.append(board.fen())
+            for tracker in trackers.values():
+                tracker.ply(index, move_sans[-1])
+        exact_evals.append(exact_eval(board, tablebase))
+
+    indices = [i for i in positions_to_evaluate(len(moves), sample_rate, book_plies) if exact_evals[i] is None]
+
+    with timed(profiler, 'engine'):
+        if shallow_depth:
+            # Fast pass everywhere, then deepen where it matters
+            evals = evaluate_positions(engine, fens, indices, cache, shallow_depth, chess960)
+            evals = [exact or searched for exact, searched in zip(exact_evals, evals)]
+            critical = [i for i in critical_positions(evals, len(moves), sample_rate, book_plies) if exact_evals[i] is None]
+            deep_evals = evaluate_positions(engine, fens, critical, cache, chess960=chess960)
+            evals = [deep or shallow for deep, shallow in zip(deep_evals, evals)]
+        else:
+            evals = evaluate_positions(engine, fens, indices, cache, chess960=chess960)
+            evals = [exact or searched for exact, searched in zip(exact_evals, evals)]
 
-    return max(0, min(100, accuracy))
+    # Batch (NumPy) metrics when available, the per-ply loop otherwise
+    with timed(profiler, 'metrics'):
+        metrics = batch_metrics.game_metrics if batch_metrics.available() else compute_game_metrics
+        analysis = metrics(move_sans, evals, sample_rate, book_plies)
 
-def calculate_blunder_severity(eval_before, eval_after, eval_before_type, eval_after_type, win_loss):
-    """
-    Calculate blunder severity considering position context and mate threats.
+    for key, tracker in trackers.items():
+        analysis[key] = tracker.result()
+    return analysis, evals, move_sans
 
-    A blunder from a winning position to mate is much worse than a small cp loss in a losing position.
-    Returns a severity score for comparison (higher = worse blunder).
+def compute_game_metrics(move_sans, evals, sample_rate=1, book_plies=0):
     """
-    import math
-
-    # Base severity from win percentage loss
-    severity = win_loss
-
-    # Check if blunder leads to mate (extremely severe)
-    if eval_after_type == 'mate':
-        mate_in = abs(eval_after)
-        # Mate threats are catastrophic - add huge penalty, scaled by how soon mate arrives
-        # Mate in 1-3 moves is devastating, longer mates less so
-        mate_penalty = 100 / (mate_in + 1)  # M1 = 50, M2 = 33, M3 = 25, etc.
-        severity += mate_penalty
-
-    # Check if position was winning before blunder (amplify severity)
-    if eval_before_type == 'cp':
-        # If player was winning by 200+ cp (or equivalent for black)
-        winning_margin = abs(eval_before)
-        if winning_margin > 200:
-            # Blundering from a winning position is worse - multiply by how much you were winning
-            # Cap the multiplier at 3x for positions > 600 cp advantage
-            position_multiplier = 1 + min(2, (winning_margin - 200) / 400)
-            severity *= position_multiplier
-    elif eval_before_type == 'mate' and eval_before > 0:
-        # Was delivering mate but blundered it away - extremely severe
-        severity *= 3
-
-    return severity
-
-def analyze_game(game, stockfish, depth=15, sample_rate=1):
-    """Analyze a single game with Stockfish using Lichess-style win percentage."""
+    Derive move quality, accuracy, ACPL, blunders, comebacks and lucky escapes
+    from the per-position evaluation sequence of a game.
 
-    board = game.board()
-    moves = list(game.mainline_moves())
+    evals[i] is the evaluation of the position before move i, evals[-1] the
+    final position. Positions skipped by sampling or inside the opening book
+    (the first book_plies moves) may be None.
+    """
 
     white_win_losses = []  # Track win% losses for accuracy calculation
     black_win_losses = []
@@ -163,49 +344,34 @@ def analyze_game(game, stockfish, depth=15, sample_rate=1):
     # Track previous move eval to detect missed punishments
     prev_eval = None
 
-    for move_num, move in enumerate(moves):
+    for move_num, move_san in enumerate(move_sans):
         is_white_move = move_num % 2 == 0
 
-        # Sample every Nth move FOR EACH PLAYER to save time
-        # White moves: 0, 2, 4, 6... -> sample 0, 4, 8...
-        # Black moves: 1, 3, 5, 7... -> sample 1, 5, 9...
+        # Only sampled moves were evaluated (see positions_to_evaluate)
         move_index_for_player = move_num // 2
         if move_index_for_player % sample_rate != 0:
-            board.push(move)
             continue
 
-        # Get SAN notation before making the move
-        move_san = board.san(move)
+        # Book moves are known theory: excellent, no loss, nothing to track
+        if move_num < book_plies:
+            quality = white_quality if is_white_move else black_quality
+            quality['excellent'] += 1
+            if is_white_move:
+                white_win_losses.append(0)
+                white_cp_losses.append(0)
+                white_engine_moves += 1
+            else:
+                black_win_losses.append(0)
+                black_cp_losses.append(0)
+                black_engine_moves += 1
+            continue
 
-        # Get evaluation before move
-        stockfish.set_fen_position(board.fen())
-        eval_before = stockfish.get_evaluation()
+        eval_before = evals[move_num]
+        eval_after = evals[move_num + 1]
 
         # Convert to centipawns from white's perspective
-        # Use more granular mate scoring: mate-in-N = 10000 - (N * 10)
-        if eval_before['type'] == 'cp':
-            cp_before = eval_before['value']
-        elif eval_before['type'] == 'mate':
-            mate_in = eval_before['value']
-            cp_before = (10000 - abs(mate_in) * 10) * (1 if mate_in > 0 else -1)
-        else:
-            cp_before = 0
-
-        # Make the move
-        board.push(move)
-
-        # Get evaluation after move
-        stockfish.set_fen_position(board.fen())
-        eval_after = stockfish.get_evaluation()
-
-        # Convert to centipawns
-        if eval_after['type'] == 'cp':
-            cp_after = eval_after['value']
-        elif eval_after['type'] == 'mate':
-            mate_in = eval_after['value']
-            cp_after = (10000 - abs(mate_in) * 10) * (1 if mate_in > 0 else -1)
-        else:
-            cp_after = 0
+        cp_before = eval_to_cp(eval_before)
+        cp_after = eval_to_cp(eval_after)
 
         # Convert centipawns to win percentages
         win_before = cp_to_win_percentage(cp_before)
@@ -409,6 +575,355 @@ def analyze_game(game, stockfish, depth=15, sample_rate=1):
         'luckyEscape': lucky_escape
     }
 
+def parse_game(game, game_index, depth, sample_rate, shallow_depth=None, book=None, syzygy=False, ply_analyzers=()):
+    """Extract the headers and the compact analysis task for one PGN game."""
+    white = game.headers.get('White', 'Unknown')
+    black = game.headers.get('Black', 'Unknown')
+
+    # Extract gameId from headers (GameId or Site URL)
+    game_id = pgn_game_id(game.headers)
+
+    board = game.board()
+    mainline = list(game.mainline_moves())
+    moves = [move.uci() for move in mainline]
+    book_plies = count_book_plies(board, mainline, book) if book else 0
+
+    return {
+        'gameIndex': game_index,
+        'gameId': game_id,
+        'white': white,
+        'black': black,
+        'task': (board.fen(), board.chess960, moves, sample_rate, shallow_depth, book_plies, ply_analyzers),
+        'journalKey': game_key(game_id, moves, depth, sample_rate, shallow_depth, book_plies, syzygy, ply_analyzers)
+    }
+
+# Engine and eval cache owned by each worker process (see init_worker)
+_worker_engine = None
+_worker_cache = None
+_worker_tablebase = None
+_worker_error = None
+
+def open_engine(engine_config):
+    """Start a UCI engine session from an engine config dict."""
+    return UciEngine(engine_config['path'], engine_config['depth'], engine_config['threads'], engine_config['hash'])
+
+def open_eval_cache(cache_config):
+    """Open the eval cache described by a (path, engine_id, max_entries) tuple, if any."""
+    if cache_config is None:
+        return None
+    path, engine_id, max_entries = cache_config
+    return EvalCache(path, engine_id, max_entries)
+
+def init_worker(engine_config):
+    """Start one engine (and cache connection, tablebase) per worker process."""
+    global _worker_engine, _worker_cache, _worker_tablebase, _worker_error
+    try:
+        _worker_engine = open_engine(engine_config)
+        _worker_cache = open_eval_cache(engine_config['cache'])
+        if engine_config['syzygy']:
+            _worker_tablebase = open_tablebase(engine_config['syzygy'])
+    except Exception as e:
+        # Raising here would make the pool respawn the worker forever, report it per task instead
+        _worker_error = e
+
+def analyze_game_task(task, profile=False, keep_evals=False):
+    """
+    Analyze one game inside a worker process.
+
+    Tasks are compact (fen, chess960, uci_moves, sample_rate, shallow_depth,
+    book_plies, ply_analyzers) tuples so we don't pickle whole chess.pgn.Game
+    trees between processes. Returns the
+    analysis plus this game's run stats (cache hits/misses, engine searches,
+    and per-stage timings when profile is set). With keep_evals, the run
+    stats also carry the game's evals packed for the eval store.
+    """
+    if _worker_error is not None:
+        raise RuntimeError(f"Error initializing Stockfish: {_worker_error}")
+
+    fen, chess960, uci_moves, sample_rate, shallow_depth, book_plies, ply_analyzers = task
+    board = chess.Board(fen, chess960=chess960)
+    moves = [chess.Move.from_uci(uci) for uci in uci_moves]
+
+    hits = _worker_cache.hits if _worker_cache else 0
+    misses = _worker_cache.misses if _worker_cache else 0
+    engine_before = _worker_engine.stats()
+
+    profiler = StageProfiler() if profile else None
+
+    white_to_move = board.turn == chess.WHITE
+    analysis, evals, move_sans = analyze_moves(board, moves, _worker_engine, sample_rate, _worker_cache, shallow_depth, book_plies, _worker_tablebase, profiler, ply_analyzers)
+
+    engine_after = _worker_engine.stats()
+    run_stats = {
+        'cacheHits': (_worker_cache.hits - hits) if _worker_cache else 0,
+        'cacheMisses': (_worker_cache.misses - misses) if _worker_cache else 0,
+        **{key: engine_after[key] - engine_before[key] for key in engine_after}
+    }
+    if profiler is not None:
+        run_stats['stages'] = profiler.snapshot()
+    if keep_evals:
+        run_stats['evals'] = pack_evals(evals, move_sans, white_to_move)
+    return analysis, run_stats
+
+class AnalysisSession:
+    """
+    The engine, eval cache, tablebase and worker pool behind a run.
+
+    main() opens a session for one invocation and closes it at the end.
+    analysis-daemon.py keeps one open between runs instead: as long as the
+    engine settings don't change, the next run reuses the running engine
+    processes (no startup, NNUE load or Syzygy scan) and the open cache.
+    """
+
+    def __init__(self):
+        self.settings = None
+        self.engine = None
+        self.engine_name = None
+        self.cache = None
+        self.tablebase = None
+        self.pool = None
+        self.book = None
+
+    def reuse(self, settings):
+        """True if the session is open with these settings, otherwise close it for a restart."""
+        if self.settings == settings:
+            return True
+        self.close()
+        return False
+
+    def start_pool(self, engine_config, workers):
+        """Replace the in-process engine with a pool of `workers` engine processes."""
+        self.engine.close()
+        self.engine = None
+        self.pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(engine_config,))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+        if self.engine is not None:
+            self.engine.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.tablebase is not None:
+            self.tablebase.close()
+        self.__init__()
+
+def eval_metadata(parsed, depth):
+    """The eval store metadata of a parsed game (see analysis.eval_store)."""
+    _, _, _, sample_rate, shallow_depth, book_plies, _ = parsed['task']
+    return {
+        'key': parsed['journalKey'],
+        'gameIndex': parsed['gameIndex'],
+        'gameId': parsed['gameId'],
+        'white': parsed['white'],
+        'black': parsed['black'],
+        'sampleRate': sample_rate,
+        'bookPlies': book_plies,
+        'depth': depth,
+        'shallowDepth': shallow_depth
+    }
+
+def iter_game_results(parsed_games, session, workers, journal=None, profile=False, eval_store=None, depth=None):
+    """
+    Analyze parsed games and yield (parsed, analysis, run_stats) in input order.
+
+    analysis is None for games without moves, and run_stats is None when the
+    analysis was reused from the journal. With an eval store, each analyzed
+    game's evals are appended to it before the game is journaled, and a
+    journaled game missing from the store is analyzed again, so the store
+    covers every game. With a single worker the session's
+    in-process engine, cache and tablebase are used, otherwise its pool of
+    `workers` processes, each with its own engine and cache connection.
+    Only a small window of games is in flight at a time, so parsed_games can
+    be a lazy stream.
+    """
+    def reused(parsed):
+        # Games with no moves (forfeits, etc.) are skipped, journaled games are reused
+        if not parsed['task'][2]:
+            return parsed, None, None
+        journaled = journal.get(parsed['journalKey']) if journal is not None else None
+        # With --evals only games with a store record too (not from a run without --evals)
+        if journaled is not None and (eval_store is None or parsed['journalKey'] in eval_store):
+            return parsed, journaled, None
+        return None
+
+    def finished(parsed, result):
+        analysis, run_stats = result
+        # The store record first: a run killed in between re-analyzes the game
+        if eval_store is not None:
+            eval_store.append(eval_metadata(parsed, depth), run_stats.pop('evals'))
+        if journal is not None:
+            journal.append(parsed['journalKey'], parsed['gameId'], analysis)
+        return parsed, analysis, run_stats
+
+    if workers <= 1:
+        global _worker_engine, _worker_cache, _worker_tablebase
+        _worker_engine = session.engine
+        _worker_cache = session.cache
+        _worker_tablebase = session.tablebase
+        for parsed in parsed_games:
+            yield reused(parsed) or finished(parsed, analyze_game_task(parsed['task'], profile, eval_store is not None))
+        return
+
+    def resolve(parsed, pending_result):
+        if isinstance(pending_result, tuple):
+            return pending_result
+        return finished(parsed, pending_result.get())
+
+    window = workers * 2
+    # Results are collected in submission order, so games come back in gameIndex order
+    pending = collections.deque()
+    for parsed in parsed_games:
+        pending.append((parsed, reused(parsed) or session.pool.apply_async(analyze_game_task, (parsed['task'], profile, eval_store is not None))))
+        while len(pending) > window:
+            yield resolve(*pending.popleft())
+    while pending:
+        yield resolve(*pending.popleft())
+
+def performance_report(profiler, run_totals, games, plies, workers, profile_dump=None):
+    """
+    The meta.performance block for --profile: stage timers plus engine and
+    cache statistics. With workers, the replay/engine/metrics stages are
+    summed across worker processes.
+    """
+    performance = profiler.result()
+    searches = run_totals['searches']
+    engine_wall = performance['stages'].get('engine', {}).get('wallSeconds', 0)
+    lookups = run_totals['cacheHits'] + run_totals['cacheMisses']
+
+    performance.update({
+        'workers': workers,
+        'games': games,
+        'pliesAnalyzed': plies,
+        'engine': {
+            'searches': searches,
+            'nodes': run_totals['nodes'],
+            'avgDepth': round(run_totals['depthSum'] / searches, 1) if searches > 0 else 0,
+            'avgSearchMs': round(run_totals['searchTime'] / searches * 1000, 2) if searches > 0 else 0,
+            'engineMsPerPly': round(engine_wall / plies * 1000, 2) if plies > 0 else 0
+        },
+        'cache': {
+            'hits': run_totals['cacheHits'],
+            'misses': run_totals['cacheMisses'],
+            'hitRate': round(run_totals['cacheHits'] / lookups * 100, 1) if lookups > 0 else 0
+        }
+    })
+    if profile_dump:
+        performance['cProfile'] = profile_dump
+    return performance
+
+def run_autotune(args):
+    """--autotune: time the core splits on a sample of the input and save the fastest."""
+    configs = candidate_configs()
+    # Enough runs of plies to keep every engine of the widest config busy
+    max_workers = max(workers for workers, _, _ in configs)
+    segments = sample_segments(list(iter_games(sys.stdin)), args.autotune_positions, min_segments=SEGMENTS_PER_WORKER * max_workers)
+    if not segments:
+        print("❌ No middlegame positions in the input to tune on", file=sys.stderr)
+        sys.exit(1)
+
+    positions = sum(len(segment) for segment in segments)
+    print(f"\n🎛️  Auto-tuning {args.stockfish_path} at depth {args.depth}: {len(configs)} configs × {positions} positions", file=sys.stderr)
+
+    try:
+        profile = autotune(args.stockfish_path, args.depth, segments, configs, log=lambda line: print(line, file=sys.stderr))
+    except Exception as e:
+        print(f"Error initializing Stockfish: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    save_profile(args.stockfish_path, args.depth, profile, args.tuning)
+    print(f"✅ Fastest: {profile['workers']} worker(s) × {profile['threads']} thread(s), Hash {profile['hash']} MB "
+          f"({profile['positionsPerSec']} positions/s), saved to {args.tuning}\n", file=sys.stderr)
+    print(json.dumps(profile, indent=2))
+
+def batch_output_path(pgn_path, output_dir=None):
+    """Where --batch writes a round's output: data/season-46-round-1.pgn -> data/season-46-round-1.analysis.json."""
+    stem = os.path.splitext(os.path.basename(pgn_path))[0]
+    return os.path.join(output_dir or os.path.dirname(pgn_path), stem + '.analysis.json')
+
+def round_output(games, extra_games, leaderboard_size):
+    """
+    One round's output, in the format of a single-round run, from its game
+    results in any order. Games are folded into the awards and summaries in
+    gameIndex order, so ties resolve as they do when the round runs alone.
+    """
+    games = sorted(games, key=lambda game: game['gameIndex'])
+    awards = RoundAwards(leaderboard_size)
+    for game in games:
+        awards.add(game)
+    output = {'games': games, 'summary': awards.result()}
+
+    for key, results in extra_games.items():
+        results = sorted(results, key=lambda game: game['gameIndex'])
+        extra_summary = PLY_ANALYZERS[key].summary()
+        for result in results:
+            extra_summary.add(result)
+        output[key] = {'games': results, 'summary': extra_summary.result()}
+    return output
+
+def run_merge(argv):
+    """merge: combine the --shard outputs of a round into the output of the whole round."""
+    parser = argparse.ArgumentParser(prog='analyze-pgn.py merge', description='Merge analyze-pgn.py --shard outputs into the output of the whole round')
+    parser.add_argument('outputs', nargs='+', help='JSON outputs of the shards')
+    parser.add_argument('--leaderboard', type=int, default=DEFAULT_LEADERBOARD_SIZE, help=f'Entries kept per award leaderboard (default: {DEFAULT_LEADERBOARD_SIZE})')
+    args = parser.parse_args(argv)
+
+    try:
+        outputs = load_shard_outputs(args.outputs)
+        # The other analyzers' sections (--tactics, ...) are merged when every shard has them
+        ply_analyzers = [key for key in PLY_ANALYZERS if key in outputs[0]]
+        if any([key for key in PLY_ANALYZERS if key in output] != ply_analyzers for output in outputs):
+            raise ValueError('the shards were not run with the same analyzers (--tactics, ...)')
+        games = merge_games([output['games'] for output in outputs])
+        extra_games = {key: merge_games([output[key]['games'] for output in outputs]) for key in ply_analyzers}
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    output = round_output(games, extra_games, args.leaderboard)
+    print(f"🧩 Merged {len(args.outputs)} shard(s): {len(games)} game(s)", file=sys.stderr)
+    print(json.dumps(output, indent=2))
+
+def run_rescore(args):
+    """--rescore: recompute the game metrics and awards from an eval store, without the engine."""
+    try:
+        records = read_eval_records(args.rescore)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"\n♻️  Rescoring {len(records)} game(s) from {args.rescore}", file=sys.stderr)
+
+    metrics = batch_metrics.game_metrics if batch_metrics.available() else compute_game_metrics
+    games_analyzed = []
+    awards = RoundAwards(args.leaderboard)
+    for metadata, evals, move_sans in records:
+        game_data = {
+            'gameIndex': metadata['gameIndex'],
+            'gameId': metadata['gameId'],
+            'white': metadata['white'],
+            'black': metadata['black'],
+            **metrics(move_sans, evals, metadata['sampleRate'], metadata['bookPlies'])
+        }
+        awards.add(game_data)
+        if args.stream:
+            print(json.dumps(game_data), flush=True)
+        else:
+            games_analyzed.append(game_data)
+
+    print(f"✅ Rescore complete! Processed {len(records)} games\n", file=sys.stderr)
+
+    summary = awards.result()
+    if args.stream:
+        print(json.dumps({'summary': summary}), flush=True)
+    else:
+        print(json.dumps({'games': games_analyzed, 'summary': summary}, indent=2))
+
+def default_worker_count():
+    """Use all cores but one for engine processes."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
 def find_stockfish_path():
     """Find Stockfish binary in common locations."""
     # Try shutil.which first (searches PATH)
@@ -430,319 +945,443 @@ def find_stockfish_path():
 
     return 'stockfish'  # Fall back to hoping it's in PATH
 
-def main():
+def main(argv=None, session=None):
+    """
+    Run the analyzer with command line arguments (sys.argv by default).
+
+    A session passed in (analysis-daemon.py) stays open afterwards and is
+    reused when the engine settings match, otherwise the run opens its own.
+    "merge SHARD.json ..." combines --shard outputs instead (see run_merge).
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['merge']:
+        run_merge(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(description='Analyze chess PGN with Stockfish')
     parser.add_argument('--depth', type=int, default=15, help='Stockfish search depth (default: 15)')
     parser.add_argument('--sample', type=int, default=1, help='Analyze every Nth move (default: 1 = all moves)')
     parser.add_argument('--stockfish-path', type=str, default=None, help='Path to Stockfish binary (auto-detected if not specified)')
-    args = parser.parse_args()
+    parser.add_argument('--workers', type=int, default=None, help='Number of Stockfish processes (default: tuned profile, else CPU cores - 1)')
+    parser.add_argument('--threads', type=int, default=None, help=f'Stockfish Threads per process (default: tuned profile, else {DEFAULT_THREADS})')
+    parser.add_argument('--hash', type=int, default=None, help=f'Stockfish Hash size in MB per process (default: tuned profile, else {DEFAULT_HASH_MB})')
+    parser.add_argument('--cache', type=str, default=DEFAULT_CACHE_PATH, help='Eval cache file (default: data/eval-cache.sqlite)')
+    parser.add_argument('--cache-max-entries', type=int, default=DEFAULT_MAX_ENTRIES, help=f'Evict least recently used evals beyond this many positions (default: {DEFAULT_MAX_ENTRIES})')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the persistent eval cache')
+    parser.add_argument('--journal', type=str, default=None, help='JSONL checkpoint of finished games; games already in it are not re-analyzed')
+    parser.add_argument('--evals', default=None, help='Append each analyzed game\'s evals to this eval store (for --rescore)')
+    parser.add_argument('--rescore', default=None, help='Recompute the game metrics and summary of the last finished run in this eval store instead of analyzing a PGN')
+    parser.add_argument('--stream', action='store_true', help='Read games incrementally and emit one JSON line per game, then a summary line')
+    parser.add_argument('--adaptive', action='store_true', help='Shallow pass over all positions, full depth only at critical plies')
+    parser.add_argument('--shallow-depth', type=int, default=8, help='Search depth of the adaptive shallow pass (default: 8)')
+    parser.add_argument('--book', action='store_true', help='Credit opening book moves (scripts/utils/openings-*.tsv) as excellent without engine analysis')
+    parser.add_argument('--syzygy', default=None, help='Syzygy tablebase directory for exact endgame evals')
+    parser.add_argument('--tactics', action='store_true', help='Run the tactical analysis (analyze-tactics.py) in the same replay and add it to the output')
+    parser.add_argument('--leaderboard', type=int, default=DEFAULT_LEADERBOARD_SIZE, help=f'Entries kept per award leaderboard (default: {DEFAULT_LEADERBOARD_SIZE})')
+    parser.add_argument('--profile', action='store_true', help='Add per-stage timings and engine/cache stats to the output (meta.performance)')
+    parser.add_argument('--profile-dump', default=None, help='Also write a cProfile dump of the main process to this file')
+    parser.add_argument('--progress', choices=['bar', 'json'], default='bar', help='Progress on stderr: a progress bar, or JSON-lines events with a throughput ETA (default: bar)')
+    parser.add_argument('--progress-fd', type=int, default=None, help='Write JSON-lines progress events to this file descriptor (implies --progress json)')
+    parser.add_argument('--batch', nargs='+', default=None, metavar='PGN', help='Analyze several round PGNs in one run, longest games first, and write one output file per round')
+    parser.add_argument('--output-dir', default=None, help='Directory for the --batch round outputs (default: next to each PGN)')
+    parser.add_argument('--pgn', default=None, help='Read games from this PGN file instead of stdin (indexed, for --games/--players/--range)')
+    parser.add_argument('--games', default=None, help='Only these comma-separated game IDs (needs --pgn)')
+    parser.add_argument('--players', default=None, help='Only games of these comma-separated players (needs --pgn)')
+    parser.add_argument('--range', default=None, help='Only games N-M of the file, 1-based and inclusive, or N- to the end (needs --pgn)')
+    parser.add_argument('--shard', default=None, help='Only shard i/N of the games (by a stable hash of the gameId); combine the shard outputs with the merge subcommand')
+    parser.add_argument('--autotune', action='store_true', help='Benchmark workers/threads/hash splits on the input PGN and save the fastest for this machine')
+    parser.add_argument('--autotune-positions', type=int, default=DEFAULT_SAMPLE_POSITIONS, help=f'Positions sampled from the input for --autotune, at least {SEGMENTS_PER_WORKER} runs of plies per engine (default: {DEFAULT_SAMPLE_POSITIONS})')
+    parser.add_argument('--tuning', default=DEFAULT_TUNING_PATH, help='Tuning profiles file (default: data/engine-tuning.json)')
+    args = parser.parse_args(argv)
+
+    if args.rescore:
+        # Metrics and awards only: no PGN input, engine or tactical replay
+        if args.tactics:
+            parser.error('--rescore can\'t run --tactics, the eval store has no positions to replay')
+        run_rescore(args)
+        return
+
+    if args.batch and (args.pgn or args.stream or args.evals):
+        parser.error('--batch reads its own PGN files and writes one output per round, it can\'t be combined with --pgn, --stream or --evals')
+
+    if args.batch and args.shard:
+        parser.error('--shard splits one round, it can\'t be combined with --batch')
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    selection = select_input_games(parser, args)
+    if shard is not None and selection is not None:
+        selection = shard_entries(selection, shard)
+
+    profiler = StageProfiler() if args.profile or args.profile_dump else None
+
+    shallow_depth = args.shallow_depth if args.adaptive else None
+
+    # Analyzers that follow the Stockfish replay, each with its own output section
+    ply_analyzers = ('tactics',) if args.tactics else ()
 
     # Auto-detect Stockfish path if not specified
     if args.stockfish_path is None:
         args.stockfish_path = find_stockfish_path()
 
-    # Initialize Stockfish
-    try:
-        stockfish = Stockfish(path=args.stockfish_path, depth=args.depth)
-    except Exception as e:
-        print(f"Error initializing Stockfish: {e}", file=sys.stderr)
-        print("Install Stockfish: brew install stockfish (macOS) or apt-get install stockfish (Linux)", file=sys.stderr)
-        sys.exit(1)
+    if args.autotune:
+        run_autotune(args)
+        return
+
+    # Explicit options win over a saved --autotune profile, which wins over the defaults
+    tuned = load_profile(args.stockfish_path, args.depth, args.tuning)
+    for option, default in (('workers', default_worker_count()), ('threads', DEFAULT_THREADS), ('hash', DEFAULT_HASH_MB)):
+        if getattr(args, option) is None:
+            setattr(args, option, tuned[option] if tuned else default)
+
+    engine_config = {
+        'path': args.stockfish_path,
+        'depth': args.depth,
+        'threads': args.threads,
+        'hash': args.hash,
+        'cache': None,
+        'syzygy': args.syzygy
+    }
 
-    # Read PGN from stdin
-    pgn_text = sys.stdin.read()
+    owns_session = session is None
+    if owns_session:
+        session = AnalysisSession()
+
+    # The working directory is part of the settings since cache and tablebase paths may be relative
+    settings = (os.getcwd(), args.stockfish_path, args.depth, args.threads, args.hash, args.syzygy,
+                None if args.no_cache else (args.cache, args.cache_max_entries), args.workers)
+    session_reused = session.reuse(settings)
+    if not session_reused:
+        # Syzygy tablebases for exact endgame evals
+        if args.syzygy:
+            try:
+                session.tablebase = open_tablebase(args.syzygy)
+            except OSError as e:
+                print(f"Error opening Syzygy tablebases: {e}", file=sys.stderr)
+                sys.exit(1)
+
+        # Initialize Stockfish
+        try:
+            session.engine = open_engine(engine_config)
+        except Exception as e:
+            print(f"Error initializing Stockfish: {e}", file=sys.stderr)
+            print("Install Stockfish: brew install stockfish (macOS) or apt-get install stockfish (Linux)", file=sys.stderr)
+            sys.exit(1)
+        session.engine_name = session.engine.name
+        session.settings = settings
+
+    # Open the persistent eval cache (keyed by engine version and depth)
+    if not args.no_cache:
+        engine_config['cache'] = (args.cache, session.engine_name, args.cache_max_entries)
+        if session.cache is None:
+            session.cache = open_eval_cache(engine_config['cache'])
+
+    # (round PGN, games) sources; the round is only set for --batch
+    if args.batch:
+        # Every round of the batch, read up front so games can be scheduled longest first
+        sources = []
+        total_games = 0
+        for pgn_path in dict.fromkeys(args.batch):
+            try:
+                with open(pgn_path, encoding='utf-8') as f:
+                    pgn_text = f.read()
+            except OSError as e:
+                print(f"❌ {pgn_path}: {e}", file=sys.stderr)
+                sys.exit(1)
+            sources.append((pgn_path, enumerate(iter_games(io.StringIO(pgn_text)))))
+            total_games += pgn_text.count('[Event ')
+    elif selection is not None:
+        # Indexed games from --pgn, read from a memory map as they are needed
+        sources = [(None, iter_indexed_games(args.pgn, selection))]
+        total_games = len(selection)
+    elif args.stream:
+        # Read games incrementally, the total is not known up front
+        sources = [(None, enumerate(iter_games(sys.stdin)))]
+        total_games = None
+    else:
+        # Read PGN from stdin
+        pgn_text = sys.stdin.read()
+        sources = [(None, enumerate(iter_games(io.StringIO(pgn_text))))]
 
-    # Parse games
-    games_analyzed = []
-    game_index = 0
+        # First pass: count total games
+        total_games = pgn_text.count('[Event ')
 
-    import io
-    pgn_io = io.StringIO(pgn_text)
+    if shard is not None and selection is None:
+        # Games from stdin outside the shard are dropped as they are read, the total is not known up front
+        sources = [(round_pgn, iter_shard_games(pgn_games, shard)) for round_pgn, pgn_games in sources]
+        total_games = None
 
-    # First pass: count total games
-    total_games = pgn_text.count('[Event ')
     print(f"\n🔬 Stockfish Analysis Starting...", file=sys.stderr)
-    print(f"📊 Total games to analyze: {total_games}", file=sys.stderr)
-    print(f"⚙️  Depth: {args.depth} | Sample rate: every {args.sample} move(s)", file=sys.stderr)
-
-    # Format estimated time in human-readable form
-    min_seconds = total_games * 15
-    max_seconds = total_games * 30
-    min_minutes = min_seconds // 60
-    min_secs = min_seconds % 60
-    max_minutes = max_seconds // 60
-    max_secs = max_seconds % 60
-
-    if max_minutes > 0:
-        time_estimate = f"{min_minutes}:{min_secs:02d}-{max_minutes}:{max_secs:02d} minutes"
+    if args.batch:
+        print(f"📊 Total games to analyze: {total_games} from {len(sources)} round(s), longest first", file=sys.stderr)
+    elif total_games is not None:
+        print(f"📊 Total games to analyze: {total_games}", file=sys.stderr)
     else:
-        time_estimate = f"{min_seconds}-{max_seconds} seconds"
-
-    print(f"⏱️  Estimated time: {time_estimate}\n", file=sys.stderr)
-
-    while True:
-        game = chess.pgn.read_game(pgn_io)
-        if game is None:
-            break
-
-        white = game.headers.get('White', 'Unknown')
-        black = game.headers.get('Black', 'Unknown')
-
-        # Extract gameId from headers (GameId or Site URL)
-        game_id = game.headers.get('GameId')
-        if not game_id:
-            site = game.headers.get('Site', '')
-            game_id = site.split('/')[-1] if site else None
-
-        # Count moves in this game
-        board = game.board()
-        move_count = 0
-        for _ in game.mainline_moves():
-            move_count += 1
-
-        # Print progress with game info (use \r to overwrite line)
-        progress_pct = ((game_index + 1) / total_games) * 100
-        progress_bar = '█' * int(progress_pct / 5) + '░' * (20 - int(progress_pct / 5))
-
-        # Truncate long names to fit on one line (shorter to avoid wrapping)
-        max_name_len = 20
-        white_short = white[:max_name_len] + '...' if len(white) > max_name_len else white
-        black_short = black[:max_name_len] + '...' if len(black) > max_name_len else black
-
-        # Clear line with spaces, then print progress
-        progress_line = f"[{progress_bar}] {progress_pct:3.0f}% | {game_index + 1}/{total_games} | {white_short} vs {black_short}"
-
-        # Skip games with no moves (forfeits, etc.)
-        if move_count == 0:
-            print(f"\r{progress_line:<100} [SKIPPED - no moves]", end='', flush=True, file=sys.stderr)
-            game_index += 1
-            continue
-
-        print(f"\r{progress_line:<100}", end='', flush=True, file=sys.stderr)
-
-        analysis = analyze_game(game, stockfish, args.depth, args.sample)
+        print(f"📊 Streaming games from stdin", file=sys.stderr)
+    print(f"⚙️  Depth: {args.depth} | Sample rate: every {args.sample} move(s) | Workers: {args.workers} | Threads: {args.threads} | Hash: {args.hash} MB", file=sys.stderr)
+    if shard is not None:
+        print(f"🧩 Shard {shard[0]}/{shard[1]} of the round's games", file=sys.stderr)
+    if shallow_depth:
+        print(f"🪜 Adaptive: shallow pass at depth {shallow_depth}, depth {args.depth} at critical plies", file=sys.stderr)
+
+    if tuned:
+        print(f"🎛️  Tuned profile ({tuned['timestamp']}): {tuned['workers']} worker(s) × {tuned['threads']} thread(s), Hash {tuned['hash']} MB", file=sys.stderr)
+    if session_reused:
+        print(f"♻️  Reusing the running engine session", file=sys.stderr)
+
+    # Known opening positions, built once from the ECO database and cached on disk
+    book = None
+    if args.book:
+        if session.book is None:
+            session.book = load_opening_book()
+        book = session.book
+        print(f"📖 Opening book: {len(book):,} positions", file=sys.stderr)
+
+    if session.tablebase is not None:
+        print(f"🧮 Syzygy tablebases: {len(session.tablebase.wdl)} WDL tables from {args.syzygy}", file=sys.stderr)
+
+    if total_games is not None:
+        # Format estimated time in human-readable form
+        min_seconds = total_games * 15
+        max_seconds = total_games * 30
+        min_minutes = min_seconds // 60
+        min_secs = min_seconds % 60
+        max_minutes = max_seconds // 60
+        max_secs = max_seconds % 60
+
+        if max_minutes > 0:
+            time_estimate = f"{min_minutes}:{min_secs:02d}-{max_minutes}:{max_secs:02d} minutes"
+        else:
+            time_estimate = f"{min_seconds}-{max_seconds} seconds"
+
+        print(f"⏱️  Estimated time: {time_estimate}\n", file=sys.stderr)
+
+    def parse_games():
+        # Reading a game and extracting its moves is the 'pgnParse' stage
+        for round_pgn, pgn_games in sources:
+            while True:
+                with timed(profiler, 'pgnParse'):
+                    game_index, game = next(pgn_games, (None, None))
+                    parsed = parse_game(game, game_index, args.depth, args.sample, shallow_depth, book, args.syzygy is not None, ply_analyzers) if game is not None else None
+                if parsed is None:
+                    break
+                parsed['round'] = round_pgn
+                if reporter is not None:
+                    reporter.queued(len(parsed['task'][2]))
+                yield parsed
+
+    # Structured progress events instead of the \r progress bar
+    reporter = None
+    if args.progress_fd is not None:
+        reporter = ProgressReporter(os.fdopen(args.progress_fd, 'w'), total_games)
+    elif args.progress == 'json':
+        reporter = ProgressReporter(sys.stderr, total_games)
+    if reporter is not None:
+        reporter.start()
+
+    parsed_games = parse_games()
+    if args.batch:
+        # Longest games first across all rounds, so no worker picks up a long game at the very end
+        parsed_games = sorted(parsed_games, key=lambda parsed: len(parsed['task'][2]), reverse=True)
+
+    journal = GameJournal(args.journal) if args.journal else None
+    if journal is not None:
+        print(f"📒 Journal: {len(journal)} game(s) already analyzed\n", file=sys.stderr)
+
+    eval_store = EvalStore(args.evals) if args.evals else None
+
+    if args.workers > 1 and session.pool is None:
+        # Each worker process starts its own engine
+        session.start_pool(engine_config, args.workers)
 
-        games_analyzed.append({
+    games_analyzed = []
+    # --batch results per round, summarized once the round is complete (see round_output)
+    batch_rounds = {round_pgn: {key: [] for key in ('games',) + ply_analyzers} for round_pgn, _ in sources} if args.batch else None
+    awards = RoundAwards(args.leaderboard)
+    extra_games = {key: [] for key in ply_analyzers}
+    extra_summaries = {key: PLY_ANALYZERS[key].summary() for key in ply_analyzers}
+    # Games of this run, recorded in the eval store once it finishes (for --rescore)
+    stored_keys = []
+    run_totals = {'cacheHits': 0, 'cacheMisses': 0, 'searches': 0, 'nodes': 0, 'searchTime': 0, 'depthSum': 0}
+    processed = 0
+    analyzed_plies = 0
+
+    main_profile = cProfile.Profile() if args.profile_dump else None
+    if main_profile is not None:
+        main_profile.enable()
+
+    for parsed, analysis, run_stats in iter_game_results(parsed_games, session, args.workers, journal, profiler is not None, eval_store, args.depth):
+        game_index = parsed['gameIndex']
+        white = parsed['white']
+        black = parsed['black']
+        round_results = batch_rounds[parsed['round']] if batch_rounds is not None else None
+        processed += 1
+
+        # Games with no moves (forfeits, etc.) are skipped, journaled games reused
+        status = 'skipped' if analysis is None else 'journal' if run_stats is None else 'analyzed'
+
+        if reporter is not None:
+            reporter.finished(game_index, len(parsed['task'][2]), status, parsed['gameId'])
+        else:
+            # Truncate long names to fit on one line (shorter to avoid wrapping)
+            max_name_len = 20
+            white_short = white[:max_name_len] + '...' if len(white) > max_name_len else white
+            black_short = black[:max_name_len] + '...' if len(black) > max_name_len else black
+
+            # Print progress with game info (use \r to overwrite line)
+            if total_games:
+                # Count processed games, a --pgn selection keeps the file's game indexes
+                progress_pct = (processed / total_games) * 100
+                progress_bar = '█' * int(progress_pct / 5) + '░' * (20 - int(progress_pct / 5))
+
+                # Clear line with spaces, then print progress
+                progress_line = f"[{progress_bar}] {progress_pct:3.0f}% | {processed}/{total_games} | {white_short} vs {black_short}"
+            else:
+                progress_line = f"🔍 Game {game_index + 1} | {white_short} vs {black_short}"
+
+            tag = {'skipped': ' [SKIPPED - no moves]', 'journal': ' [JOURNAL]', 'analyzed': ''}[status]
+            print(f"\r{progress_line:<100}{tag}", end='', flush=True, file=sys.stderr)
+
+        # Results of the other analyzers, kept apart from the Stockfish game record
+        for key in ply_analyzers:
+            extra_game = {
+                'white': white,
+                'black': black,
+                **(analysis.pop(key) if analysis is not None else empty_result(key)),
+                'gameIndex': game_index
+            }
+            if round_results is not None:
+                round_results[key].append(extra_game)
+                continue
+            with timed(profiler, 'summary'):
+                extra_summaries[key].add(extra_game)
+            if args.stream:
+                with timed(profiler, 'output'):
+                    print(json.dumps({key: extra_game}), flush=True)
+            else:
+                extra_games[key].append(extra_game)
+
+        if analysis is None:
+            continue
+        if eval_store is not None:
+            stored_keys.append(parsed['journalKey'])
+
+        if run_stats is not None:
+            stages = run_stats.pop('stages', None)
+            if stages is not None:
+                profiler.merge(stages)
+            for key, value in run_stats.items():
+                run_totals[key] += value
+            analyzed_plies += len(parsed['task'][2])
+
+        game_data = {
             'gameIndex': game_index,
-            'gameId': game_id,
+            'gameId': parsed['gameId'],
             'white': white,
             'black': black,
             **analysis
-        })
-
-        game_index += 1
-
-    print(f"\n\n✅ Analysis complete! Processed {total_games} games\n", file=sys.stderr)
+        }
+        if round_results is not None:
+            round_results['games'].append(game_data)
+            continue
+        with timed(profiler, 'summary'):
+            awards.add(game_data)
 
-    # Find accuracy king, biggest blunder, ACPL extremes, comeback king, lucky escape, stockfish buddy, and inaccuracy king
-    accuracy_king = None
-    biggest_blunder = None
-    comeback_king = None
-    lucky_escape = None
-    stockfish_buddy = None
-    inaccuracy_king = None
-    lowest_acpl = None
-    highest_acpl = None
-    lowest_combined_acpl = None
-    highest_combined_acpl = None
-
-    for game_data in games_analyzed:
-        # Check white accuracy
-        if accuracy_king is None or game_data['whiteAccuracy'] > accuracy_king['accuracy']:
-            accuracy_king = {
-                'player': 'white',
-                'accuracy': game_data['whiteAccuracy'],
-                'acpl': game_data['whiteACPL'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+        if args.stream:
+            # Emit each game as soon as it is done
+            with timed(profiler, 'output'):
+                print(json.dumps(game_data), flush=True)
+        else:
+            games_analyzed.append(game_data)
 
-        # Check black accuracy
-        if accuracy_king is None or game_data['blackAccuracy'] > accuracy_king['accuracy']:
-            accuracy_king = {
-                'player': 'black',
-                'accuracy': game_data['blackAccuracy'],
-                'acpl': game_data['blackACPL'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    if main_profile is not None:
+        main_profile.disable()
+        main_profile.dump_stats(args.profile_dump)
 
-        # Check white lowest ACPL
-        if lowest_acpl is None or game_data['whiteACPL'] < lowest_acpl['acpl']:
-            lowest_acpl = {
-                'player': 'white',
-                'acpl': game_data['whiteACPL'],
-                'accuracy': game_data['whiteAccuracy'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    if journal is not None:
+        journal.close()
+    if eval_store is not None:
+        eval_store.finish(stored_keys)
+        eval_store.close()
 
-        # Check black lowest ACPL
-        if lowest_acpl is None or game_data['blackACPL'] < lowest_acpl['acpl']:
-            lowest_acpl = {
-                'player': 'black',
-                'acpl': game_data['blackACPL'],
-                'accuracy': game_data['blackAccuracy'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    evicted = 0
+    if session.cache is not None:
+        evicted = session.cache.evict()
+        session.cache.commit()
 
-        # Check white highest ACPL
-        if highest_acpl is None or game_data['whiteACPL'] > highest_acpl['acpl']:
-            highest_acpl = {
-                'player': 'white',
-                'acpl': game_data['whiteACPL'],
-                'accuracy': game_data['whiteAccuracy'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    if owns_session:
+        # All results are in, shut down the worker pool or the in-process engine
+        session.close()
 
-        # Check black highest ACPL
-        if highest_acpl is None or game_data['blackACPL'] > highest_acpl['acpl']:
-            highest_acpl = {
-                'player': 'black',
-                'acpl': game_data['blackACPL'],
-                'accuracy': game_data['blackAccuracy'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    if reporter is not None:
+        reporter.done()
 
-        # Check combined ACPL
-        combined_acpl = game_data['whiteACPL'] + game_data['blackACPL']
-
-        if lowest_combined_acpl is None or combined_acpl < lowest_combined_acpl['combinedACPL']:
-            lowest_combined_acpl = {
-                'combinedACPL': combined_acpl,
-                'whiteACPL': game_data['whiteACPL'],
-                'blackACPL': game_data['blackACPL'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    print(f"\n\n✅ Analysis complete! Processed {processed} games", file=sys.stderr)
 
-        if highest_combined_acpl is None or combined_acpl > highest_combined_acpl['combinedACPL']:
-            highest_combined_acpl = {
-                'combinedACPL': combined_acpl,
-                'whiteACPL': game_data['whiteACPL'],
-                'blackACPL': game_data['blackACPL'],
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    searches = run_totals['searches']
+    if searches > 0:
+        avg_depth = run_totals['depthSum'] / searches
+        nps = run_totals['nodes'] / run_totals['searchTime'] if run_totals['searchTime'] > 0 else 0
+        print(f"🔎 Engine: {searches} searches | avg depth {avg_depth:.1f} | {run_totals['nodes']:,} nodes | {nps:,.0f} nodes/s", file=sys.stderr)
 
-        # Check biggest blunder (compare by severity, not just cpLoss)
-        if game_data['biggestBlunder']:
-            if biggest_blunder is None or game_data['biggestBlunder']['severity'] > biggest_blunder.get('severity', 0):
-                biggest_blunder = {
-                    **game_data['biggestBlunder'],
-                    'white': game_data['white'],
-                    'black': game_data['black'],
-                    'gameIndex': game_data['gameIndex'],
-                    'gameId': game_data['gameId']
-                }
-
-        # Check biggest comeback
-        if game_data['biggestComeback']:
-            if comeback_king is None or game_data['biggestComeback']['swing'] > comeback_king.get('swing', 0):
-                comeback_king = {
-                    **game_data['biggestComeback'],
-                    'white': game_data['white'],
-                    'black': game_data['black'],
-                    'gameIndex': game_data['gameIndex'],
-                    'gameId': game_data['gameId']
-                }
-
-        # Check lucky escape
-        if game_data['luckyEscape']:
-            if lucky_escape is None or game_data['luckyEscape']['escapeAmount'] > lucky_escape.get('escapeAmount', 0):
-                lucky_escape = {
-                    **game_data['luckyEscape'],
-                    'white': game_data['white'],
-                    'black': game_data['black'],
-                    'gameIndex': game_data['gameIndex'],
-                    'gameId': game_data['gameId']
-                }
-
-        # Check Stockfish Buddy (most engine-level moves)
-        if stockfish_buddy is None or game_data['whiteEngineMoves'] > stockfish_buddy.get('engineMoves', 0):
-            stockfish_buddy = {
-                'player': 'white',
-                'engineMoves': game_data['whiteEngineMoves'],
-                'totalMoves': sum(game_data['whiteMoveQuality'].values()),
-                'percentage': round(game_data['whiteEngineMoves'] / sum(game_data['whiteMoveQuality'].values()) * 100, 1) if sum(game_data['whiteMoveQuality'].values()) > 0 else 0,
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    if not args.no_cache:
+        cache_hits = run_totals['cacheHits']
+        cache_misses = run_totals['cacheMisses']
+        lookups = cache_hits + cache_misses
+        hit_rate = (cache_hits / lookups * 100) if lookups > 0 else 0
+        print(f"💾 Eval cache: {cache_hits} hits / {cache_misses} misses ({hit_rate:.1f}% hit rate), {evicted} evicted", file=sys.stderr)
 
-        if stockfish_buddy is None or game_data['blackEngineMoves'] > stockfish_buddy.get('engineMoves', 0):
-            stockfish_buddy = {
-                'player': 'black',
-                'engineMoves': game_data['blackEngineMoves'],
-                'totalMoves': sum(game_data['blackMoveQuality'].values()),
-                'percentage': round(game_data['blackEngineMoves'] / sum(game_data['blackMoveQuality'].values()) * 100, 1) if sum(game_data['blackMoveQuality'].values()) > 0 else 0,
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    with timed(profiler, 'summary'):
+        summary = awards.result()
+        extra_summaries = {key: extra_summary.result() for key, extra_summary in extra_summaries.items()}
 
-        # Check Inaccuracy King (most inaccuracies)
-        if inaccuracy_king is None or game_data['whiteMoveQuality']['inaccuracies'] > inaccuracy_king.get('inaccuracies', 0):
-            inaccuracy_king = {
-                'player': 'white',
-                'inaccuracies': game_data['whiteMoveQuality']['inaccuracies'],
-                'totalMoves': sum(game_data['whiteMoveQuality'].values()),
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    meta = None
+    if profiler is not None:
+        meta = {'performance': performance_report(profiler, run_totals, processed, analyzed_plies, args.workers, args.profile_dump)}
+        stages = meta['performance']['stages']
+        print("⏱️  Stages: " + ' | '.join(f"{name} {stage['wallSeconds']:.1f}s" for name, stage in stages.items()), file=sys.stderr)
 
-        if inaccuracy_king is None or game_data['blackMoveQuality']['inaccuracies'] > inaccuracy_king.get('inaccuracies', 0):
-            inaccuracy_king = {
-                'player': 'black',
-                'inaccuracies': game_data['blackMoveQuality']['inaccuracies'],
-                'totalMoves': sum(game_data['blackMoveQuality'].values()),
-                'white': game_data['white'],
-                'black': game_data['black'],
-                'gameIndex': game_data['gameIndex'],
-                'gameId': game_data['gameId']
-            }
+    print('', file=sys.stderr)
 
     # Output JSON
-    output = {
-        'games': games_analyzed,
-        'summary': {
-            'accuracyKing': accuracy_king,
-            'biggestBlunder': biggest_blunder,
-            'comebackKing': comeback_king,
-            'luckyEscape': lucky_escape,
-            'stockfishBuddy': stockfish_buddy,
-            'inaccuracyKing': inaccuracy_king,
-            'lowestACPL': lowest_acpl,
-            'highestACPL': highest_acpl,
-            'lowestCombinedACPL': lowest_combined_acpl,
-            'highestCombinedACPL': highest_combined_acpl
+    if args.batch:
+        # One output file per round, and an index of them on stdout
+        rounds = []
+        for round_pgn, results in batch_rounds.items():
+            with timed(profiler, 'summary'):
+                output = round_output(results['games'], {key: results[key] for key in ply_analyzers}, args.leaderboard)
+            output_path = batch_output_path(round_pgn, args.output_dir)
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2)
+            print(f"💾 {round_pgn}: {len(output['games'])} game(s) -> {output_path}", file=sys.stderr)
+            rounds.append({'pgn': round_pgn, 'output': output_path, 'games': len(output['games'])})
+
+        output = {'rounds': rounds}
+        if meta is not None:
+            output['meta'] = meta
+        print(json.dumps(output, indent=2))
+    elif args.stream:
+        # Trailing summary record after the per-game lines
+        record = {'summary': summary}
+        for key in ply_analyzers:
+            record[key] = {'summary': extra_summaries[key]}
+        if meta is not None:
+            record['meta'] = meta
+        print(json.dumps(record), flush=True)
+    else:
+        output = {
+            'games': games_analyzed,
+            'summary': summary
         }
-    }
+        for key in ply_analyzers:
+            output[key] = {'games': extra_games[key], 'summary': extra_summaries[key]}
+        if meta is not None:
+            output['meta'] = meta
 
-    print(json.dumps(output, indent=2))
+        print(json.dumps(output, indent=2))
 
 if __name__ == '__main__':
     main()
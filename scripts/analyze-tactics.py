@@ -10,13 +10,52 @@ Requirements:
 
 Usage:
     python analyze-tactics.py < games.pgn > tactics.json
+    python analyze-tactics.py --stream < games.pgn > tactics.jsonl
+    python analyze-tactics.py --profile < games.pgn > tactics.json
+    python analyze-tactics.py --workers 4 < games.pgn > tactics.json
+    python analyze-tactics.py --pgn data/season-46-round-1.pgn --players alice > tactics.json
+    python analyze-tactics.py merge shard-1.json shard-2.json > tactics.json
+
+With --profile, the output gains a "meta": {"performance": {...}} block with
+wall/CPU time per stage (pgnParse, analysis, summary, output).
+
+With --progress json (or --progress-fd N), the per-game log lines are
+replaced by JSON-lines progress events with a throughput-based ETA (see
+analysis.progress).
+
+With --workers N, games are replayed by a pool of N processes. The main
+process only parses the PGN and sends each game as a compact (fen,
+chess960, uci_moves) task; results come back in gameIndex order, so the
+output is the same as a single-process run. The profile's analysis stage
+then measures the time spent waiting on the workers.
+
+With --pgn PATH, games are read from the file instead of stdin, and
+--games, --players and --range pick games out of it through a byte-offset
+index, as in analyze-pgn.py (see analysis.pgn_index).
+
+With --shard i/N, only shard i of N of the games is analyzed, and the merge
+subcommand combines the shard outputs into the output of the whole round,
+as in analyze-pgn.py (see analysis.shards).
 """
 
+import io
+import os
 import sys
 import json
+import argparse
+import cProfile
+import collections
+import multiprocessing
 import chess
 import chess.pgn
-from typing import Dict, Any
+import multiprocessing.pool
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from analysis.pgn_reader import PgnGame, iter_games
+from analysis.pgn_index import select_input_games, iter_indexed_games
+from analysis.shards import parse_shard, shard_entries, iter_shard_games, load_shard_outputs, merge_games
+from analysis.profiling import StageProfiler, timed
+from analysis.progress import ProgressReporter
+from analysis.tactics import TacticalTracker, TacticsSummary
 
 
 class TacticalAnalyzer:
@@ -25,35 +64,7 @@ class TacticalAnalyzer:
     def __init__(self, game: chess.pgn.Game):
         self.game = game
         self.board = game.board()
-
-        # Track enemy territory invasion
-        # White's enemy territory: ranks 5-8 (indices 4-7)
-        # Black's enemy territory: ranks 1-4 (indices 0-3)
-        self.white_pieces_in_enemy = set()  # Track unique piece types
-        self.black_pieces_in_enemy = set()
-
-        # Track first invasion move number (ply)
-        self.white_first_invasion = None
-        self.black_first_invasion = None
-
-        # Track most attacked square
-        self.most_attacked_square = {
-            'square': None,
-            'attackers': 0,
-            'whiteAttackers': 0,
-            'blackAttackers': 0,
-            'moveNumber': 0,
-            'move': None
-        }
-
-        # Track tension (mutual attacks between pieces)
-        self.current_tensions = {}  # Map of tension pairs to start move
-        self.longest_tension = {
-            'moves': 0,
-            'squares': None,
-            'startMove': 0,
-            'endMove': 0
-        }
+        self.tracker = TacticalTracker(self.board)
 
         # Get player names
         self.white = game.headers.get("White", "Unknown")
@@ -61,326 +72,302 @@ class TacticalAnalyzer:
 
     def analyze(self) -> Dict[str, Any]:
         """Run all analysis and return results."""
-        moves = list(self.game.mainline_moves())
-
-        for move_num, move in enumerate(moves):
+        for move_num, move in enumerate(self.game.mainline_moves()):
             # Get SAN notation BEFORE pushing the move
             move_san = self.board.san(move)
 
             # Make the move
             self.board.push(move)
 
-            # Track enemy territory invasion and most attacked square
-            self._track_enemy_territory(move_num)
-            self._detect_most_attacked_square(move_num, move_san)
-            self._track_tension(move_num)
-
-        return self._format_results()
-
-    def _track_enemy_territory(self, move_num: int) -> None:
-        """
-        Track pieces that enter enemy territory.
-        White's enemy territory: ranks 5-8 (indices 4-7)
-        Black's enemy territory: ranks 1-4 (indices 0-3)
-        """
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if not piece:
-                continue
-
-            rank = chess.square_rank(square)
-            piece_type = piece.piece_type
-
-            # Check if white piece is in enemy territory (rank >= 4, i.e., 5th rank and above)
-            if piece.color == chess.WHITE and rank >= 4:
-                piece_id = piece_type
-                if piece_id not in self.white_pieces_in_enemy:
-                    self.white_pieces_in_enemy.add(piece_id)
-                    # Record first invasion if not yet recorded
-                    if self.white_first_invasion is None:
-                        self.white_first_invasion = move_num + 1
-
-            # Check if black piece is in enemy territory (rank <= 3, i.e., 4th rank and below)
-            elif piece.color == chess.BLACK and rank <= 3:
-                piece_id = piece_type
-                if piece_id not in self.black_pieces_in_enemy:
-                    self.black_pieces_in_enemy.add(piece_id)
-                    # Record first invasion if not yet recorded
-                    if self.black_first_invasion is None:
-                        self.black_first_invasion = move_num + 1
-
-    def _detect_most_attacked_square(self, move_num: int, move_san: str) -> None:
-        """
-        Find the most attacked square in the current position.
-        Count attacks from both sides on each square.
-        """
-        # Check all squares for total attacks
-        for square in chess.SQUARES:
-            # Count attacks from white and black
-            white_attackers = len(list(self.board.attackers(chess.WHITE, square)))
-            black_attackers = len(list(self.board.attackers(chess.BLACK, square)))
-            total_attackers = white_attackers + black_attackers
-
-            # Update if this is the most attacked square we've seen
-            if total_attackers > self.most_attacked_square['attackers']:
-                self.most_attacked_square = {
-                    'square': chess.square_name(square),
-                    'attackers': total_attackers,
-                    'whiteAttackers': white_attackers,
-                    'blackAttackers': black_attackers,
-                    'moveNumber': move_num + 1,
-                    'move': move_san
-                }
-
-    def _track_tension(self, move_num: int) -> None:
-        """
-        Track tension: when two pieces mutually attack each other.
-        Tension persists as long as both pieces can capture each other.
-        """
-        # Find all current mutual attacks
-        current_mutual_attacks = set()
-
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if not piece:
-                continue
-
-            # Get all squares this piece attacks
-            attackers_from_square = self.board.attacks(square)
-
-            for target_square in attackers_from_square:
-                target_piece = self.board.piece_at(target_square)
-                if not target_piece or target_piece.color == piece.color:
-                    continue
-
-                # Check if target piece also attacks this square (mutual attack)
-                if self.board.is_attacked_by(target_piece.color, square):
-                    # Create a sorted tuple so (a,b) == (b,a)
-                    tension_pair = tuple(sorted([chess.square_name(square), chess.square_name(target_square)]))
-                    current_mutual_attacks.add(tension_pair)
-
-        # Update ongoing tensions
-        new_tensions = {}
-        for tension_pair in current_mutual_attacks:
-            if tension_pair in self.current_tensions:
-                # Tension continues
-                new_tensions[tension_pair] = self.current_tensions[tension_pair]
-            else:
-                # New tension starts
-                new_tensions[tension_pair] = move_num + 1
-
-        # Check if any tensions ended and update longest
-        for tension_pair, start_move in self.current_tensions.items():
-            if tension_pair not in current_mutual_attacks:
-                # Tension ended
-                duration = move_num + 1 - start_move
-                if duration > self.longest_tension['moves']:
-                    self.longest_tension = {
-                        'moves': duration,
-                        'squares': f"{tension_pair[0]}-{tension_pair[1]}",
-                        'startMove': start_move,
-                        'endMove': move_num + 1
-                    }
-
-        self.current_tensions = new_tensions
-
-    def _format_results(self) -> Dict[str, Any]:
-        """Format analysis results as JSON-serializable dict."""
+            # Track enemy territory invasion, most attacked square and tension
+            self.tracker.ply(move_num, move_san)
+
         return {
             'white': self.white,
             'black': self.black,
-            'enemyTerritory': {
-                'whitePiecesInEnemy': len(self.white_pieces_in_enemy),
-                'blackPiecesInEnemy': len(self.black_pieces_in_enemy),
-                'whiteFirstInvasion': self.white_first_invasion,
-                'blackFirstInvasion': self.black_first_invasion
-            },
-            'mostAttackedSquare': self.most_attacked_square if self.most_attacked_square['square'] else None,
-            'longestTension': self.longest_tension if self.longest_tension['moves'] > 0 else None
+            **self.tracker.result()
         }
 
 
-def analyze_all_games(pgn_data: str) -> Dict[str, Any]:
+def game_task(game: chess.pgn.Game) -> Tuple[str, bool, List[str]]:
+    """The compact (fen, chess960, uci_moves) task a worker replays a game from."""
+    board = game.board()
+    return board.fen(), board.chess960, [move.uci() for move in game.mainline_moves()]
+
+
+def analyze_game_task(task: Tuple[str, bool, List[str]]) -> Dict[str, Any]:
+    """
+    Replay one game inside a worker process and return its tactics
+    (everything but the player names and gameIndex, added by the caller).
+    """
+    fen, chess960, uci_moves = task
+    board = chess.Board(fen, chess960=chess960)
+    tracker = TacticalTracker(board)
+    for move_num, uci in enumerate(uci_moves):
+        move = chess.Move.from_uci(uci)
+        move_san = board.san(move)
+        board.push(move)
+        tracker.ply(move_num, move_san)
+    return tracker.result()
+
+
+def iter_game_analyses(games: Iterator[Tuple[int, PgnGame]], profiler: Optional[StageProfiler] = None,
+                       reporter: Optional[ProgressReporter] = None,
+                       pool: Optional[multiprocessing.pool.Pool] = None,
+                       workers: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze games as they are read, yielding them in input order.
+
+    Args:
+        games: (gameIndex, game) pairs, read lazily from stdin or an indexed --pgn
+        profiler: Optional stage profiler (pgnParse and analysis stages)
+        reporter: Optional progress reporter, replaces the per-game log lines
+        pool: Optional process pool of `workers` processes to replay games in.
+            Only a small window of games is in flight at a time, so memory
+            use stays flat in --stream mode.
+
+    Yields:
+        Analysis dict for each game (games that fail to analyze are skipped)
+    """
+    def finished(game_index, pgn, plies, analyze):
+        game_data = None
+        try:
+            with timed(profiler, 'analysis'):
+                game_data = analyze()
+            game_data['gameIndex'] = game_index
+
+        except Exception as e:
+            print(f"⚠️  Error analyzing game {game_index + 1}: {e}", file=sys.stderr)
+
+        if reporter is not None:
+            status = 'analyzed' if game_data is not None else 'skipped'
+            reporter.finished(game_index, plies, status, pgn.headers.get('GameId'))
+        return game_data
+
+    def resolve(game_index, pgn, plies, pending_result):
+        return finished(game_index, pgn, plies, lambda: {
+            'white': pgn.headers.get("White", "Unknown"),
+            'black': pgn.headers.get("Black", "Unknown"),
+            **pending_result.get()
+        })
+
+    window = workers * 2
+    # Results are collected in submission order, so games come back in gameIndex order
+    pending = collections.deque()
+
+    while True:
+        # Parse the next game
+        with timed(profiler, 'pgnParse'):
+            game_index, pgn = next(games, (None, None))
+        if pgn is None:
+            break
+
+        if reporter is None:
+            print(f"🔍 Analyzing game {game_index + 1}...", file=sys.stderr)
+
+        plies = None
+        if pool is None:
+            if reporter is not None:
+                plies = sum(1 for _ in pgn.mainline_moves())
+                reporter.queued(plies)
+            game_data = finished(game_index, pgn, plies, TacticalAnalyzer(pgn).analyze)
+            if game_data is not None:
+                yield game_data
+        else:
+            task = game_task(pgn)
+            if reporter is not None:
+                plies = len(task[2])
+                reporter.queued(plies)
+            pending.append((game_index, pgn, plies, pool.apply_async(analyze_game_task, (task,))))
+            while len(pending) > window:
+                game_data = resolve(*pending.popleft())
+                if game_data is not None:
+                    yield game_data
+
+    while pending:
+        game_data = resolve(*pending.popleft())
+        if game_data is not None:
+            yield game_data
+
+
+def performance_meta(profiler: Optional[StageProfiler], total_games: int) -> Optional[Dict[str, Any]]:
+    """The meta block for --profile, or None when profiling is off."""
+    if profiler is None:
+        return None
+    return {'performance': {**profiler.result(), 'games': total_games}}
+
+
+def analyze_all_games(games: Iterator[Tuple[int, PgnGame]], profiler: Optional[StageProfiler] = None,
+                      reporter: Optional[ProgressReporter] = None,
+                      pool: Optional[multiprocessing.pool.Pool] = None,
+                      workers: int = 1) -> Dict[str, Any]:
     """
     Analyze all games in PGN data.
 
     Args:
-        pgn_data: String containing PGN game data
+        games: (gameIndex, game) pairs from stdin or an indexed --pgn
+        profiler: Optional stage profiler, reported as meta.performance
+        reporter: Optional progress reporter for JSON-lines progress events
+        pool: Optional process pool of `workers` processes to replay games in
 
     Returns:
         Dictionary with analysis for all games
     """
     games_data = []
-    game_count = 0
-
-    # Parse games
-    pgn = chess.pgn.read_game(sys.stdin)
+    summary = TacticsSummary()
 
-    while pgn is not None:
-        game_count += 1
-        print(f"🔍 Analyzing game {game_count}...", file=sys.stderr)
+    for game_data in iter_game_analyses(games, profiler, reporter, pool, workers):
+        games_data.append(game_data)
+        with timed(profiler, 'summary'):
+            summary.add(game_data)
 
-        try:
-            analyzer = TacticalAnalyzer(pgn)
-            game_data = analyzer.analyze()
-            game_data['gameIndex'] = game_count - 1
-            games_data.append(game_data)
-
-        except Exception as e:
-            print(f"⚠️  Error analyzing game {game_count}: {e}", file=sys.stderr)
+    with timed(profiler, 'summary'):
+        result = summary.result()
 
-        # Read next game
-        pgn = chess.pgn.read_game(sys.stdin)
+    results = {
+        'games': games_data,
+        'summary': result
+    }
+    meta = performance_meta(profiler, result['totalGames'])
+    if meta is not None:
+        results['meta'] = meta
+    return results
 
-    # Calculate summary statistics and chicken awards
-    summary = {
-        'totalGames': len(games_data),
 
-        # Chicken Award 1: Homebody - Least pieces in enemy territory
-        'homebody': max(
-            games_data,
-            key=lambda g: g['enemyTerritory']['whitePiecesInEnemy'] + g['enemyTerritory']['blackPiecesInEnemy']
-        ) if games_data else None,
+def stream_all_games(games: Iterator[Tuple[int, PgnGame]], profiler: Optional[StageProfiler] = None,
+                     reporter: Optional[ProgressReporter] = None,
+                     pool: Optional[multiprocessing.pool.Pool] = None,
+                     workers: int = 1) -> Dict[str, Any]:
+    """
+    Analyze games as they are read and print each result as a JSON line,
+    followed by a trailing summary line. Memory use stays flat.
 
-        # Chicken Award 2: Late Bloomer - Waited longest to invade
-        'lateBlocker': None,
+    Returns:
+        The summary dict
+    """
+    summary = TacticsSummary()
 
-        # Award: Most attacked square across all games
-        'mostAttackedSquareGame': max(
-            games_data,
-            key=lambda g: g['mostAttackedSquare']['attackers'] if g['mostAttackedSquare'] else 0
-        ) if games_data else None,
-    }
+    for game_data in iter_game_analyses(games, profiler, reporter, pool, workers):
+        with timed(profiler, 'summary'):
+            summary.add(game_data)
+        with timed(profiler, 'output'):
+            print(json.dumps(game_data), flush=True)
 
-    # Find the player (white or black) who waited longest to invade
-    latest_invasion = 0
-    latest_game = None
-    latest_player = None
-
-    for game in games_data:
-        white_invasion = game['enemyTerritory']['whiteFirstInvasion']
-        black_invasion = game['enemyTerritory']['blackFirstInvasion']
-
-        if white_invasion and white_invasion > latest_invasion:
-            latest_invasion = white_invasion
-            latest_game = game
-            latest_player = 'white'
-
-        if black_invasion and black_invasion > latest_invasion:
-            latest_invasion = black_invasion
-            latest_game = game
-            latest_player = 'black'
-
-    if latest_game:
-        summary['lateBloomer'] = {
-            'white': latest_game['white'],
-            'black': latest_game['black'],
-            'player': latest_player,
-            'moveNumber': latest_invasion,
-            'gameIndex': latest_game['gameIndex']
-        }
+    with timed(profiler, 'summary'):
+        result = summary.result()
 
-    # Find the player with FEWEST pieces in enemy territory (homebody)
-    # Skip games where neither player invaded (empty games)
-    min_invasion = float('inf')
-    homebody_game = None
-    homebody_player = None
-
-    for game in games_data:
-        white_pieces = game['enemyTerritory']['whitePiecesInEnemy']
-        black_pieces = game['enemyTerritory']['blackPiecesInEnemy']
-
-        # Skip games where neither player invaded
-        if white_pieces == 0 and black_pieces == 0:
-            continue
-
-        if white_pieces < min_invasion:
-            min_invasion = white_pieces
-            homebody_game = game
-            homebody_player = 'white'
-
-        if black_pieces < min_invasion:
-            min_invasion = black_pieces
-            homebody_game = game
-            homebody_player = 'black'
-
-    if homebody_game:
-        summary['homebody'] = {
-            'white': homebody_game['white'],
-            'black': homebody_game['black'],
-            'player': homebody_player,
-            'piecesInEnemy': min_invasion,
-            'gameIndex': homebody_game['gameIndex']
-        }
+    record = {'summary': result}
+    meta = performance_meta(profiler, result['totalGames'])
+    if meta is not None:
+        record['meta'] = meta
+    print(json.dumps(record), flush=True)
+    return result
 
-    # Find the player who invaded EARLIEST (quick draw)
-    earliest_invasion = float('inf')
-    earliest_game = None
-    earliest_player = None
-
-    for game in games_data:
-        white_invasion = game['enemyTerritory']['whiteFirstInvasion']
-        black_invasion = game['enemyTerritory']['blackFirstInvasion']
-
-        if white_invasion and white_invasion < earliest_invasion:
-            earliest_invasion = white_invasion
-            earliest_game = game
-            earliest_player = 'white'
-
-        if black_invasion and black_invasion < earliest_invasion:
-            earliest_invasion = black_invasion
-            earliest_game = game
-            earliest_player = 'black'
-
-    if earliest_game:
-        summary['quickDraw'] = {
-            'white': earliest_game['white'],
-            'black': earliest_game['black'],
-            'player': earliest_player,
-            'moveNumber': earliest_invasion,
-            'gameIndex': earliest_game['gameIndex']
-        }
 
-    # Find the game with longest tension
-    longest_tension_duration = 0
-    longest_tension_game = None
-
-    for game in games_data:
-        if game.get('longestTension') and game['longestTension']['moves'] > longest_tension_duration:
-            longest_tension_duration = game['longestTension']['moves']
-            longest_tension_game = game
-
-    if longest_tension_game:
-        tension_data = longest_tension_game['longestTension']
-        summary['longestTension'] = {
-            'white': longest_tension_game['white'],
-            'black': longest_tension_game['black'],
-            'moves': tension_data['moves'],
-            'squares': tension_data['squares'],
-            'startMove': tension_data['startMove'],
-            'endMove': tension_data['endMove'],
-            'gameIndex': longest_tension_game['gameIndex']
-        }
+def merge_shards(argv: List[str]) -> None:
+    """merge: combine the --shard outputs of a round into the output of the whole round."""
+    parser = argparse.ArgumentParser(prog='analyze-tactics.py merge', description='Merge analyze-tactics.py --shard outputs into the output of the whole round')
+    parser.add_argument('outputs', nargs='+', help='JSON outputs of the shards')
+    args = parser.parse_args(argv)
 
-    return {
-        'games': games_data,
-        'summary': summary
-    }
+    try:
+        games_data = merge_games([output['games'] for output in load_shard_outputs(args.outputs)])
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
 
+    # Fold the games in gameIndex order, as an unsharded run does
+    summary = TacticsSummary()
+    for game_data in games_data:
+        summary.add(game_data)
+
+    print(f"🧩 Merged {len(args.outputs)} shard(s): {len(games_data)} game(s)", file=sys.stderr)
+    print(json.dumps({'games': games_data, 'summary': summary.result()}, indent=2))
+
+
+def main(argv=None):
+    """Main entry point (command line arguments default to sys.argv)."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['merge']:
+        merge_shards(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(description='Tactical analysis of chess PGN')
+    parser.add_argument('--stream', action='store_true', help='Read games incrementally and emit one JSON line per game, then a summary line')
+    parser.add_argument('--profile', action='store_true', help='Add per-stage timings to the output (meta.performance)')
+    parser.add_argument('--profile-dump', default=None, help='Also write a cProfile dump to this file')
+    parser.add_argument('--progress', choices=['log', 'json'], default='log', help='Progress on stderr: a line per game, or JSON-lines events with a throughput ETA (default: log)')
+    parser.add_argument('--progress-fd', type=int, default=None, help='Write JSON-lines progress events to this file descriptor (implies --progress json)')
+    parser.add_argument('--workers', type=int, default=1, help='Number of processes replaying games (default: 1)')
+    parser.add_argument('--pgn', default=None, help='Read games from this PGN file instead of stdin (indexed, for --games/--players/--range)')
+    parser.add_argument('--games', default=None, help='Only these comma-separated game IDs (needs --pgn)')
+    parser.add_argument('--players', default=None, help='Only games of these comma-separated players (needs --pgn)')
+    parser.add_argument('--range', default=None, help='Only games N-M of the file, 1-based and inclusive, or N- to the end (needs --pgn)')
+    parser.add_argument('--shard', default=None, help='Only shard i/N of the games (by a stable hash of the gameId); combine the shard outputs with the merge subcommand')
+    args = parser.parse_args(argv)
 
-def main():
-    """Main entry point."""
     print("🎯 Chess Tactical Analysis\n", file=sys.stderr)
 
     try:
-        # Analyze all games from stdin
-        results = analyze_all_games(sys.stdin)
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    selection = select_input_games(parser, args)
+    if shard is not None and selection is not None:
+        selection = shard_entries(selection, shard)
+
+    profiler = StageProfiler() if args.profile or args.profile_dump else None
+    main_profile = cProfile.Profile() if args.profile_dump else None
+    if main_profile is not None:
+        main_profile.enable()
 
-        # Output JSON to stdout
-        print(json.dumps(results, indent=2))
+    reporter = None
+    if args.progress_fd is not None:
+        reporter = ProgressReporter(os.fdopen(args.progress_fd, 'w'))
+    elif args.progress == 'json':
+        reporter = ProgressReporter(sys.stderr)
+
+    pool = multiprocessing.Pool(args.workers) if args.workers > 1 else None
+
+    try:
+        if selection is not None:
+            # Indexed games from --pgn, read from a memory map as they are needed
+            games = iter_indexed_games(args.pgn, selection)
+            if reporter is not None:
+                reporter.total_games = len(selection)
+        elif args.stream or reporter is None:
+            games = enumerate(iter_games(sys.stdin))
+        else:
+            # Everything is read up front anyway, so count the games for the ETA
+            pgn_text = sys.stdin.read()
+            reporter.total_games = pgn_text.count('[Event ')
+            games = enumerate(iter_games(io.StringIO(pgn_text)))
+
+        if shard is not None and selection is None:
+            # Games from stdin outside the shard are dropped as they are read
+            games = iter_shard_games(games, shard)
+            if reporter is not None:
+                reporter.total_games = None
+
+        if reporter is not None:
+            reporter.start()
+
+        if args.stream:
+            summary = stream_all_games(games, profiler, reporter, pool, args.workers)
+        else:
+            # Analyze all games from stdin or the --pgn selection
+            results = analyze_all_games(games, profiler, reporter, pool, args.workers)
+
+            # Output JSON to stdout
+            print(json.dumps(results, indent=2))
+
+            summary = results['summary']
+
+        if reporter is not None:
+            reporter.done()
 
         # Print summary to stderr
-        summary = results['summary']
         print(f"\n✅ Analysis complete!", file=sys.stderr)
         print(f"📊 Games analyzed: {summary['totalGames']}", file=sys.stderr)
 
@@ -394,10 +381,18 @@ def main():
             player_name = lb['white'] if lb['player'] == 'white' else lb['black']
             print(f"🐢 Late Bloomer: {player_name} (first invasion on move {lb['moveNumber']})", file=sys.stderr)
 
+        if main_profile is not None:
+            main_profile.disable()
+            main_profile.dump_stats(args.profile_dump)
+
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    finally:
+        if pool is not None:
+            pool.terminate()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Analyzer Benchmarks
+===================
+
+Measures the throughput of the Python analyzers without a real Stockfish.
+Games are generated synthetically from a fixed seed, and engine
+evaluations come from the deterministic fake UCI engine in
+scripts/benchmark/fake-uci-engine.py, so runs are repeatable on any
+machine.
+
+Benchmarks:
+    pgnParse         analysis.pgn_reader.read_game over the games' PGN text
+    analyzeGame      analyze-pgn.py analyze_game (replay, engine calls, metrics)
+    tactics          analyze-tactics.py TacticalAnalyzer.analyze
+    summary          round awards (RoundAwards) and TacticsSummary
+
+For each one it reports games/sec, positions/sec, engine calls and peak
+Python memory (tracemalloc, measured in a separate untimed pass).
+
+Requirements:
+    pip install python-chess
+
+Usage:
+    python benchmark-analyzers.py > results.json
+    python benchmark-analyzers.py --games 100 --latency-ms 2 --repeat 3
+    python benchmark-analyzers.py --save-baseline scripts/benchmark/baselines/local.json
+    python benchmark-analyzers.py --baseline scripts/benchmark/baselines/local.json
+
+With --baseline, every benchmark whose games/sec dropped by more than
+--tolerance (default 20%) is reported and the exit code is 1.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+import importlib.util
+import chess
+import chess.pgn
+from analysis.engine import UciEngine
+from analysis.pgn_reader import read_game
+from analysis.awards import RoundAwards
+from analysis import metrics as batch_metrics
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_ENGINE_PATH = os.path.join(SCRIPTS_DIR, 'benchmark', 'fake-uci-engine.py')
+
+
+def load_script(filename):
+    """Import one of the hyphenated analyzer scripts as a module."""
+    path = os.path.join(SCRIPTS_DIR, filename)
+    spec = importlib.util.spec_from_file_location(filename[:-3].replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_games(count, seed, min_plies=40, max_plies=120):
+    """
+    Build count random legal games. Captures are preferred a third of the
+    time so material changes hands and the evals swing like real games.
+    """
+    rng = random.Random(seed)
+    games = []
+    for game_index in range(count):
+        board = chess.Board()
+        game = chess.pgn.Game()
+        game.headers['White'] = f'White {game_index}'
+        game.headers['Black'] = f'Black {game_index}'
+        game.headers['GameId'] = f'bench{game_index:04d}'
+
+        node = game
+        for _ in range(rng.randint(min_plies, max_plies)):
+            if board.is_game_over():
+                break
+            moves = sorted(board.legal_moves, key=lambda move: move.uci())
+            captures = [move for move in moves if board.is_capture(move)]
+            move = rng.choice(captures if captures and rng.random() < 0.33 else moves)
+            node = node.add_variation(move)
+            board.push(move)
+
+        game.headers['Result'] = board.result()
+        games.append(game)
+    return games
+
+
+def count_positions(games):
+    """Positions visited when replaying every game (start position included)."""
+    return sum(len(list(game.mainline_moves())) + 1 for game in games)
+
+
+def bench_pgn_parse(pgn_text):
+    """Read every game back from its PGN text."""
+    handle = io.StringIO(pgn_text)
+    games = []
+    game = read_game(handle)
+    while game is not None:
+        games.append(game)
+        game = read_game(handle)
+    return games, 0
+
+
+def bench_analyze_game(analyze_pgn, games, engine_command, depth):
+    """Run analyze_game over every game with one engine session."""
+    engine = UciEngine(engine_command, depth)
+    try:
+        analyses = []
+        for game_index, game in enumerate(games):
+            analysis = analyze_pgn.analyze_game(game, engine, depth)
+            analyses.append({
+                'gameIndex': game_index,
+                'gameId': game.headers['GameId'],
+                'white': game.headers['White'],
+                'black': game.headers['Black'],
+                **analysis
+            })
+        return analyses, engine.stats()['searches']
+    finally:
+        engine.close()
+
+
+def bench_tactics(analyze_tactics, games):
+    """Run TacticalAnalyzer over every game."""
+    results = []
+    for game_index, game in enumerate(games):
+        game_data = analyze_tactics.TacticalAnalyzer(game).analyze()
+        game_data['gameIndex'] = game_index
+        results.append(game_data)
+    return results, 0
+
+
+def bench_summary(analyze_tactics, analyses, tactics_results):
+    """Fold the per-game results into the round summaries."""
+    awards = RoundAwards()
+    tactics_summary = analyze_tactics.TacticsSummary()
+    for game_data in analyses:
+        awards.add(game_data)
+    for game_data in tactics_results:
+        tactics_summary.add(game_data)
+    return (awards.result(), tactics_summary.result()), 0
+
+
+def measure(run, repeat):
+    """
+    Time run() repeat times (best run wins), then run it once more under
+    tracemalloc for the peak memory. Returns (result, seconds, peak_bytes, engine_calls).
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result, engine_calls = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, best, peak, engine_calls
+
+
+def report(games, positions, seconds, peak, engine_calls):
+    return {
+        'games': games,
+        'positions': positions,
+        'seconds': round(seconds, 4),
+        'gamesPerSec': round(games / seconds, 2) if seconds > 0 else None,
+        'positionsPerSec': round(positions / seconds, 1) if seconds > 0 else None,
+        'engineCalls': engine_calls,
+        'peakMemoryMB': round(peak / (1024 * 1024), 2)
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return a list of human-readable regressions (games/sec drops beyond tolerance)."""
+    regressions = []
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous or not previous.get('gamesPerSec') or not current.get('gamesPerSec'):
+            continue
+        ratio = current['gamesPerSec'] / previous['gamesPerSec']
+        if ratio < 1 - tolerance:
+            regressions.append(f"{name}: {current['gamesPerSec']} games/s vs baseline {previous['gamesPerSec']} ({(1 - ratio) * 100:.0f}% slower)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Python analyzers with a fake UCI engine')
+    parser.add_argument('--games', type=int, default=40, help='Number of synthetic games (default: 40)')
+    parser.add_argument('--seed', type=int, default=4545, help='Seed for the synthetic games (default: 4545)')
+    parser.add_argument('--depth', type=int, default=15, help='Search depth sent to the engine (default: 15)')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated engine time per search (default: 0)')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed runs per benchmark, the best one is kept (default: 1)')
+    parser.add_argument('--baseline', default=None, help='Compare against a saved baseline JSON and fail on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed games/sec drop vs the baseline (default: 0.2)')
+    parser.add_argument('--save-baseline', default=None, help='Write the results to this baseline JSON file')
+    args = parser.parse_args()
+
+    analyze_pgn = load_script('analyze-pgn.py')
+    analyze_tactics = load_script('analyze-tactics.py')
+
+    engine_command = [sys.executable, FAKE_ENGINE_PATH, '--latency-ms', str(args.latency_ms)]
+
+    print(f"\n⏱️  Analyzer Benchmarks", file=sys.stderr)
+    print(f"🎲 {args.games} synthetic games (seed {args.seed}) | depth {args.depth} | latency {args.latency_ms} ms | repeat {args.repeat}", file=sys.stderr)
+
+    games = generate_games(args.games, args.seed)
+    positions = count_positions(games)
+
+    benchmarks = {}
+
+    pgn_text = ''.join(f"{game}\n\n" for game in games)
+    _, seconds, peak, engine_calls = measure(lambda: bench_pgn_parse(pgn_text), args.repeat)
+    benchmarks['pgnParse'] = report(len(games), positions, seconds, peak, engine_calls)
+
+    analyses, seconds, peak, engine_calls = measure(
+        lambda: bench_analyze_game(analyze_pgn, games, engine_command, args.depth), args.repeat
+    )
+    benchmarks['analyzeGame'] = report(len(games), positions, seconds, peak, engine_calls)
+
+    tactics_results, seconds, peak, engine_calls = measure(
+        lambda: bench_tactics(analyze_tactics, games), args.repeat
+    )
+    benchmarks['tactics'] = report(len(games), positions, seconds, peak, engine_calls)
+
+    _, seconds, peak, engine_calls = measure(
+        lambda: bench_summary(analyze_tactics, analyses, tactics_results), args.repeat
+    )
+    benchmarks['summary'] = report(len(games), positions, seconds, peak, engine_calls)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'pythonChess': chess.__version__,
+            'numpy': batch_metrics.available(),
+            'platform': platform.platform(),
+            'games': args.games,
+            'seed': args.seed,
+            'depth': args.depth,
+            'latencyMs': args.latency_ms,
+            'repeat': args.repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'benchmarks': benchmarks
+    }
+
+    print('', file=sys.stderr)
+    for name, result in benchmarks.items():
+        print(f"📈 {name:<12} {result['gamesPerSec']:>10} games/s | {result['positionsPerSec']:>12} positions/s | "
+              f"{result['engineCalls']:>6} engine calls | {result['peakMemoryMB']:>7} MB peak", file=sys.stderr)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ Slower than baseline {args.baseline}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"   {regression}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"\n✅ Within {args.tolerance * 100:.0f}% of baseline {args.baseline}", file=sys.stderr)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"💾 Baseline saved to {args.save_baseline}", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
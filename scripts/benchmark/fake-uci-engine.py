@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Fake UCI Engine
+===============
+
+Deterministic stand-in for Stockfish, used by benchmark-analyzers.py to
+measure analyzer throughput without a real engine.
+
+Evaluations are material balance plus hash-derived noise, so the same
+position and depth always get the same score and games produce realistic
+mixes of good moves, blunders and the occasional mate score. Each search
+can be slowed down with --latency-ms to model engine time.
+
+Requirements:
+    pip install python-chess
+
+Usage:
+    python fake-uci-engine.py [--latency-ms 5] [--name "FakeFish 1.0"]
+"""
+
+import sys
+import time
+import hashlib
+import argparse
+import chess
+
+PIECE_VALUES = {chess.PAWN: 100, chess.KNIGHT: 300, chess.BISHOP: 300, chess.ROOK: 500, chess.QUEEN: 900}
+
+
+def material_balance(board):
+    """Material from white's perspective, in centipawns."""
+    balance = 0
+    for piece_type, value in PIECE_VALUES.items():
+        balance += value * (len(board.pieces(piece_type, chess.WHITE)) - len(board.pieces(piece_type, chess.BLACK)))
+    return balance
+
+
+def search(board, depth):
+    """
+    Return (score, nodes) for the position. Score is a UCI score string
+    ('cp N' or 'mate N') from the side to move's perspective.
+    """
+    if board.is_checkmate():
+        return 'mate 0', 0
+    if board.is_stalemate() or board.is_insufficient_material():
+        return 'cp 0', 1
+
+    digest = int(hashlib.sha1(f"{board.epd()}|{depth}".encode()).hexdigest(), 16)
+    nodes = (1 << min(depth, 24)) + digest % 5000
+
+    sign = 1 if board.turn == chess.WHITE else -1
+    if digest % 97 == 0:
+        # Occasional forced mate for whoever is ahead on material
+        mate_in = digest // 97 % 9 + 1
+        return f"mate {mate_in if material_balance(board) * sign >= 0 else -mate_in}", nodes
+
+    score = material_balance(board) + digest % 121 - 60
+    return f"cp {score * sign}", nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deterministic fake UCI engine for benchmarks')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated time per search in milliseconds')
+    parser.add_argument('--name', default='FakeFish 1.0', help='Engine name reported to the GUI')
+    args = parser.parse_args()
+
+    board = chess.Board()
+    chess960 = False
+
+    def send(line):
+        sys.stdout.write(line + '\n')
+        sys.stdout.flush()
+
+    for line in sys.stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+        command = tokens[0]
+
+        if command == 'uci':
+            send(f"id name {args.name}")
+            send("id author lichess4545-stats")
+            send("option name Threads type spin default 1 min 1 max 512")
+            send("option name Hash type spin default 16 min 1 max 33554432")
+            send("option name UCI_Chess960 type check default false")
+            send("uciok")
+        elif command == 'isready':
+            send("readyok")
+        elif command == 'setoption' and tokens[2:3] == ['UCI_Chess960']:
+            chess960 = tokens[-1] == 'true'
+        elif command == 'position':
+            if 'moves' in tokens:
+                moves_at = tokens.index('moves')
+            else:
+                moves_at = len(tokens)
+            if tokens[1] == 'startpos':
+                board = chess.Board(chess960=chess960)
+            else:
+                board = chess.Board(' '.join(tokens[2:moves_at]), chess960=chess960)
+            for uci in tokens[moves_at + 1:]:
+                board.push_uci(uci)
+        elif command == 'go':
+            depth = int(tokens[tokens.index('depth') + 1]) if 'depth' in tokens else 10
+            if args.latency_ms:
+                time.sleep(args.latency_ms / 1000)
+
+            score, nodes = search(board, depth)
+            best = min((move.uci() for move in board.legal_moves), default=None)
+            elapsed = max(1, round(args.latency_ms))
+            pv = f" pv {best}" if best else ''
+            send(f"info depth {depth} seldepth {depth} multipv 1 score {score} nodes {nodes} nps {nodes * 1000 // elapsed} time {elapsed}{pv}")
+            send(f"bestmove {best or '(none)'}")
+        elif command == 'quit':
+            break
+        # ucinewgame, other options and stop need no response
+
+
+if __name__ == '__main__':
+    main()
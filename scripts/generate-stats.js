@@ -29,6 +29,20 @@ function getPythonCommand() {
   return 'python3';
 }
 
+// Route an analyzer through the warm analysis daemon (scripts/analysis-daemon.py serve) when one is running
+function getAnalyzerCommand(script, args) {
+  const daemonSocket = path.join(__dirname, '..', 'data', 'analysis-daemon.sock');
+  if (fs.existsSync(daemonSocket)) {
+    return `${getPythonCommand()} scripts/analysis-daemon.py run ${script} ${args}`;
+  }
+  return `${getPythonCommand()} scripts/${script} ${args}`;
+}
+
+// In CI, \r progress bars turn into one huge log line, so ask for JSON-lines progress events
+function getProgressFlag() {
+  return process.env.CI ? ' --progress json' : '';
+}
+
 // Parse command line arguments
 function parseArgs() {
   const args = process.argv.slice(2);
@@ -36,6 +50,7 @@ function parseArgs() {
     round: null,
     season: null, // Required parameter
     analyze: false, // Stockfish analysis flag
+    analysis: null, // Precomputed Stockfish analysis (analyze-pgn.py --batch output)
     help: false
   };
 
@@ -48,6 +63,9 @@ function parseArgs() {
       i++;
     } else if (args[i] === '--analyze' || args[i] === '-a') {
       options.analyze = true;
+    } else if (args[i] === '--analysis') {
+      options.analysis = args[i + 1];
+      i++;
     } else if (args[i] === '--help' || args[i] === '-h') {
       options.help = true;
     }
@@ -68,11 +86,14 @@ Options:
   --round, -r <number>   Round number to generate stats for (required)
   --season, -s <number>  Season number (required)
   --analyze, -a          Run Stockfish analysis (optional, requires python-chess)
+  --analysis <file>      Use this Stockfish analysis instead of running it
+                         (a round output of analyze-pgn.py --batch)
   --help, -h             Show this help message
 
 Examples:
   node scripts/generate-stats.js --round 1 --season 46
   node scripts/generate-stats.js --round 1 --season 46 --analyze
+  node scripts/generate-stats.js --round 1 --season 46 --analysis data/season-46-round-1.analysis.json
 
 Workflow:
   1. Fetch season data:    node scripts/fetch-lichess-season.js --season=46
@@ -109,6 +130,25 @@ async function fetchPGN(roundNumber, seasonNumber) {
   return pgnData;
 }
 
+// Log the per-stage timings a Python analyzer reports with --profile (meta.performance)
+function logPerformance(label, meta) {
+  const performance = meta && meta.performance;
+  if (!performance) return;
+
+  const stages = Object.entries(performance.stages || {})
+    .map(([name, stage]) => `${name} ${stage.wallSeconds.toFixed(1)}s`)
+    .join(' | ');
+  console.log(`⏱️  ${label}: ${performance.wallSeconds.toFixed(1)}s wall, ${performance.cpuSeconds.toFixed(1)}s CPU (${stages})`);
+
+  if (performance.engine) {
+    const { searches, avgSearchMs, engineMsPerPly } = performance.engine;
+    console.log(`🔎 Engine: ${searches} searches, ${avgSearchMs}ms avg search, ${engineMsPerPly}ms per ply`);
+  }
+  if (performance.cache) {
+    console.log(`💾 Eval cache: ${performance.cache.hitRate}% hit rate`);
+  }
+}
+
 // Run tactical analysis on parsed games (pins, forks, skewers)
 function analyzeTactics(parsedGames) {
   const startTime = Date.now();
@@ -121,7 +161,7 @@ function analyzeTactics(parsedGames) {
 
     // Run Python tactical analyzer
     const tacticsOutput = execSync(
-      `${getPythonCommand()} scripts/analyze-tactics.py`,
+      getAnalyzerCommand('analyze-tactics.py', `--profile${getProgressFlag()}`),
       {
         input: normalizedPgn,
         encoding: 'utf-8',
@@ -135,6 +175,7 @@ function analyzeTactics(parsedGames) {
     const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
 
     console.log(`✅ Tactical analysis complete in ${elapsed}s`);
+    logPerformance('Tactics stages', tacticsData.meta);
 
     return tacticsData;
 
@@ -148,18 +189,23 @@ function analyzeTactics(parsedGames) {
 }
 
 // Run Stockfish analysis on parsed games
-function analyzeGames(parsedGames) {
+function analyzeGames(parsedGames, roundNumber, seasonNumber) {
   const startTime = Date.now();
 
   try {
     // Extract normalized PGN from parsed games
     const normalizedPgn = parsedGames.map(g => g.pgn).join('\n\n');
 
-    console.log('\n🔬 Running Stockfish analysis (accuracy, blunders)...');
+    console.log('\n🔬 Running Stockfish and tactical analysis (accuracy, blunders, tactics)...');
 
-    // Run Python analyzer (depth 15, analyze all moves for maximum accuracy)
+    // Journal finished games so an interrupted or repeated run only analyzes new games
+    const journalFile = path.join('data', `season-${seasonNumber}-round-${roundNumber}.analysis.jsonl`);
+    // Keep the evals of each game so metric changes can be re-run with --rescore
+    const evalsFile = path.join('data', `season-${seasonNumber}-round-${roundNumber}.evals.bin`);
+
+    // Run Python analyzer (depth 15, analyze all moves for maximum accuracy, skip opening book moves, tactics in the same replay)
     const analysisOutput = execSync(
-      `${getPythonCommand()} scripts/analyze-pgn.py --depth 15 --sample 1`,
+      getAnalyzerCommand('analyze-pgn.py', `--depth 15 --sample 1 --book --tactics --profile --journal ${journalFile} --evals ${evalsFile}${getProgressFlag()}`),
       {
         input: normalizedPgn,
         encoding: 'utf-8',
@@ -174,6 +220,7 @@ function analyzeGames(parsedGames) {
 
     console.log(`✅ Stockfish analysis complete in ${elapsed}s`);
     console.log(`📊 Games analyzed: ${analysisData.games.length}`);
+    logPerformance('Analysis stages', analysisData.meta);
 
     if (analysisData.summary.accuracyKing) {
       const king = analysisData.summary.accuracyKing;
@@ -192,6 +239,17 @@ function analyzeGames(parsedGames) {
   }
 }
 
+// Load a round's Stockfish analysis written by analyze-pgn.py --batch
+function loadAnalysis(analysisFile) {
+  console.log(`\n🔬 Loading Stockfish and tactical analysis from ${analysisFile}...`);
+
+  const analysisData = JSON.parse(fs.readFileSync(analysisFile, 'utf-8'));
+
+  console.log(`📊 Games analyzed: ${analysisData.games.length}`);
+
+  return analysisData;
+}
+
 // Main execution
 async function main() {
   const options = parseArgs();
@@ -230,20 +288,29 @@ async function main() {
       });
     }
 
-    // Step 3: Run tactical analysis (optional - requires python-chess)
+    // Step 3: Run Stockfish analysis (optional - slow!). The same run replays
+    // each game for the tactical analysis too, so it needs no second call.
+    let analysisData = null;
     let tacticsData = null;
-    try {
-      console.log('');
-      tacticsData = analyzeTactics(parseResults.valid);
-    } catch (error) {
-      console.log('\n⚠️  Skipping tactical analysis (python-chess not available - optional)');
-      console.log(`   Error: ${error.message}`);
+    if (options.analysis) {
+      analysisData = loadAnalysis(options.analysis);
+    } else if (options.analyze) {
+      analysisData = analyzeGames(parseResults.valid, options.round, options.season);
+    }
+    if (analysisData) {
+      tacticsData = analysisData.tactics;
+      delete analysisData.tactics;
     }
 
-    // Step 4: Run Stockfish analysis (optional - slow!)
-    let analysisData = null;
-    if (options.analyze) {
-      analysisData = analyzeGames(parseResults.valid);
+    // Step 4: Run tactical analysis on its own (optional - requires python-chess)
+    if (!tacticsData) {
+      try {
+        console.log('');
+        tacticsData = analyzeTactics(parseResults.valid);
+      } catch (error) {
+        console.log('\n⚠️  Skipping tactical analysis (python-chess not available - optional)');
+        console.log(`   Error: ${error.message}`);
+      }
     }
 
     // Step 5: Load team data (optional - for team statistics)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+PGN Indexer
+===========
+
+Builds (or refreshes) the byte-offset index of round PGN files, the
+sidecar the analyzers use to pick games with --pgn and --games/--players/
+--range (see analysis.pgn_index). The analyzers build a missing or stale
+index on their own; this script does it ahead of time and lists the games.
+
+Requirements:
+    pip install python-chess
+
+Usage:
+    python index-pgn.py data/season-46-round-1.pgn
+    python index-pgn.py --list data/season-46-round-*.pgn
+"""
+
+import sys
+import argparse
+from analysis.pgn_index import build_index, index_path, save_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the byte-offset index of PGN files')
+    parser.add_argument('pgn', nargs='+', help='PGN files to index')
+    parser.add_argument('--list', action='store_true', help='Print the indexed games (number, game ID, players, result)')
+    args = parser.parse_args()
+
+    for pgn_path in args.pgn:
+        try:
+            index = build_index(pgn_path)
+            save_index(index, index_path(pgn_path))
+        except OSError as e:
+            print(f"❌ {pgn_path}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"🗂️  {pgn_path}: {len(index['games'])} game(s) indexed in {index_path(pgn_path)}", file=sys.stderr)
+        if args.list:
+            for game in index['games']:
+                print(f"{game['index'] + 1:>4}  {game['gameId'] or '-':<10}  {game['white']} vs {game['black']}  {game['result'] or '*'}")
+
+
+if __name__ == '__main__':
+    main()
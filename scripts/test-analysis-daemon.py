@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the analysis daemon's warm session
+=======================================
+
+Starts analysis-daemon.py on a temporary socket with the fake UCI engine
+(scripts/benchmark/fake-uci-engine.py) and sends it analyze-pgn.py runs:
+
+1. A first run with given settings starts the engine
+2. The same settings again reuse the running engine session
+3. Different settings (--workers) restart it, and the next run reuses that
+4. Every run's output matches the first one with the same settings
+
+Exits with status 1 when a check fails.
+
+Requirements:
+    pip install python-chess
+
+Usage:
+    python scripts/test-analysis-daemon.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DAEMON_PATH = os.path.join(SCRIPTS_DIR, 'analysis-daemon.py')
+FAKE_ENGINE_PATH = os.path.join(SCRIPTS_DIR, 'benchmark', 'fake-uci-engine.py')
+REUSE_MESSAGE = 'Reusing the running engine session'
+
+PGN = '''[Event "Test"]
+[White "alice"]
+[Black "bob"]
+[GameId "test0001"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Nf6 4. Ng5 d5 5. exd5 Nxd5 6. Nxf7 Kxf7 7. Qf3+ Ke6 8. Nc3 1-0
+
+[Event "Test"]
+[White "carol"]
+[Black "dave"]
+[GameId "test0002"]
+[Result "0-1"]
+
+1. d4 Nf6 2. c4 g6 3. Nc3 Bg7 4. e4 d6 5. f3 O-O 6. Be3 e5 7. d5 Nh5 8. Qd2 Qh4+ 0-1
+'''
+
+
+def start_daemon(socket_path):
+    """Start the daemon and wait until its socket accepts connections."""
+    daemon = subprocess.Popen([sys.executable, DAEMON_PATH, '--socket', socket_path, 'serve'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while not os.path.exists(socket_path):
+        if daemon.poll() is not None or time.time() > deadline:
+            raise RuntimeError('analysis daemon did not start')
+        time.sleep(0.1)
+    return daemon
+
+
+def run_analysis(socket_path, workers):
+    """One analyze-pgn.py run through the daemon. Returns (stdout, stderr)."""
+    result = subprocess.run(
+        [sys.executable, DAEMON_PATH, '--socket', socket_path, 'run', 'analyze-pgn.py',
+         '--stockfish-path', FAKE_ENGINE_PATH, '--depth', '4', '--no-cache', '--workers', str(workers)],
+        input=PGN, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"analyze-pgn.py exited with {result.returncode}:\n{result.stderr}")
+    return result.stdout, result.stderr
+
+
+def main():
+    # (workers, expect the session to be reused)
+    runs = [(1, False), (1, True), (2, False), (2, True)]
+    failures = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, 'daemon.sock')
+        daemon = start_daemon(socket_path)
+        try:
+            outputs = {}
+            for number, (workers, expect_reuse) in enumerate(runs, 1):
+                stdout, stderr = run_analysis(socket_path, workers)
+                reused = REUSE_MESSAGE in stderr
+                status = '✅' if reused == expect_reuse else '❌'
+                print(f"{status} Run {number} (--workers {workers}): session {'reused' if reused else 'started'}, expected {'reuse' if expect_reuse else 'start'}")
+                if reused != expect_reuse:
+                    failures.append(f"run {number}")
+
+                if workers in outputs and outputs[workers] != stdout:
+                    print(f"❌ Run {number} (--workers {workers}): output differs from the first run")
+                    failures.append(f"run {number} output")
+                outputs.setdefault(workers, stdout)
+        finally:
+            subprocess.run([sys.executable, DAEMON_PATH, '--socket', socket_path, 'stop'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            daemon.wait(timeout=30)
+
+    if failures:
+        print(f"\n❌ Failed: {', '.join(failures)}")
+        sys.exit(1)
+    print('\n✅ The daemon keeps its engine session warm between runs')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test engine start-up errors
+===========================
+
+Runs analyze-pgn.py with engines that can't start: a path that doesn't
+exist and an engine that exits right away. Every mode that starts engines
+(one in-process engine, a worker pool, --autotune) must exit with status 1
+and "Error initializing Stockfish" well within the timeout, rather than
+hanging while a process pool respawns workers whose engine fails.
+
+Exits with status 1 when a check fails.
+
+Requirements:
+    pip install python-chess
+
+Usage:
+    python scripts/test-engine-errors.py
+"""
+
+import os
+import sys
+import tempfile
+import subprocess
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYZE_PGN_PATH = os.path.join(SCRIPTS_DIR, 'analyze-pgn.py')
+ERROR_MESSAGE = 'Error initializing Stockfish'
+TIMEOUT_SECONDS = 60
+
+PGN = '''[Event "Test"]
+[White "alice"]
+[Black "bob"]
+[GameId "test0001"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Nf6 4. Ng5 d5 5. exd5 Nxd5 6. Nxf7 Kxf7 7. Qf3+ Ke6 8. Nc3 Nb4 9. O-O c6 10. d4 Kd7 1-0
+'''
+
+MODES = [
+    ('1 worker', ['--no-cache', '--workers', '1']),
+    ('2 workers', ['--no-cache', '--workers', '2']),
+    ('--autotune', ['--autotune']),
+]
+
+
+def run_analysis(engine_path, options, tuning_path):
+    """One analyze-pgn.py run. Returns (exit code, stderr), or (None, '') on timeout."""
+    try:
+        result = subprocess.run(
+            [sys.executable, ANALYZE_PGN_PATH, '--stockfish-path', engine_path, '--depth', '4',
+             '--tuning', tuning_path, *options],
+            input=PGN, capture_output=True, text=True, timeout=TIMEOUT_SECONDS
+        )
+    except subprocess.TimeoutExpired:
+        return None, ''
+    return result.returncode, result.stderr
+
+
+def main():
+    failures = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        failing_engine = os.path.join(directory, 'failing-engine.sh')
+        with open(failing_engine, 'w') as f:
+            f.write('#!/bin/sh\nexit 1\n')
+        os.chmod(failing_engine, 0o755)
+        tuning_path = os.path.join(directory, 'engine-tuning.json')
+
+        engines = [
+            ('missing engine', os.path.join(directory, 'no-such-engine')),
+            ('engine that exits', failing_engine),
+        ]
+        for engine_name, engine_path in engines:
+            for mode_name, options in MODES:
+                returncode, stderr = run_analysis(engine_path, options, tuning_path)
+                if returncode is None:
+                    problem = f"still running after {TIMEOUT_SECONDS}s"
+                elif returncode != 1:
+                    problem = f"exited with {returncode}"
+                elif ERROR_MESSAGE not in stderr:
+                    problem = f"no \"{ERROR_MESSAGE}\" message"
+                else:
+                    problem = None
+                print(f"{'❌' if problem else '✅'} {engine_name}, {mode_name}: {problem or 'exits with the start-up error'}")
+                if problem:
+                    failures.append(f"{engine_name}, {mode_name}")
+
+    if failures:
+        print(f"\n❌ Failed: {'; '.join(failures)}")
+        sys.exit(1)
+    print('\n✅ Engine start-up errors are reported in every mode')
+
+
+if __name__ == '__main__':
+    main()